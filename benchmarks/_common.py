@@ -0,0 +1,122 @@
+"""Helpers shared by the benchmark scripts.
+
+Importing this module puts the pyglet of this source tree first on
+``sys.path`` and disables the shadow window, so that benchmarks run without
+a display unless they ask for one.
+"""
+from __future__ import print_function
+
+import os
+import subprocess
+import sys
+import types
+from timeit import default_timer as clock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pyglet
+pyglet.options['shadow_window'] = False
+
+import pyglet.font
+import pyglet.font.base
+import pyglet.window
+from pyglet.gl import GL_TEXTURE_2D
+
+
+def timed(func, *args):
+    """Call `func` and return ``(seconds, result)``."""
+    start = clock()
+    result = func(*args)
+    return clock() - start, result
+
+
+def load_revision(name, revision):
+    """Load a pyglet module as it was at a git revision of this tree.
+
+    The module is executed from the source stored in git, under a new name,
+    and imports the current versions of the modules it depends on.  It is
+    used to compare an implementation with an earlier one.
+
+    :Parameters:
+        `name` : str
+            Module name, for example ``'pyglet.text.layout'``.
+        `revision` : str
+            Any git revision, for example ``'HEAD~3'``.
+
+    """
+    path = name.replace('.', '/') + '.py'
+    source = subprocess.check_output(
+        ['git', 'show', '%s:%s' % (revision, path)], cwd=ROOT)
+    module = types.ModuleType('%s@%s' % (name, revision))
+    module.__file__ = os.path.join(ROOT, path)
+    module.__package__ = name.rpartition('.')[0]
+    exec(compile(source, '%s@%s' % (path, revision), 'exec'), module.__dict__)
+    return module
+
+
+class _StubTexture(object):
+    target = GL_TEXTURE_2D
+    id = 0
+
+
+class _StubGlyph(object):
+    tex_coords = (0.0,) * 12
+
+    def __init__(self, font, text):
+        self.owner = font.texture
+        if text in u'\n\u2028\u2029':
+            self.advance = 0
+        else:
+            self.advance = font.advance
+        self.vertices = (0, font.descent, self.advance, font.ascent)
+
+
+class _StubGlyphRenderer(pyglet.font.base.GlyphRenderer):
+    def __init__(self, font):
+        self.font = font
+
+    def render(self, text):
+        return _StubGlyph(self.font, text)
+
+
+class StubFont(pyglet.font.base.Font):
+    """Font with the metrics of a monospaced font and no glyph images.
+
+    Text layouts using it do all of their work except rasterizing glyphs,
+    so they can be measured without an OpenGL context.
+    """
+    glyph_renderer_class = _StubGlyphRenderer
+
+    def __init__(self, size):
+        super(StubFont, self).__init__()
+        self.ascent = int(size * 1.2)
+        self.descent = -int(size * 0.3)
+        self.advance = int(size * 0.6) or 1
+        self.texture = _StubTexture()
+
+
+def setup_fonts(use_gl):
+    """Prepare font loading for a text benchmark.
+
+    With `use_gl`, a hidden window is created and real fonts are used.
+    Otherwise `pyglet.font.load` is replaced to return `StubFont`
+    instances, and vertex lists are kept in client memory.
+
+    :rtype: `pyglet.window.Window` or None
+    """
+    if use_gl:
+        return pyglet.window.Window(visible=False)
+
+    fonts = {}
+
+    def load(name=None, size=None, bold=False, italic=False, dpi=None):
+        size = size or 12
+        try:
+            return fonts[size]
+        except KeyError:
+            font = fonts[size] = StubFont(size)
+            return font
+
+    pyglet.font.load = load
+    return None
@@ -0,0 +1,76 @@
+"""Benchmark random edits of a large `pyglet.text.document.FormattedDocument`.
+
+A log-like document (5 MB by default) receives random single-character
+inserts (50%), single-character deletes (40%) and style changes (10%).
+With ``--paragraphs``, the paragraph around each edit is also looked up,
+as a layout does.
+
+Usage::
+
+    python benchmarks/document_edit.py [--size 5000000] [--edits 1000]
+        [--paragraphs] [--baseline REV]
+
+With ``--baseline``, the same edits are made with
+``pyglet/text/document.py`` as it was at git revision ``REV`` of this tree.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import random
+
+from _common import timed, load_revision
+
+import pyglet.text.document
+
+LINE = '2026-10-17 12:00:00 INFO some log message with a few words in it\n'
+
+
+def run(module, text, edits, paragraphs):
+    document = module.FormattedDocument(text)
+    document.set_style(0, 100, {'color': (255, 0, 0, 255)})
+    # Deletes shorten the document by at most one character per edit.
+    end = len(text) - edits - 5
+    rand = random.Random(0)
+
+    def edit():
+        for _ in range(edits):
+            kind = rand.random()
+            position = rand.randrange(end)
+            if kind < 0.5:
+                document.insert_text(position, 'x')
+            elif kind < 0.9:
+                document.delete_text(position, position + 1)
+            else:
+                document.set_style(position, position + 5, {'bold': True})
+            if paragraphs:
+                document.get_paragraph_start(position)
+                document.get_paragraph_end(position)
+
+    return timed(edit)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--size', type=int, default=5000000,
+                        help='document size in characters')
+    parser.add_argument('--edits', type=int, default=1000)
+    parser.add_argument('--paragraphs', action='store_true',
+                        help='also look up the paragraph of each edit')
+    parser.add_argument('--baseline', metavar='REV',
+                        help='also measure document.py at this git revision')
+    args = parser.parse_args()
+
+    text = LINE * (args.size // len(LINE))
+    modules = [('current', pyglet.text.document)]
+    if args.baseline:
+        modules.insert(0, (args.baseline,
+                           load_revision('pyglet.text.document', args.baseline)))
+    for label, module in modules:
+        seconds = run(module, text, args.edits, args.paragraphs)
+        print('%-10s %d characters, %d edits: %10.1f us/edit' % (
+            label, len(text), args.edits, seconds / args.edits * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark line lookups and edits in a long `IncrementalTextLayout`.
+
+A document of short lines (100,000 by default) is laid out in a 400x600
+layout, and the following are timed:
+
+- hit-testing a random point and finding the line of a random position;
+- scrolling to a random position;
+- typing a character, a newline and a backspace in the middle of the
+  document.
+
+Usage::
+
+    python benchmarks/layout_lines.py [--lines 100000] [--gl]
+        [--baseline REV]
+
+Without ``--gl``, fonts are replaced by metrics-only fonts so that no
+display is needed.  With ``--baseline``, the same is measured with
+``pyglet/text/layout.py`` as it was at git revision ``REV`` of this tree.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import random
+
+from _common import timed, load_revision, setup_fonts
+
+import pyglet.graphics
+import pyglet.text.document
+import pyglet.text.layout
+
+
+def average(func, count):
+    def repeat():
+        for i in range(count):
+            func(i)
+    return timed(repeat)[0] / count
+
+
+def run(module, text):
+    document = pyglet.text.document.FormattedDocument(text)
+    build, layout = timed(module.IncrementalTextLayout, document, 400, 600,
+                          True, None, pyglet.graphics.Batch())
+    height = int(layout.content_height)
+    rand = random.Random(0)
+    results = [('build', build)]
+    results.append(('hit-test', average(
+        lambda i: layout.get_position_from_point(10, -rand.randrange(height)),
+        50)))
+    results.append(('line from position', average(
+        lambda i: layout.get_line_from_position(rand.randrange(document.length)),
+        50)))
+    results.append(('scroll', average(
+        lambda i: setattr(layout, 'view_y', -rand.randrange(height)), 20)))
+
+    middle = document.length // 2
+    layout.view_y = -height // 2
+    results.append(('type character', average(
+        lambda i: document.insert_text(middle + i, 'x'), 20)))
+    results.append(('type newline', average(
+        lambda i: document.insert_text(middle + i, '\n'), 20)))
+    results.append(('backspace newline', average(
+        lambda i: document.delete_text(middle, middle + 1), 20)))
+    layout.delete()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--gl', action='store_true',
+                        help='use real fonts in a hidden window')
+    parser.add_argument('--baseline', metavar='REV',
+                        help='also measure layout.py at this git revision')
+    args = parser.parse_args()
+
+    window = setup_fonts(args.gl)
+    text = ''.join('line %d of the document\n' % i for i in range(args.lines))
+    modules = [('current', pyglet.text.layout)]
+    if args.baseline:
+        modules.insert(0, (args.baseline,
+                           load_revision('pyglet.text.layout', args.baseline)))
+    for label, module in modules:
+        for name, seconds in run(module, text):
+            print('%-10s %-20s %10.3f ms' % (label, name, seconds * 1000))
+    if window:
+        window.close()
+
+
+if __name__ == '__main__':
+    main()
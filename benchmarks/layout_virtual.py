@@ -0,0 +1,87 @@
+"""Benchmark the first paint of a large document in a virtual layout.
+
+A document of wrapped paragraphs (100 MB by default) is laid out in a
+400x600 `IncrementalTextLayout` with ``virtual=True``, and the following
+are timed:
+
+- creating the document;
+- creating the layout, up to the vertex lists of the first page;
+- jumping the view to positions spread over the document;
+- typing a character in the middle of the document.
+
+Usage::
+
+    python benchmarks/layout_virtual.py [--size 100000000] [--full] [--gl]
+
+With ``--full``, the same is measured without ``virtual=True``; use a much
+smaller ``--size`` for that (a full layout of 1 MB takes seconds).  Without
+``--gl``, fonts are replaced by metrics-only fonts so that no display is
+needed.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+
+from _common import timed, setup_fonts
+
+import pyglet.graphics
+import pyglet.text.document
+import pyglet.text.layout
+
+LINE = 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do\n'
+
+
+def run(text, virtual):
+    document_time, document = timed(
+        pyglet.text.document.UnformattedDocument, text)
+    layout_time, layout = timed(
+        lambda: pyglet.text.layout.IncrementalTextLayout(
+            document, 400, 600, multiline=True,
+            batch=pyglet.graphics.Batch(), wrap_lines=True,
+            virtual=virtual))
+
+    def scroll():
+        for i in range(20):
+            layout.view_y = -(i + 1) * 0.05 * layout.content_height
+
+    def edit():
+        for i in range(20):
+            document.insert_text(document.length // 2 + i, 'x')
+
+    results = [('document', document_time),
+               ('first layout', layout_time),
+               ('jump scroll', timed(scroll)[0] / 20),
+               ('edit', timed(edit)[0] / 20)]
+    lines = len(layout.lines)
+    layout.delete()
+    return results, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--size', type=int, default=100000000,
+                        help='document size in characters')
+    parser.add_argument('--full', action='store_true',
+                        help='also measure a layout without virtual=True')
+    parser.add_argument('--gl', action='store_true',
+                        help='use real fonts in a hidden window')
+    args = parser.parse_args()
+
+    window = setup_fonts(args.gl)
+    text = LINE * (args.size // len(LINE))
+    modes = [('virtual', True)]
+    if args.full:
+        modes.append(('full', False))
+    for label, virtual in modes:
+        results, lines = run(text, virtual)
+        print('%-8s %d characters, %d lines laid out or estimated' % (
+            label, len(text), lines))
+        for name, seconds in results:
+            print('%-8s %-14s %10.3f ms' % (label, name, seconds * 1000))
+    if window:
+        window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark the resource index of `pyglet.resource.Loader` on a large tree.
+
+A synthetic tree of empty files is created in a temporary directory (or
+reused with ``--tree``), and the following are timed:
+
+- ``reindex`` followed by the first lookup, as done by the first
+  ``resource.image()`` of an application;
+- lookups of random names;
+- ``reindex`` again with the tree unchanged, and after adding a file.
+
+Usage::
+
+    python benchmarks/resource_index.py [--files 200000] [--dirs 2000]
+        [--baseline REV]
+
+With ``--baseline``, the same is measured with ``pyglet/resource.py`` as it
+was at git revision ``REV`` of this tree.
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+
+from _common import timed, load_revision
+
+import pyglet.resource
+
+
+def make_tree(root, files, dirs):
+    # Two levels of directories, so that names have several components.
+    per_dir = max(1, files // dirs)
+    names = []
+    for i in range(dirs):
+        directory = os.path.join(root, 'd%d' % (i // 10), 'e%d' % (i % 10))
+        os.makedirs(directory)
+        for j in range(per_dir):
+            open(os.path.join(directory, 'f%d.png' % j), 'w').close()
+            names.append('d%d/e%d/f%d.png' % (i // 10, i % 10, j))
+    return names
+
+
+def run(module, root, names):
+    loader = module.Loader([root])
+    lookups = random.Random(0).sample(names, min(1000, len(names)))
+
+    def first_lookup():
+        loader.reindex()
+        loader.location(names[0])
+
+    def lookup():
+        for name in lookups:
+            loader.location(name)
+
+    results = [('reindex + first lookup', timed(first_lookup)[0]),
+               ('%d lookups' % len(lookups), timed(lookup)[0]),
+               ('reindex, unchanged', timed(loader.reindex)[0])]
+
+    added = os.path.join(root, 'd0', 'e0', 'added.png')
+    open(added, 'w').close()
+    try:
+        def reindex_added():
+            loader.reindex()
+            loader.location('d0/e0/added.png')
+        results.append(('reindex + lookup, file added',
+                        timed(reindex_added)[0]))
+    finally:
+        os.remove(added)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--files', type=int, default=200000)
+    parser.add_argument('--dirs', type=int, default=2000)
+    parser.add_argument('--tree', help='directory to create the tree in, '
+                        'or to reuse if it exists')
+    parser.add_argument('--baseline', metavar='REV',
+                        help='also measure resource.py at this git revision')
+    args = parser.parse_args()
+
+    root = args.tree or tempfile.mkdtemp(prefix='pyglet-bench-')
+    try:
+        if os.path.isdir(os.path.join(root, 'd0')):
+            names = ['/'.join(os.path.relpath(os.path.join(d, f), root).split(os.sep))
+                     for d, _, fs in os.walk(root) for f in fs]
+        else:
+            names = make_tree(root, args.files, args.dirs)
+        print('%d files in %s' % (len(names), root))
+
+        modules = [('current', pyglet.resource)]
+        if args.baseline:
+            modules.insert(0, (args.baseline,
+                               load_revision('pyglet.resource', args.baseline)))
+        for label, module in modules:
+            for name, seconds in run(module, root, names):
+                print('%-10s %-30s %9.2f ms' % (label, name, seconds * 1000))
+    finally:
+        if not args.tree:
+            shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
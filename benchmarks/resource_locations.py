@@ -0,0 +1,112 @@
+"""Benchmark loading resources from a directory, a ZIP archive and a bundle.
+
+The same assets are stored in a directory, a ZIP archive (deflated), a
+bundle, a compressed bundle and a bundle with decoded images (see
+:py:mod:`pyglet.bundle`).  For each, a new `pyglet.resource.Loader` reads
+every small file and then decodes every image.
+
+Usage::
+
+    python benchmarks/resource_locations.py [--files 5000] [--size 1250]
+        [--images 8] [--image-size 512]
+"""
+from __future__ import print_function
+from __future__ import division
+
+import argparse
+import os
+import shutil
+import tempfile
+import zipfile
+
+from _common import timed
+
+import pyglet.bundle
+import pyglet.image
+import pyglet.resource
+
+
+def make_assets(root, files, size, images, image_size):
+    file_names = []
+    for i in range(files):
+        name = 'd%02d/f%d.txt' % (i % 50, i)
+        path = os.path.join(root, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write((('asset %d ' % i) * size).encode('ascii')[:size])
+        file_names.append(name)
+
+    image_names = []
+    row = bytearray(range(256)) * (image_size * 4 // 256 + 1)
+    for i in range(images):
+        data = b''.join(bytes(row[y % 256:y % 256 + image_size * 4])
+                        for y in range(image_size))
+        image = pyglet.image.ImageData(image_size, image_size, 'RGBA', data)
+        name = 'image%d.png' % i
+        image.save(os.path.join(root, name))
+        image_names.append(name)
+    return file_names, image_names
+
+
+def make_zip(directory, filename):
+    with zipfile.ZipFile(filename, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, path in pyglet.bundle._list_files(directory):
+            archive.write(path, name)
+
+
+def read_files(location, names):
+    loader = pyglet.resource.Loader([location])
+    for name in names:
+        with loader.file(name) as f:
+            f.read()
+
+
+def decode_images(location, names):
+    loader = pyglet.resource.Loader([location])
+    for name in names:
+        # Decodes the image (or maps a decoded one) without uploading it.
+        loader._load_image(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--size', type=int, default=1250,
+                        help='size of each file in bytes')
+    parser.add_argument('--images', type=int, default=8)
+    parser.add_argument('--image-size', type=int, default=512)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix='pyglet-bench-')
+    try:
+        directory = os.path.join(root, 'assets')
+        files, images = make_assets(directory, args.files, args.size,
+                                    args.images, args.image_size)
+        archive = os.path.join(root, 'assets.zip')
+        make_zip(directory, archive)
+        bundle = os.path.join(root, 'assets.bundle')
+        pyglet.bundle.main([bundle, directory])
+        compressed = os.path.join(root, 'compressed.bundle')
+        pyglet.bundle.main(['--compress', compressed, directory])
+        decoded = os.path.join(root, 'decoded.bundle')
+        pyglet.bundle.main(['--decode-images', decoded, directory])
+
+        print('%d files of %d bytes, %d images of %dx%d' % (
+            args.files, args.size, args.images, args.image_size,
+            args.image_size))
+        for label, location in (('directory', directory),
+                                ('zip', archive),
+                                ('bundle', bundle),
+                                ('compressed bundle', compressed),
+                                ('decoded bundle', decoded)):
+            read = timed(read_files, location, files)[0]
+            decode = timed(decode_images, location, images)[0]
+            print('%-18s files %8.1f ms   images %8.1f ms' % (
+                label, read * 1000, decode * 1000))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
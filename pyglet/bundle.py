@@ -0,0 +1,311 @@
+# ----------------------------------------------------------------------------
+# pyglet
+# Copyright (c) 2006-2018 Alex Holkner
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#  * Neither the name of pyglet nor the names of its
+#    contributors may be used to endorse or promote products
+#    derived from this software without specific prior written
+#    permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# ----------------------------------------------------------------------------
+
+"""Pack resource files into a single bundle file.
+
+Loading many small files from a directory is dominated by the cost of
+opening each file.  A bundle packs the files into a single file which
+:py:mod:`pyglet.resource` maps into memory once; put the bundle on the
+resource path as if it were a directory::
+
+    pyglet.resource.path = ['assets.bundle']
+    pyglet.resource.reindex()
+
+Bundles are built from the command line::
+
+    python -m pyglet.bundle [--compress] [--decode-images] assets.bundle assets/
+
+Each file under the given directories is added under its path relative to
+that directory.  With ``--compress``, files that shrink by at least a tenth
+are stored compressed with zlib.  With ``--decode-images``, images are also
+stored decoded, so that :py:func:`pyglet.resource.image` can use their
+pixel data directly from the mapped bundle instead of decoding them.
+
+Format
+^^^^^^
+
+All integers are little-endian.  The file starts with a header::
+
+    magic           4 bytes     b'PYGB'
+    version         uint16      1
+    reserved        uint16
+    entry count     uint32
+    index offset    uint64
+
+The index lists the entries in name order; each entry is::
+
+    data offset     uint64      offset of the file contents
+    data size       uint64      size of the (possibly compressed) contents
+    file size       uint64      size of the file once decompressed
+    image offset    uint64      offset of the decoded image, or 0
+    image size      uint64      size of the decoded image, or 0
+    compression     uint8       0 for none, 1 for zlib
+    reserved        uint8
+    name length     uint16
+    name            UTF-8, using forward slashes
+
+Decoded images have a header of 32 bytes (width, height and pitch as
+uint32, then the format as 8 ASCII bytes padded with zeros), followed by the
+rows of pixels from bottom to top.  All contents and images are aligned to
+16 bytes.
+
+.. versionadded:: 1.4
+"""
+from __future__ import print_function
+from builtins import object
+
+__docformat__ = 'restructuredtext'
+__version__ = '$Id: $'
+
+import os
+import struct
+import zlib
+
+MAGIC = b'PYGB'
+VERSION = 1
+
+#: Compression methods of entries
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+
+_header = struct.Struct('<4sHHIQ')
+_entry = struct.Struct('<QQQQQBxH')
+_image_header = struct.Struct('<III8s12x')
+_alignment = 16
+
+
+class BundleException(Exception):
+    """The file is not a valid bundle."""
+    pass
+
+
+class BundleEntry(object):
+    """A file in a bundle."""
+    __slots__ = ('name', 'offset', 'size', 'file_size',
+                 'image_offset', 'image_size', 'compression')
+
+    def __init__(self, name, offset, size, file_size,
+                 image_offset, image_size, compression):
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.file_size = file_size
+        self.image_offset = image_offset
+        self.image_size = image_size
+        self.compression = compression
+
+
+def is_bundle(filename):
+    """Determine if a file is a bundle, by its header.
+
+    :rtype: bool
+    """
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except EnvironmentError:
+        return False
+
+
+def read_index(buffer):
+    """Read the index of a bundle.
+
+    :Parameters:
+        `buffer` : buffer
+            The contents of the bundle, such as a memory map of its file.
+
+    :rtype: dict
+    :return: Mapping of entry name to `BundleEntry`.
+    """
+    try:
+        magic, version, _, count, offset = _header.unpack_from(buffer, 0)
+    except struct.error:
+        raise BundleException('Bundle is truncated')
+    if magic != MAGIC:
+        raise BundleException('Not a bundle')
+    if version != VERSION:
+        raise BundleException('Unsupported bundle version %d' % version)
+
+    entries = {}
+    try:
+        for i in range(count):
+            fields = _entry.unpack_from(buffer, offset)
+            offset += _entry.size
+            name_length = fields[-1]
+            name = bytes(buffer[offset:offset + name_length]).decode('utf-8')
+            offset += name_length
+            entries[name] = BundleEntry(name, *fields[:-1])
+    except struct.error:
+        raise BundleException('Bundle index is truncated')
+    return entries
+
+
+def read_image_header(buffer, offset):
+    """Read the header of a decoded image.
+
+    :rtype: (int, int, str, int, int)
+    :return: The width, height, format and pitch of the image, and the
+        offset of its pixel data.
+    """
+    width, height, pitch, fmt = _image_header.unpack_from(buffer, offset)
+    fmt = fmt.rstrip(b'\0').decode('ascii')
+    return width, height, fmt, pitch, offset + _image_header.size
+
+
+def _decode_image(filename):
+    # Returns the decoded image payload for a file, or None if it is not an
+    # image that can be stored decoded.
+    import pyglet.image
+    from pyglet.image import codecs
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in codecs._decoder_extensions:
+        return None
+    try:
+        image = pyglet.image.load(filename)
+    except Exception:
+        return None
+    if not isinstance(image, pyglet.image.ImageData):
+        return None
+
+    fmt = image._current_format
+    pitch = abs(image._current_pitch)
+    data = image.get_data(fmt, pitch)
+    if len(fmt) > 8 or len(data) != pitch * image.height:
+        return None
+    return _image_header.pack(image.width, image.height, pitch,
+                              fmt.encode('ascii')) + data
+
+
+def write_bundle(filename, files, compress=False, decode_images=False):
+    """Write a bundle.
+
+    :Parameters:
+        `filename` : str
+            Filename of the bundle to write.
+        `files` : list of (str, str)
+            The name of each entry (using forward slashes) and the filename
+            of the file to store in it.
+        `compress` : bool
+            If True, files that shrink by at least a tenth are stored
+            compressed with zlib.
+        `decode_images` : bool
+            If True, images that pyglet can decode are also stored decoded.
+
+    """
+    files = sorted(files)
+    entries = []
+    with open(filename, 'wb') as f:
+        f.write(b'\0' * _header.size)
+        for name, path in files:
+            with open(path, 'rb') as source:
+                data = source.read()
+            file_size = len(data)
+            compression = COMPRESSION_NONE
+            if compress:
+                compressed = zlib.compress(data, 9)
+                if len(compressed) <= len(data) * 0.9:
+                    data = compressed
+                    compression = COMPRESSION_ZLIB
+
+            offset = _write_aligned(f, data)
+            image_offset = image_size = 0
+            if decode_images:
+                image = _decode_image(path)
+                if image is not None:
+                    image_offset = _write_aligned(f, image)
+                    image_size = len(image)
+            entries.append((name, offset, len(data), file_size,
+                            image_offset, image_size, compression))
+
+        index_offset = f.tell()
+        for name, offset, size, file_size, image_offset, image_size, \
+                compression in entries:
+            encoded_name = name.encode('utf-8')
+            f.write(_entry.pack(offset, size, file_size, image_offset,
+                                image_size, compression, len(encoded_name)))
+            f.write(encoded_name)
+
+        f.seek(0)
+        f.write(_header.pack(MAGIC, VERSION, 0, len(entries), index_offset))
+
+
+def _write_aligned(f, data):
+    offset = f.tell()
+    padding = -offset % _alignment
+    f.write(b'\0' * padding)
+    f.write(data)
+    return offset + padding
+
+
+def _list_files(directory):
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            name = os.path.relpath(path, directory).replace(os.sep, '/')
+            yield name, path
+
+
+def main(args=None):
+    """Build a bundle from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='python -m pyglet.bundle',
+        description='Pack resource files into a pyglet bundle.')
+    parser.add_argument('--compress', action='store_true',
+                        help='compress files with zlib where worthwhile')
+    parser.add_argument('--decode-images', action='store_true',
+                        help='also store images decoded')
+    parser.add_argument('bundle', help='bundle file to write')
+    parser.add_argument('directories', nargs='+', metavar='directory',
+                        help='directory of files to add')
+    args = parser.parse_args(args)
+
+    if args.decode_images:
+        # Decoding images does not need a GL context.
+        import pyglet
+        pyglet.options['shadow_window'] = False
+
+    files = {}
+    for directory in args.directories:
+        for name, path in _list_files(directory):
+            files.setdefault(name, path)
+    write_bundle(args.bundle, list(files.items()),
+                 args.compress, args.decode_images)
+    print('Wrote %d files to %s' % (len(files), args.bundle))
+
+
+if __name__ == '__main__':
+    main()
@@ -88,6 +88,14 @@ You can cancel a function scheduled with any of these methods using
 
     clock.unschedule(move)
 
+Each of the `schedule` methods returns a handle for that particular call,
+which can be cancelled on its own, in constant time.  This is useful when the
+same function is scheduled several times with different arguments::
+
+    handle = clock.schedule_once(explode, 2.0, bullet)
+    # ...
+    handle.cancel()
+
 Using multiple clocks
 =====================
 
@@ -105,6 +113,10 @@ You can also replace the default clock with your own:
 Each clock maintains its own set of scheduled functions and FPS
 measurement.  Each clock must be "ticked" separately.
 
+:py:class:`~pyglet.clock.TimerWheelClock` is a drop-in replacement for
+:py:class:`~pyglet.clock.Clock` that keeps its scheduled functions in a timer
+wheel.  It is faster when many thousands of functions are scheduled at once.
+
 Multiple and derived clocks potentially allow you to separate "game-time" and
 "wall-time", or to synchronise your clock to an audio or video stream instead
 of the system clock.
@@ -118,7 +130,7 @@ import sys
 import time
 import ctypes
 from operator import attrgetter
-from heapq import heappush, heappop, heappushpop
+from heapq import heappush, heappop, heappushpop, heapify
 from collections import deque
 import inspect
 from .compat import WeakMethod
@@ -161,19 +173,39 @@ else:
     _default_time_function = time.perf_counter
 
 
+# Slot index of TimerWheelClock items waiting in the overflow heap.
+_OVERFLOW = object()
+
+
+def _unscheduled(dt, *args, **kwargs):
+    """Function of items that were cancelled but are still in a schedule."""
+    pass
+
+
 class _ScheduledItem(object):
-    __slots__ = ['func', 'args', 'kwargs']
+    __slots__ = ['clock', 'func', 'args', 'kwargs']
 
-    def __init__(self, func, args, kwargs):
+    def __init__(self, clock, func, args, kwargs):
+        self.clock = clock
         self.func = func
         self.args = args
         self.kwargs = kwargs
 
+    def cancel(self):
+        """Remove this item from the schedule of its clock.
+
+        Has no effect if the item was already cancelled or has finished.
+        """
+        if self.clock is not None:
+            self.clock._cancel(self)
+
 
 class _ScheduledIntervalItem(object):
-    __slots__ = ['func', 'interval', 'last_ts', 'next_ts', 'args', 'kwargs']
+    __slots__ = ['clock', 'func', 'interval', 'last_ts', 'next_ts',
+                 'args', 'kwargs']
 
-    def __init__(self, func, interval, last_ts, next_ts, args, kwargs):
+    def __init__(self, clock, func, interval, last_ts, next_ts, args, kwargs):
+        self.clock = clock
         self.func = func
         self.interval = interval
         self.last_ts = last_ts
@@ -181,6 +213,8 @@ class _ScheduledIntervalItem(object):
         self.args = args
         self.kwargs = kwargs
 
+    cancel = _ScheduledItem.cancel
+
     def __lt__(self, other):
         try:
             return self.next_ts < other.next_ts
@@ -188,6 +222,47 @@ class _ScheduledIntervalItem(object):
             return self.next_ts < other
 
 
+def _find_soft_next_ts(last_ts, interval, taken):
+    """Find a time within `interval` after `last_ts` that is not `taken`.
+
+    `taken(ts, e)` returns True if an item is already scheduled within `e`
+    seconds of `ts`.
+    """
+    # Binary division over interval:
+    #
+    # 0                          interval
+    # |--------------------------|
+    #   5  3   6   2   7  4  8   1          Order of search
+    #
+    # i.e., first scheduled at interval,
+    #       then at            interval/2
+    #       then at            interval/4
+    #       then at            interval*3/4
+    #       then at            ...
+    #
+    # Schedule is hopefully then evenly distributed for any interval,
+    # and any number of scheduled functions.
+
+    next_ts = last_ts + interval
+    if not taken(next_ts, interval / 4):
+        return next_ts
+
+    dt = interval
+    divs = 1
+    while True:
+        next_ts = last_ts
+        for i in range(divs - 1):
+            next_ts += dt
+            if not taken(next_ts, dt / 4):
+                return next_ts
+        dt /= 2
+        divs *= 2
+
+        # Avoid infinite loop in pathological case
+        if divs > 16:
+            return next_ts
+
+
 class Clock(_ClockBase):
     """Class for calculating and limiting framerate.
 
@@ -214,6 +289,9 @@ class Clock(_ClockBase):
     # List of schedule interval items kept in sort order.
     _schedule_interval_items = None
 
+    # Number of cancelled items still in _schedule_interval_items.
+    _cancelled_count = 0
+
     # If True, a sleep(0) is inserted on every tick.
     _force_sleep = False
 
@@ -281,21 +359,7 @@ class Clock(_ClockBase):
         :return: True if any functions were called, otherwise False.
         """
         now = self.last_ts
-        result = False  # flag indicates if any function was called
-
-        # handle items scheduled for every tick
-        if self._schedule_items:
-            result = True
-            # duplicate list in case event unschedules itself
-            for item in list(self._schedule_items):
-                func = item.func
-                if isinstance(func, WeakMethod):
-                    func = func()
-                    if func is None:
-                        # Unschedule it as the object is dead!
-                        self.unschedule(item.func)
-                        continue
-                func(dt, *item.args, **item.kwargs)
+        result = self._call_tick_items(dt)
 
         # check the next scheduled item that is not called each tick
         # if it is scheduled in the future, then exit
@@ -311,7 +375,6 @@ class Clock(_ClockBase):
         # NOTE: there is no special handling required to manage things
         #       that are scheduled during this loop, due to the heap
         self._current_interval_item = item = None
-        get_soft_next_ts = self._get_soft_next_ts
         while interval_items:
 
             # the scheduler will hold onto a reference to an item in
@@ -322,6 +385,12 @@ class Clock(_ClockBase):
             else:
                 item = heappushpop(interval_items, item)
 
+            # drop items that were cancelled while on the heap
+            if item.func is _unscheduled:
+                self._cancelled_count -= 1
+                item = None
+                continue
+
             # a scheduled function may try and unschedule itself
             # so we need to keep a reference to the current
             # item no longer on heap to be able to check
@@ -342,37 +411,61 @@ class Clock(_ClockBase):
                 func(now - item.last_ts, *item.args, **item.kwargs)
 
             if item.interval:
-
-                # Try to keep timing regular, even if overslept this time;
-                # but don't schedule in the past (which could lead to
-                # infinitely-worsening error).
-                item.next_ts = item.last_ts + item.interval
-                item.last_ts = now
-
-                # test the schedule for the next execution
-                if item.next_ts <= now:
-                    # the scheduled time of this item has already passed
-                    # so it must be rescheduled
-                    if now - item.next_ts < 0.05:
-                        # missed execution time by 'reasonable' amount, so
-                        # reschedule at normal interval
-                        item.next_ts = now + item.interval
-                    else:
-                        # missed by significant amount, now many events have
-                        # likely missed execution. do a soft reschedule to
-                        # avoid lumping many events together.
-                        # in this case, the next dt will not be accurate
-                        item.next_ts = get_soft_next_ts(now, item.interval)
-                        item.last_ts = item.next_ts - item.interval
+                self._advance_interval_item(item, now)
             else:
                 # not an interval, so this item will not be rescheduled
+                item.clock = None
                 self._current_interval_item = item = None
 
+        self._current_interval_item = None
         if item is not None:
             heappush(interval_items, item)
 
         return True
 
+    def _call_tick_items(self, dt):
+        """Call the items scheduled for every tick.  Returns True if there
+        were any."""
+        if not self._schedule_items:
+            return False
+
+        # duplicate list in case event unschedules itself
+        for item in list(self._schedule_items):
+            func = item.func
+            if isinstance(func, WeakMethod):
+                func = func()
+                if func is None:
+                    # Unschedule it as the object is dead!
+                    self.unschedule(item.func)
+                    continue
+            func(dt, *item.args, **item.kwargs)
+        return True
+
+    def _advance_interval_item(self, item, now):
+        """Compute the next time of an interval item that was called at
+        `now`."""
+        # Try to keep timing regular, even if overslept this time;
+        # but don't schedule in the past (which could lead to
+        # infinitely-worsening error).
+        item.next_ts = item.last_ts + item.interval
+        item.last_ts = now
+
+        # test the schedule for the next execution
+        if item.next_ts <= now:
+            # the scheduled time of this item has already passed
+            # so it must be rescheduled
+            if now - item.next_ts < 0.05:
+                # missed execution time by 'reasonable' amount, so
+                # reschedule at normal interval
+                item.next_ts = now + item.interval
+            else:
+                # missed by significant amount, now many events have
+                # likely missed execution. do a soft reschedule to
+                # avoid lumping many events together.
+                # in this case, the next dt will not be accurate
+                item.next_ts = self._get_soft_next_ts(now, item.interval)
+                item.last_ts = item.next_ts - item.interval
+
     def tick(self, poll=False):
         """Signify that one frame has passed.
 
@@ -427,8 +520,13 @@ class Clock(_ClockBase):
         if self._schedule_items or not sleep_idle:
                 return 0.0
 
-        if self._schedule_interval_items:
-            return max(self._schedule_interval_items[0].next_ts - self.time(), 0.0)
+        interval_items = self._schedule_interval_items
+        while interval_items and interval_items[0].func is _unscheduled:
+            heappop(interval_items)
+            self._cancelled_count -= 1
+
+        if interval_items:
+            return max(interval_items[0].next_ts - self.time(), 0.0)
 
         return None
 
@@ -481,39 +579,10 @@ class Clock(_ClockBase):
         # NOTE: do not rewrite as popping from heap, as that is super slow!
         self._schedule_interval_items.sort(key=attrgetter('next_ts'))
 
-        # Binary division over interval:
-        #
-        # 0                          interval
-        # |--------------------------|
-        #   5  3   6   2   7  4  8   1          Order of search
-        #
-        # i.e., first scheduled at interval,
-        #       then at            interval/2
-        #       then at            interval/4
-        #       then at            interval*3/4
-        #       then at            ...
-        #
-        # Schedule is hopefully then evenly distributed for any interval,
-        # and any number of scheduled functions.
-
-        next_ts = last_ts + interval
-        if not taken(next_ts, interval / 4):
-            return next_ts
+        return _find_soft_next_ts(last_ts, interval, taken)
 
-        dt = interval
-        divs = 1
-        while True:
-            next_ts = last_ts
-            for i in range(divs - 1):
-                next_ts += dt
-                if not taken(next_ts, dt / 4):
-                    return next_ts
-            dt /= 2
-            divs *= 2
-
-            # Avoid infinite loop in pathological case
-            if divs > 16:
-                return next_ts
+    def _add_interval_item(self, item):
+        heappush(self._schedule_interval_items, item)
 
     def schedule(self, func, *args, **kwargs):
         """Schedule a function to be called every frame.
@@ -529,11 +598,15 @@ class Clock(_ClockBase):
         :Parameters:
             `func` : callable
                 The function to call each frame.
+
+        :return: A handle whose ``cancel()`` method removes this call from
+                 the schedule.
         """
         if inspect.ismethod(func):
             func = WeakMethod(func)
-        item = _ScheduledItem(func, args, kwargs)
+        item = _ScheduledItem(self, func, args, kwargs)
         self._schedule_items.append(item)
+        return item
 
     def schedule_once(self, func, delay, *args, **kwargs):
         """Schedule a function to be called once after `delay` seconds.
@@ -545,13 +618,18 @@ class Clock(_ClockBase):
                 The function to call when the timer lapses.
             `delay` : float
                 The number of seconds to wait before the timer lapses.
+
+        :return: A handle whose ``cancel()`` method removes this call from
+                 the schedule.
         """
         last_ts = self._get_nearest_ts()
         next_ts = last_ts + delay
         if inspect.ismethod(func):
             func = WeakMethod(func)
-        item = _ScheduledIntervalItem(func, 0, last_ts, next_ts, args, kwargs)
-        heappush(self._schedule_interval_items, item)
+        item = _ScheduledIntervalItem(self, func, 0, last_ts, next_ts,
+                                      args, kwargs)
+        self._add_interval_item(item)
+        return item
 
     def schedule_interval(self, func, interval, *args, **kwargs):
         """Schedule a function to be called every `interval` seconds.
@@ -567,14 +645,17 @@ class Clock(_ClockBase):
             `interval` : float
                 The number of seconds to wait between each call.
 
+        :return: A handle whose ``cancel()`` method removes this call from
+                 the schedule.
         """
         last_ts = self._get_nearest_ts()
         next_ts = last_ts + interval
         if inspect.ismethod(func):
             func = WeakMethod(func)
-        item = _ScheduledIntervalItem(func, interval, last_ts,
+        item = _ScheduledIntervalItem(self, func, interval, last_ts,
                                       next_ts, args, kwargs)
-        heappush(self._schedule_interval_items, item)
+        self._add_interval_item(item)
+        return item
 
     def schedule_interval_soft(self, func, interval, *args, **kwargs):
         """Schedule a function to be called every ``interval`` seconds.
@@ -604,14 +685,17 @@ class Clock(_ClockBase):
             `interval` : float
                 The number of seconds to wait between each call.
 
+        :return: A handle whose ``cancel()`` method removes this call from
+                 the schedule.
         """
         next_ts = self._get_soft_next_ts(self._get_nearest_ts(), interval)
         last_ts = next_ts - interval
         if inspect.ismethod(func):
             func = WeakMethod(func)
-        item = _ScheduledIntervalItem(func, interval, last_ts,
+        item = _ScheduledIntervalItem(self, func, interval, last_ts,
                                       next_ts, args, kwargs)
-        heappush(self._schedule_interval_items, item)
+        self._add_interval_item(item)
+        return item
 
     def unschedule(self, func):
         """Remove a function from the schedule.
@@ -624,23 +708,318 @@ class Clock(_ClockBase):
                 The function to remove from the schedule.
 
         """
-        # clever remove item without disturbing the heap:
-        # 1. set function to an empty lambda -- original function is not called
-        # 2. set interval to 0               -- item will be removed from heap eventually
-        valid_items = set(item
-                          for item in self._schedule_interval_items
-                          if item.func == func)
+        # bound methods are scheduled as weak methods, which compare equal
+        # only to other weak methods
+        if inspect.ismethod(func):
+            func = WeakMethod(func)
+
+        valid_items = [item
+                       for item in self._schedule_interval_items
+                       if item.func == func]
 
         if self._current_interval_item:
             if self._current_interval_item.func == func:
-                valid_items.add(self._current_interval_item)
+                valid_items.append(self._current_interval_item)
 
         for item in valid_items:
-            item.interval = 0
-            item.func = lambda x, *args, **kwargs: x
+            self._cancel(item)
+
+        self._schedule_items = [i for i in self._schedule_items if i.func != func]
+
+    def _cancel(self, item):
+        item.clock = None
+        if not isinstance(item, _ScheduledIntervalItem):
+            try:
+                self._schedule_items.remove(item)
+            except ValueError:
+                pass
+            return
+
+        # clever remove item without disturbing the heap:
+        # 1. set function to _unscheduled -- original function is not called
+        # 2. set interval to 0             -- item will not be rescheduled
+        # the item is dropped when it reaches the top of the heap, or when
+        # the heap is compacted.
+        item.interval = 0
+        item.func = _unscheduled
+        if item is self._current_interval_item:
+            # Being called; not on the heap.
+            return
+
+        self._cancelled_count += 1
+        interval_items = self._schedule_interval_items
+        if self._cancelled_count > len(interval_items) // 2:
+            # Compact in place, call_scheduled_functions may hold a
+            # reference to the list.
+            interval_items[:] = [i for i in interval_items
+                                 if i.func is not _unscheduled]
+            heapify(interval_items)
+            self._cancelled_count = 0
+
+
+class TimerWheelClock(Clock):
+    """Clock that keeps interval items in a hashed timer wheel.
+
+    The wheel is a ring of ``slots`` buckets, each covering ``resolution``
+    seconds.  Scheduling and unscheduling a function take constant time
+    regardless of how many functions are scheduled, and each tick only
+    visits the buckets that elapsed since the previous tick.  Items
+    scheduled further ahead than the span of the wheel are parked in a
+    heap until the wheel reaches them.
+
+    The behaviour is otherwise identical to :py:class:`Clock`; it is
+    intended for applications that schedule a large number of functions,
+    for example one timer per game entity::
+
+        clock.set_default(clock.TimerWheelClock())
+
+    .. versionadded:: 1.4
+    """
+
+    def __init__(self, time_function=_default_time_function,
+                 resolution=0.01, slots=1024):
+        """Initialise a TimerWheelClock.
+
+        :Parameters:
+            `time_function` : function
+                Function to return the elapsed time of the application,
+                in seconds.
+            `resolution` : float
+                Time covered by each slot of the wheel, in seconds.  This
+                does not affect the accuracy of the schedule, only how
+                items are bucketed.
+            `slots` : int
+                Number of slots in the wheel.  Items due later than
+                ``resolution * slots`` seconds from now wait in an
+                overflow heap.
+
+        """
+        super(TimerWheelClock, self).__init__(time_function)
+        self._resolution = resolution
+        self._wheel = [set() for _ in range(slots)]
+        self._cursor = self._get_slot_index(self.next_ts)
+
+        # Items beyond the span of the wheel; may contain stale entries
+        # for items that were unscheduled.
+        self._overflow = []
+        self._overflow_stale = 0
+
+        # Map of item to its absolute slot index, or _OVERFLOW.
+        self._item_slots = {}
+
+        # Map of scheduled function to the set of its items.
+        self._items_by_func = {}
+
+        # Items being called by call_scheduled_functions, sorted by time,
+        # and the index of the first one not yet called.
+        self._due_items = ()
+        self._due_position = 0
+
+    def _get_slot_index(self, ts):
+        return int(ts // self._resolution)
+
+    def _add_interval_item(self, item):
+        self._insert_item(item)
+        items = self._items_by_func.get(item.func)
+        if items is None:
+            items = self._items_by_func[item.func] = set()
+        items.add(item)
+
+    def _insert_item(self, item):
+        index = max(self._get_slot_index(item.next_ts), self._cursor)
+        slots = len(self._wheel)
+        if index - self._cursor < slots:
+            self._wheel[index % slots].add(item)
+            self._item_slots[item] = index
+        else:
+            heappush(self._overflow, item)
+            self._item_slots[item] = _OVERFLOW
+
+    def _remove_item(self, item):
+        index = self._item_slots.pop(item, None)
+        if index is None:
+            # Currently being called, or already finished.
+            return
+        if index is _OVERFLOW:
+            self._overflow_stale += 1
+            if self._overflow_stale > len(self._overflow) // 2:
+                self._overflow = [i for i in self._overflow
+                                  if self._item_slots.get(i) is _OVERFLOW]
+                heapify(self._overflow)
+                self._overflow_stale = 0
+        else:
+            self._wheel[index % len(self._wheel)].discard(item)
+
+    def _forget_item(self, item):
+        items = self._items_by_func.get(item.func)
+        if items is not None:
+            items.discard(item)
+            if not items:
+                del self._items_by_func[item.func]
+
+    def _pull_overflow(self):
+        horizon = self._cursor + len(self._wheel)
+        overflow = self._overflow
+        while overflow and self._get_slot_index(overflow[0].next_ts) < horizon:
+            item = heappop(overflow)
+            if self._item_slots.get(item) is _OVERFLOW:
+                self._insert_item(item)
+            else:
+                self._overflow_stale -= 1
+
+    def _collect_due_items(self, now, first, last):
+        wheel = self._wheel
+        slots = len(wheel)
+        if last - first >= slots:
+            first, last = 0, slots - 1
+
+        item_slots = self._item_slots
+        due = []
+        for index in range(first, last + 1):
+            bucket = wheel[index % slots]
+            if bucket:
+                items = [item for item in bucket if item.next_ts <= now]
+                for item in items:
+                    bucket.discard(item)
+                    del item_slots[item]
+                due.extend(items)
+        return due
+
+    def call_scheduled_functions(self, dt):
+        now = self.last_ts
+        result = self._call_tick_items(dt)
+
+        previous = self._cursor
+        current = self._cursor = self._get_slot_index(now)
+        self._pull_overflow()
+        due = self._collect_due_items(now, min(previous, current),
+                                      max(previous, current))
+        if not due:
+            return result
+
+        while due:
+            # Call in the same order as the heap would
+            due.sort(key=attrgetter('next_ts'))
+            self._due_items = due
+            for i, item in enumerate(due):
+                self._due_position = i + 1
+                if item.func is _unscheduled:
+                    # Cancelled by a previous callback
+                    continue
+
+                self._current_interval_item = item
+                func = item.func
+                if isinstance(func, WeakMethod):
+                    func = func()
+                    if func is None:
+                        # Unschedule it as the object is dead!
+                        self.unschedule(item.func)
+                        continue
+
+                func(now - item.last_ts, *item.args, **item.kwargs)
+
+                if item.interval:
+                    self._advance_interval_item(item, now)
+                    self._insert_item(item)
+                else:
+                    item.clock = None
+                    self._forget_item(item)
+
+            self._current_interval_item = None
+            self._due_items = ()
+
+            # Functions scheduled by the callbacks may already be due.
+            due = self._collect_due_items(now, current, current)
+
+        return True
+
+    def _get_next_ts(self):
+        overflow = self._overflow
+        while overflow and self._item_slots.get(overflow[0]) is not _OVERFLOW:
+            heappop(overflow)
+            self._overflow_stale -= 1
+        next_ts = overflow[0].next_ts if overflow else None
+
+        wheel = self._wheel
+        slots = len(wheel)
+        for index in range(self._cursor, self._cursor + slots):
+            bucket = wheel[index % slots]
+            if bucket:
+                ts = min(item.next_ts for item in bucket)
+                if next_ts is None or ts < next_ts:
+                    next_ts = ts
+                # No later slot can hold an earlier item.
+                if next_ts < (index + 1) * self._resolution:
+                    break
+        return next_ts
+
+    def get_sleep_time(self, sleep_idle):
+        if self._schedule_items or not sleep_idle:
+            return 0.0
+
+        if self._item_slots:
+            return max(self._get_next_ts() - self.time(), 0.0)
+
+        return None
+
+    get_sleep_time.__doc__ = Clock.get_sleep_time.__doc__
+
+    def _get_soft_next_ts(self, last_ts, interval):
+        wheel = self._wheel
+        slots = len(wheel)
+
+        def taken(ts, e):
+            """Check if `ts` has already got an item scheduled nearby."""
+            first = max(self._get_slot_index(ts - e), self._cursor)
+            last = max(self._get_slot_index(ts + e), self._cursor)
+            for index in range(first, min(last, first + slots - 1) + 1):
+                for item in wheel[index % slots]:
+                    if abs(item.next_ts - ts) <= e:
+                        return True
+
+            # Items still waiting to be called this tick
+            due = self._due_items
+            for i in range(len(due) - 1, self._due_position - 1, -1):
+                item = due[i]
+                if item.next_ts < ts - e:
+                    break
+                if item.next_ts <= ts + e:
+                    return True
+
+            if last >= self._cursor + slots:
+                for item in self._overflow:
+                    if (abs(item.next_ts - ts) <= e and
+                            self._item_slots.get(item) is _OVERFLOW):
+                        return True
+
+            return False
+
+        return _find_soft_next_ts(last_ts, interval, taken)
+
+    def unschedule(self, func):
+        if inspect.ismethod(func):
+            func = WeakMethod(func)
+
+        for item in self._items_by_func.pop(func, ()):
+            self._cancel(item)
 
         self._schedule_items = [i for i in self._schedule_items if i.func != func]
 
+    unschedule.__doc__ = Clock.unschedule.__doc__
+
+    def _cancel(self, item):
+        if not isinstance(item, _ScheduledIntervalItem):
+            super(TimerWheelClock, self)._cancel(item)
+            return
+
+        item.clock = None
+        self._remove_item(item)
+        self._forget_item(item)
+        # The item may be in the middle of being called; make sure it
+        # is neither called nor rescheduled afterwards.
+        item.interval = 0
+        item.func = _unscheduled
+
 
 # Default clock.
 _default = Clock()
@@ -729,8 +1108,11 @@ def schedule(func, *args, **kwargs):
     :Parameters:
         `func` : callable
             The function to call each frame.
+
+    :return: A handle whose ``cancel()`` method removes this call from the
+             schedule.
     """
-    _default.schedule(func, *args, **kwargs)
+    return _default.schedule(func, *args, **kwargs)
 
 
 def schedule_interval(func, interval, *args, **kwargs):
@@ -744,8 +1126,11 @@ def schedule_interval(func, interval, *args, **kwargs):
             The function to call when the timer lapses.
         `interval` : float
             The number of seconds to wait between each call.
+
+    :return: A handle whose ``cancel()`` method removes this call from the
+             schedule.
     """
-    _default.schedule_interval(func, interval, *args, **kwargs)
+    return _default.schedule_interval(func, interval, *args, **kwargs)
 
 
 def schedule_interval_soft(func, interval, *args, **kwargs):
@@ -767,8 +1152,10 @@ def schedule_interval_soft(func, interval, *args, **kwargs):
         `interval` : float
             The number of seconds to wait between each call.
 
+    :return: A handle whose ``cancel()`` method removes this call from the
+             schedule.
     """
-    _default.schedule_interval_soft(func, interval, *args, **kwargs)
+    return _default.schedule_interval_soft(func, interval, *args, **kwargs)
 
 
 def schedule_once(func, delay, *args, **kwargs):
@@ -786,8 +1173,11 @@ def schedule_once(func, delay, *args, **kwargs):
             The function to call when the timer lapses.
         `delay` : float
             The number of seconds to wait before the timer lapses.
+
+    :return: A handle whose ``cancel()`` method removes this call from the
+             schedule.
     """
-    _default.schedule_once(func, delay, *args, **kwargs)
+    return _default.schedule_once(func, delay, *args, **kwargs)
 
 
 def unschedule(func):
@@ -167,6 +167,10 @@ class EventDispatcher(object):
     # Placeholder empty stack; real stack is created only if needed
     _event_stack = ()
 
+    # Dict of event type to the tuple of handlers dispatch_event calls, in
+    # stack order; rebuilt lazily after the stack is modified.
+    _event_chains = None
+
     @classmethod
     def register_event_type(cls, name):
         """Register an event type with the dispatcher.
@@ -200,6 +204,7 @@ class EventDispatcher(object):
 
         # Place dict full of new handlers at beginning of stack
         self._event_stack.insert(0, {})
+        self._event_chains = None
         self.set_handlers(*args, **kwargs)
 
     def _get_handlers(self, args, kwargs):
@@ -260,6 +265,7 @@ class EventDispatcher(object):
             self._event_stack = [{}]
 
         self._event_stack[0][name] = handler
+        self._event_chains = None
 
     def pop_handlers(self):
         """Pop the top level of event handlers off the stack.
@@ -267,6 +273,7 @@ class EventDispatcher(object):
         assert self._event_stack and 'No handlers pushed'
 
         del self._event_stack[0]
+        self._event_chains = None
 
     def remove_handlers(self, *args, **kwargs):
         """Remove event handlers from the event stack.
@@ -299,6 +306,8 @@ class EventDispatcher(object):
         if not frame:
             return
 
+        self._event_chains = None
+
         # Remove each handler from the frame.
         for name, handler in handlers:
             try:
@@ -332,6 +341,7 @@ class EventDispatcher(object):
             try:
                 if frame[name] == handler:
                     del frame[name]
+                    self._event_chains = None
                     break
             except KeyError:
                 pass
@@ -348,6 +358,24 @@ class EventDispatcher(object):
                 del frame[name]
                 if not frame:
                     self._event_stack.remove(frame)
+        self._event_chains = None
+
+    def _get_event_chain(self, event_type):
+        """Build and cache the handlers on the stack for `event_type`."""
+        assert hasattr(self, 'event_types'), (
+            "No events registered on this EventDispatcher. "
+            "You need to register events with the class method "
+            "EventDispatcher.register_event_type('event_name')."
+        )
+        assert event_type in self.event_types,\
+            "%r not found in %r.event_types == %r" % (event_type, self, self.event_types)
+
+        if self._event_chains is None:
+            self._event_chains = {}
+        chain = tuple(frame[event_type] for frame in self._event_stack
+                      if frame.get(event_type, None))
+        self._event_chains[event_type] = chain
+        return chain
 
     def dispatch_event(self, event_type, *args):
         """Dispatch a single event to the attached handlers.
@@ -376,21 +404,17 @@ class EventDispatcher(object):
             is always ``None``.
 
         """
-        assert hasattr(self, 'event_types'), (
-            "No events registered on this EventDispatcher. "
-            "You need to register events with the class method "
-            "EventDispatcher.register_event_type('event_name')."
-        )
-        assert event_type in self.event_types,\
-            "%r not found in %r.event_types == %r" % (event_type, self, self.event_types)
+        # The chain is a snapshot of the stack; handlers may modify the
+        # stack while it is being dispatched.
+        try:
+            chain = self._event_chains[event_type]
+        except (KeyError, TypeError):
+            chain = self._get_event_chain(event_type)
 
         invoked = False
 
-        # Search handler stack for matching event handlers
-        for frame in list(self._event_stack):
-            handler = frame.get(event_type, None)
-            if not handler:
-                continue
+        # Call matching event handlers from the top of the stack
+        for handler in chain:
             if isinstance(handler, WeakMethod):
                 handler = handler()
                 assert handler is not None
@@ -402,15 +426,17 @@ class EventDispatcher(object):
                 self._raise_dispatch_exception(event_type, args, handler, exception)
 
         # Check instance for an event handler
-        try:
-            if getattr(self, event_type)(*args):
-                return EVENT_HANDLED
-        except AttributeError:
-            pass
-        except TypeError as exception:
-            self._raise_dispatch_exception(event_type, args, getattr(self, event_type), exception)
-        else:
-            invoked = True
+        handler = getattr(self, event_type, None)
+        if handler is not None:
+            try:
+                if handler(*args):
+                    return EVENT_HANDLED
+            except AttributeError:
+                pass
+            except TypeError as exception:
+                self._raise_dispatch_exception(event_type, args, handler, exception)
+            else:
+                invoked = True
 
         if invoked:
             return EVENT_UNHANDLED
@@ -52,6 +52,12 @@ import unicodedata
 from pyglet.gl import *
 from pyglet import image
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
 _other_grapheme_extend = list(map(chr, [0x09be, 0x09d7, 0x0be3, 0x0b57, 0x0bbe, 0x0bd7, 0x0cc2,
                                         0x0cd5, 0x0cd6, 0x0d3e, 0x0d57, 0x0dcf, 0x0ddf, 0x200c,
                                         0x200d, 0xff9e, 0xff9f])) # skip codepoints above U+10000
@@ -302,6 +308,8 @@ class Font(object):
     def __init__(self):
         self.textures = []
         self.glyphs = {}
+        self._quad_rows = {}
+        self._quads = None
 
     @classmethod
     def add_font_data(cls, data):
@@ -394,6 +402,47 @@ class Font(object):
             glyphs.append(self.glyphs[c])
         return glyphs
 
+    def get_glyph_quads(self, glyphs):
+        """Return the quads of `glyphs` as a packed array.
+
+        The quad, advance and texture coordinates of each glyph are copied
+        into a table kept by the font the first time the glyph is requested,
+        so that a run of glyphs can be positioned with array operations
+        instead of per-glyph attribute lookups.  Requires NumPy.
+
+        :Parameters:
+            `glyphs` : sequence of `Glyph`
+                Glyphs created by this font.
+
+        :rtype: `numpy.ndarray`
+        :return: An array of shape ``(len(glyphs), 21)``.  Columns 0 to 7
+            hold the four corners of the glyph quad, as in
+            `Glyph.vertices`, in ``GL_QUADS`` order; column 8 holds
+            `Glyph.advance` and columns 9 to 20 hold `Glyph.tex_coords`.
+
+        .. versionadded:: 1.4
+        """
+        rows = self._quad_rows
+        try:
+            indices = [rows[glyph] for glyph in glyphs]
+        except KeyError:
+            for glyph in glyphs:
+                if glyph not in rows:
+                    self._add_glyph_quad(glyph)
+            indices = [rows[glyph] for glyph in glyphs]
+        return self._quads.take(indices, axis=0)
+
+    def _add_glyph_quad(self, glyph):
+        row = len(self._quad_rows)
+        if self._quads is None:
+            self._quads = numpy.empty((64, 21))
+        elif row == len(self._quads):
+            self._quads = numpy.concatenate((self._quads, numpy.empty_like(self._quads)))
+        v0, v1, v2, v3 = glyph.vertices
+        self._quads[row, :8] = (v0, v1, v2, v1, v2, v3, v0, v3)
+        self._quads[row, 8] = glyph.advance
+        self._quads[row, 9:] = glyph.tex_coords
+        self._quad_rows[glyph] = row
 
     def get_glyphs_for_width(self, text, width):
         """Return a list of glyphs for `text` that fit within the given width.
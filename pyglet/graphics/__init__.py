@@ -164,10 +164,14 @@ from builtins import object
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
+import bisect
 import ctypes
+import functools
+import weakref
 
 import pyglet
 from pyglet.gl import *
+from pyglet import clock
 from pyglet import gl
 from pyglet.graphics import vertexbuffer, vertexattribute, vertexdomain
 
@@ -319,9 +323,33 @@ class Batch(object):
     sent to the graphics card in a single operation.
 
     Call `VertexList.delete` to remove a vertex list from the batch.
+
+    If the batch is created with ``optimize_state=True``, state changes that
+    have no effect are removed from the draw list: the `Group.set_state` and
+    `Group.unset_state` calls of groups that do not override them are
+    skipped, a group followed by a group of the same class with an equal
+    `Group.state_key` is not unset and set again, and otherwise the
+    transition between two such groups is made with `Group.switch_state`.
     '''
-    def __init__(self):
-        '''Create a graphics batch.'''
+    def __init__(self, allocator_class=None, optimize_state=False):
+        '''Create a graphics batch.
+
+        :Parameters:
+            `allocator_class` : class
+                Allocator implementation used by the vertex domains of this
+                batch, for example
+                :py:class:`~pyglet.graphics.allocation.FreeListAllocator`
+                for batches with many frequently created and deleted vertex
+                lists.  Defaults to
+                :py:class:`~pyglet.graphics.allocation.Allocator`.
+            `optimize_state` : bool
+                If True, redundant group state changes between consecutive
+                groups are eliminated from the draw list.
+
+        '''
+        self.allocator_class = allocator_class
+        self.optimize_state = optimize_state
+
         # Mapping to find domain.  
         # group -> (attributes, mode, indexed) -> domain
         self.group_map = {}
@@ -335,6 +363,21 @@ class Batch(object):
         self._draw_list = []
         self._draw_list_dirty = False
 
+        # Flattened draw list of each group's subtree, and the groups whose
+        # subtree changed since the draw list was last updated.  A group's
+        # ancestors are always dirty when it is.
+        self._group_draw_lists = {}
+        self._dirty_groups = set()
+        self._draw_list_resort = False
+
+        self._draw_list_stats = {
+            'updates': 0,
+            'groups_rebuilt': 0,
+            'groups_reused': 0,
+            'state_changes': 0,
+            'draw_calls': 0,
+        }
+
     def invalidate(self):
         '''Force the batch to update the draw list.
 
@@ -343,6 +386,42 @@ class Batch(object):
 
         .. versionadded:: 1.2
         '''
+        self._dirty_groups.update(self.group_map)
+        self._draw_list_resort = True
+        self._draw_list_dirty = True
+
+    def get_draw_list_stats(self):
+        '''Get counters describing the cost of updating the draw list.
+
+        The draw list is updated incrementally: only groups whose subtree
+        changed (a group or domain was added or removed) are rebuilt, other
+        groups reuse their previous part of the draw list.  The returned
+        dictionary has the keys:
+
+        ``updates``
+            Number of times the draw list was updated.
+        ``groups_rebuilt``
+            Total number of groups whose part of the draw list was rebuilt.
+        ``groups_reused``
+            Total number of groups whose part of the draw list was reused.
+        ``state_changes``
+            Number of group state changes (calls to `Group.set_state`,
+            `Group.unset_state` or `Group.switch_state`) made by each
+            `draw`.
+        ``draw_calls``
+            Number of vertex domains drawn by each `draw`; each domain is
+            drawn with a single OpenGL draw call.
+
+        :rtype: dict
+
+        .. versionadded:: 1.4
+        '''
+        return dict(self._draw_list_stats)
+
+    def _mark_dirty(self, group):
+        while group is not None and group not in self._dirty_groups:
+            self._dirty_groups.add(group)
+            group = group.parent
         self._draw_list_dirty = True
 
     def add(self, count, mode, group, *data):
@@ -435,6 +514,75 @@ class Batch(object):
             domain = batch._get_domain(False, mode, group, formats)
         vertex_list.migrate(domain)
 
+    def compact(self, budget=None, threshold=0.0):
+        '''Compact the vertex domains of the batch.
+
+        Deleting vertex lists leaves gaps in the buffers of their domain, so
+        that drawing the domain requires more ranges.  This method moves
+        the remaining vertex lists together; see
+        :py:meth:`~pyglet.graphics.vertexdomain.VertexDomain.compact` for
+        details.  The fragmentation of a domain can be observed with
+        ``domain.allocator.get_fragmentation()``.
+
+        :Parameters:
+            `budget` : int
+                Maximum number of vertices to move over all domains, or
+                ``None`` to fully compact every domain (and shrink its
+                buffers where possible).
+            `threshold` : float
+                Domains whose fragmentation is not above this fraction are
+                skipped.  Only used when a `budget` is given.
+
+        :rtype: int
+        :return: The number of vertices moved.
+
+        .. versionadded:: 1.4
+        '''
+        moved = 0
+        for domain_map in list(self.group_map.values()):
+            for domain in list(domain_map.values()):
+                if budget is None:
+                    moved += domain.compact()
+                elif moved >= budget:
+                    return moved
+                elif domain.allocator.get_fragmentation() > threshold:
+                    moved += domain.compact(budget - moved)
+        return moved
+
+    def schedule_compaction(self, interval=1.0, budget=4096, threshold=0.25):
+        '''Incrementally compact the batch from the clock.
+
+        Every `interval` seconds, up to `budget` vertices are moved in
+        domains whose fragmentation exceeds `threshold`.  Compaction stops when
+        :py:meth:`unschedule_compaction` is called, or when the batch is
+        garbage collected: the clock only holds a weak reference to it.
+
+        :Parameters:
+            `interval` : float
+                Seconds between compaction steps.
+            `budget` : int
+                Maximum number of vertices moved per step.
+            `threshold` : float
+                Minimum fragmentation of a domain for it to be compacted.
+
+        .. versionadded:: 1.4
+        '''
+        self.unschedule_compaction()
+        self._compaction = (budget, threshold)
+        clock.schedule_interval(self._compact_step, interval)
+
+    def unschedule_compaction(self):
+        '''Stop incremental compaction started with
+        :py:meth:`schedule_compaction`.
+
+        .. versionadded:: 1.4
+        '''
+        clock.unschedule(self._compact_step)
+
+    def _compact_step(self, dt):
+        budget, threshold = self._compaction
+        self.compact(budget, threshold)
+
     def _get_domain(self, indexed, mode, group, formats):
         if group is None:
             group = null_group
@@ -452,34 +600,52 @@ class Batch(object):
         except KeyError:
             # Create domain
             if indexed:
-                domain = vertexdomain.create_indexed_domain(*formats)
+                domain = vertexdomain.create_indexed_domain(
+                    *formats, allocator_class=self.allocator_class)
             else:
-                domain = vertexdomain.create_domain(*formats)
+                domain = vertexdomain.create_domain(
+                    *formats, allocator_class=self.allocator_class)
             domain.__formats = formats
+            domain.__group = group
+            domain._on_empty = functools.partial(
+                _on_domain_empty, weakref.ref(self), group)
             domain_map[key] = domain
-            self._draw_list_dirty = True 
+            self._mark_dirty(group)
 
         return domain
 
     def _add_group(self, group):
         self.group_map[group] = {}
         if group.parent is None:
-            self.top_groups.append(group)
+            bisect.insort(self.top_groups, group)
         else:
             if group.parent not in self.group_map:
                 self._add_group(group.parent)
             if group.parent not in self.group_children:
                 self.group_children[group.parent] = []
-            self.group_children[group.parent].append(group)
-        self._draw_list_dirty = True
+            bisect.insort(self.group_children[group.parent], group)
+        self._mark_dirty(group)
 
     def _update_draw_list(self):
         '''Visit group tree in preorder and create a list of bound methods
         to call.
+
+        Only the subtrees of dirty groups are visited; the draw lists of
+        other groups are reused.
         '''
+        dirty_groups = self._dirty_groups
+        group_draw_lists = self._group_draw_lists
+        resort = self._draw_list_resort
+        stats = self._draw_list_stats
 
         def visit(group):
-            draw_list = []
+            if group not in dirty_groups:
+                stats['groups_reused'] += 1
+                return group_draw_lists[group]
+            dirty_groups.discard(group)
+            stats['groups_rebuilt'] += 1
+
+            draw_list = [group.set_state]
 
             # Draw domains using this group
             domain_map = self.group_map[group]
@@ -491,18 +657,22 @@ class Batch(object):
                 draw_list.append(
                     (lambda d, m: lambda: d.draw(m))(domain, mode))
 
-            # Sort and visit child groups of this group
+            # Visit child groups of this group, which are kept sorted
             children = self.group_children.get(group)
             if children:
-                children.sort()
+                if resort:
+                    children.sort()
                 for child in list(children):
                     draw_list.extend(visit(child))
 
             if children or domain_map:
-                return [group.set_state] + draw_list + [group.unset_state]
+                draw_list.append(group.unset_state)
+                group_draw_lists[group] = draw_list
+                return draw_list
             else:
                 # Remove unused group from batch
                 del self.group_map[group]
+                group_draw_lists.pop(group, None)
                 if group.parent:
                     self.group_children[group.parent].remove(group)
                 try:
@@ -515,17 +685,64 @@ class Batch(object):
                     pass
                 return []
 
-        self._draw_list = []
+        draw_list = []
 
-        self.top_groups.sort()
+        if resort:
+            self.top_groups.sort()
         for group in list(self.top_groups):
-            self._draw_list.extend(visit(group))
-
+            draw_list.extend(visit(group))
+
+        if self.optimize_state:
+            draw_list = self._optimize_draw_list(draw_list)
+        self._draw_list = draw_list
+        stats['state_changes'] = sum(1 for func in draw_list
+                                     if _get_state_group(func) is not None)
+        stats['draw_calls'] = len(draw_list) - stats['state_changes']
+
+        dirty_groups.clear()
+        stats['updates'] += 1
+        self._draw_list_resort = False
         self._draw_list_dirty = False
 
         if _debug_graphics_batch:
             self._dump_draw_list()
 
+    @staticmethod
+    def _optimize_draw_list(draw_list):
+        '''Return a copy of the draw list without redundant state changes.'''
+        # Drop the calls of groups that do not change any state.
+        result = []
+        for func in draw_list:
+            group = _get_state_group(func)
+            if (group is not None and
+                    getattr(group.__class__, func.__name__) == getattr(Group, func.__name__)):
+                continue
+            result.append(func)
+
+        # Merge the unset of one group with the set of the next where
+        # possible.
+        draw_list = result
+        result = []
+        previous = None
+        for func in draw_list:
+            group = _get_state_group(func)
+            if (previous is not None and group is not None and
+                    func.__name__ == 'set_state' and
+                    group.__class__ is previous.__class__):
+                result.pop()
+                if _get_state_key(previous) != _get_state_key(group):
+                    result.append(functools.partial(group.switch_state, previous))
+                previous = None
+                continue
+
+            result.append(func)
+            if (group is not None and func.__name__ == 'unset_state' and
+                    _get_state_key(group) is not None):
+                previous = group
+            else:
+                previous = None
+        return result
+
     def _dump_draw_list(self):
         def dump(group, indent=''):
             print(indent, 'Begin group', group)
@@ -598,6 +815,46 @@ class Batch(object):
         for group in self.top_groups:
             visit(group)
 
+def _on_domain_empty(batch_ref, group, domain):
+    # Have an emptied domain, and its group if that is now empty too, removed
+    # from the draw list of the batch.  The batch is only weakly referenced
+    # by its domains.
+    batch = batch_ref()
+    if batch is not None:
+        batch._mark_dirty(group)
+
+
+def _get_state_group(func):
+    # Return the group whose state is changed by a draw list entry, or None
+    # if the entry draws a domain.
+    if isinstance(func, functools.partial):
+        return func.func.__self__
+    group = getattr(func, '__self__', None)
+    if isinstance(group, Group):
+        return group
+    return None
+
+
+def _get_state_key(group):
+    # Return the state key of a group, or None if it cannot be trusted: the
+    # key and `switch_state` must be defined by the class that defines
+    # `set_state` and `unset_state`, or by a subclass of it.  A subclass
+    # that overrides only `set_state` or `unset_state` of a keyed group sets
+    # state that the inherited key does not describe.
+    mro = group.__class__.__mro__
+
+    def owner(name):
+        for i, cls in enumerate(mro):
+            if name in cls.__dict__:
+                return i
+
+    state = min(owner('set_state'), owner('unset_state'))
+    switch = owner('switch_state')
+    if owner('state_key') > state or (switch > state and mro[switch] is not Group):
+        return None
+    return group.state_key
+
+
 class Group(object):
     '''Group of common OpenGL state.
 
@@ -606,6 +863,20 @@ class Group(object):
     subclasses; the default state change has no effect, and groups vertex
     lists only in the order in which they are drawn.
     '''
+    #: Hashable description of the OpenGL state set by this group, or
+    #: ``None``.  Batches created with ``optimize_state=True`` do not unset
+    #: and set again the state between two consecutive groups of the same
+    #: class whose keys are equal; if the keys differ `switch_state` is used.
+    #:
+    #: The key must be defined by the class that defines `set_state` and
+    #: `unset_state` (or by a subclass of it), and so must `switch_state`
+    #: unless the default is kept.  A subclass that overrides `set_state` or
+    #: `unset_state` of a keyed group without defining its own key is always
+    #: unset and set again.
+    #:
+    #: .. versionadded:: 1.4
+    state_key = None
+
     def __init__(self, parent=None):
         '''Create a group.
 
@@ -620,6 +891,21 @@ class Group(object):
     def __lt__(self, other):
         return hash(self) < hash(other)
 
+    def switch_state(self, previous):
+        '''Change from the state of `previous` to the state of this group.
+
+        Only called by batches created with ``optimize_state=True``, for
+        groups with a `state_key`, in place of ``previous.unset_state()``
+        followed by ``self.set_state()``.  `previous` is always of the same
+        class as this group.  Subclasses can override this to change only
+        the state that differs; the default implementation unsets and sets
+        the state.
+
+        .. versionadded:: 1.4
+        '''
+        previous.unset_state()
+        self.set_state()
+
     def set_state(self):
         '''Apply the OpenGL state change.  
         
@@ -691,6 +977,16 @@ class TextureGroup(Group):
     def unset_state(self):
         glDisable(self.texture.target)
 
+    def switch_state(self, previous):
+        if previous.texture.target != self.texture.target:
+            glDisable(previous.texture.target)
+            glEnable(self.texture.target)
+        glBindTexture(self.texture.target, self.texture.id)
+
+    @property
+    def state_key(self):
+        return self.texture.target, self.texture.id
+
     def __hash__(self):
         return hash((self.texture.target, self.texture.id, self.parent))
 
@@ -45,6 +45,13 @@ allocation.  The buffer is never resized smaller.
 
 The allocator maintains references to free space only; it is the caller's
 responsibility to maintain the allocated regions.
+
+Two implementations are provided.  `Allocator` keeps a list of allocated
+blocks and searches it linearly; it is compact and fast for domains holding
+few vertex lists.  `FreeListAllocator` keeps the free blocks in size-bucketed
+free lists, so that an allocation only looks at blocks of about the requested
+size or larger; this suits domains with tens of thousands of vertex lists
+that are frequently created and deleted.  Both present the same interface.
 '''
 from __future__ import print_function
 from __future__ import division
@@ -54,6 +61,8 @@ from builtins import object
 
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
+
+import bisect
  
 # Common cases:
 # -regions will be the same size (instances of same object, e.g. sprites)
@@ -407,3 +416,302 @@ class Allocator(object):
 
     def __repr__(self):
         return '<%s %s>' % (self.__class__.__name__, str(self))
+
+
+class FreeListAllocator(object):
+    '''Buffer space allocation using segregated free lists.
+
+    Free blocks are indexed by their start and end (for coalescing on
+    `dealloc`) and bucketed by the bit length of their size, so that `alloc`
+    only inspects blocks that are large enough.  The space between the last
+    allocated block and the capacity is an ordinary free block, which is
+    used only when no smaller free block fits.
+
+    `alloc` takes the first fitting block of the bucket of the requested
+    size, scanning that bucket linearly, or else any block of a larger
+    bucket.  Adding and removing a free block also updates a sorted list of
+    free block starts, found by binary search but inserted into and deleted
+    from in time linear in the number of free blocks (a memory move).
+
+    The interface and the `AllocatorMemoryException` growth contract are
+    identical to `Allocator`.
+    '''
+    def __init__(self, capacity):
+        '''Create an allocator for a buffer of the specified capacity.
+
+        :Parameters:
+            `capacity` : int
+                Maximum size of the buffer.
+
+        '''
+        self.capacity = capacity
+
+        # Free blocks: start -> size, end -> start, and the sorted list of
+        # starts (used to derive the allocated regions).
+        self._free_sizes = {}
+        self._free_ends = {}
+        self._free_starts = []
+
+        # Bucket index (size.bit_length()) -> set of free block starts.
+        self._buckets = {}
+
+        self._free_total = 0
+        self._regions = None
+
+        if capacity:
+            self._add_free(0, capacity)
+
+    def _add_free(self, start, size):
+        self._free_total += size
+        self._free_sizes[start] = size
+        self._free_ends[start + size] = start
+        bisect.insort(self._free_starts, start)
+        bucket = size.bit_length()
+        try:
+            self._buckets[bucket].add(start)
+        except KeyError:
+            self._buckets[bucket] = set((start,))
+
+    def _remove_free(self, start):
+        size = self._free_sizes.pop(start)
+        self._free_total -= size
+        del self._free_ends[start + size]
+        del self._free_starts[bisect.bisect_left(self._free_starts, start)]
+        self._buckets[size.bit_length()].discard(start)
+        return size
+
+    def _resize_free(self, start, size):
+        # Change the size of a free block without changing its start.
+        old_size = self._free_sizes[start]
+        self._free_total += size - old_size
+        del self._free_ends[start + old_size]
+        self._buckets[old_size.bit_length()].discard(start)
+        self._free_sizes[start] = size
+        self._free_ends[start + size] = start
+        bucket = size.bit_length()
+        try:
+            self._buckets[bucket].add(start)
+        except KeyError:
+            self._buckets[bucket] = set((start,))
+
+    @property
+    def starts(self):
+        '''Start indices of the (aggregate) allocated regions.
+
+        :type: list of int
+        '''
+        return self.get_allocated_regions()[0]
+
+    @property
+    def sizes(self):
+        '''Sizes of the (aggregate) allocated regions.
+
+        :type: list of int
+        '''
+        return self.get_allocated_regions()[1]
+
+    def set_capacity(self, size):
+        '''Resize the maximum buffer size.
+
+        The capaity cannot be reduced.
+
+        :Parameters:
+            `size` : int
+                New maximum size of the buffer.
+
+        '''
+        assert size > self.capacity
+        tail = self._free_ends.get(self.capacity)
+        if tail is not None:
+            self._resize_free(tail, size - tail)
+        else:
+            self._add_free(self.capacity, size - self.capacity)
+        self.capacity = size
+        self._regions = None
+
+    def _find_free(self, size):
+        # Returns the start of a free block of at least `size`, preferring
+        # blocks other than the tail block.
+        tail = self._free_ends.get(self.capacity)
+        bucket = size.bit_length()
+        for start in self._buckets.get(bucket, ()):
+            if start != tail and self._free_sizes[start] >= size:
+                return start
+        for bucket in sorted(self._buckets):
+            if bucket <= size.bit_length():
+                continue
+            for start in self._buckets[bucket]:
+                if start != tail:
+                    return start
+        if tail is not None and self._free_sizes[tail] >= size:
+            return tail
+        return None
+
+    def alloc(self, size):
+        '''Allocate memory in the buffer.
+
+        Raises `AllocatorMemoryException` if the allocation cannot be
+        fulfilled.
+
+        :Parameters:
+            `size` : int
+                Size of region to allocate.
+
+        :rtype: int
+        :return: Starting index of the allocated region.
+        '''
+        assert size >= 0
+
+        if size == 0:
+            return 0
+
+        start = self._find_free(size)
+        if start is None:
+            tail = self._free_ends.get(self.capacity)
+            free_size = self._free_sizes[tail] if tail is not None else 0
+            raise AllocatorMemoryException(self.capacity + size - free_size)
+
+        free_size = self._remove_free(start)
+        if free_size > size:
+            self._add_free(start + size, free_size - size)
+        self._regions = None
+        return start
+
+    def realloc(self, start, size, new_size):
+        '''Reallocate a region of the buffer.
+
+        This is more efficient than separate `dealloc` and `alloc` calls, as
+        the region can often be resized in-place.
+
+        Raises `AllocatorMemoryException` if the allocation cannot be
+        fulfilled.
+
+        :Parameters:
+            `start` : int
+                Current starting index of the region.
+            `size` : int
+                Current size of the region.
+            `new_size` : int
+                New size of the region.
+
+        '''
+        assert size >= 0 and new_size >= 0
+
+        if new_size == 0:
+            if size != 0:
+                self.dealloc(start, size)
+            return 0
+        elif size == 0:
+            return self.alloc(new_size)
+
+        # Truncation is the same as deallocating the tail cruft
+        if new_size < size:
+            self.dealloc(start + new_size, size - new_size)
+            return start
+        elif new_size == size:
+            return start
+
+        # Expand in place into the following free block, if there is one.
+        end = start + size
+        free_size = self._free_sizes.get(end)
+        if free_size is not None and free_size >= new_size - size:
+            self._remove_free(end)
+            if free_size > new_size - size:
+                self._add_free(start + new_size, free_size - (new_size - size))
+            self._regions = None
+            return start
+
+        # Allocate first so that a failure leaves the region untouched.
+        result = self.alloc(new_size)
+        self.dealloc(start, size)
+        return result
+
+    def dealloc(self, start, size):
+        '''Free a region of the buffer.
+
+        :Parameters:
+            `start` : int
+                Starting index of the region.
+            `size` : int
+                Size of the region.
+
+        '''
+        assert size >= 0
+
+        if size == 0:
+            return
+
+        assert start + size <= self.capacity, 'Region not allocated'
+        assert start not in self._free_sizes, 'Region not allocated'
+
+        # Coalesce with the free blocks on either side.
+        end = start + size
+        if end in self._free_sizes:
+            size += self._remove_free(end)
+        before = self._free_ends.get(start)
+        if before is not None:
+            size += self._remove_free(before)
+            start = before
+        self._add_free(start, size)
+        self._regions = None
+
+    def get_allocated_regions(self):
+        '''Get a list of (aggregate) allocated regions.
+
+        The result of this method is ``(starts, sizes)``, where ``starts`` is
+        a list of starting indices of the regions and ``sizes`` their
+        corresponding lengths.
+
+        :rtype: (list, list)
+        '''
+        if self._regions is None:
+            starts = []
+            sizes = []
+            position = 0
+            free_sizes = self._free_sizes
+            for free_start in self._free_starts:
+                if free_start > position:
+                    starts.append(position)
+                    sizes.append(free_start - position)
+                position = free_start + free_sizes[free_start]
+            if position < self.capacity:
+                starts.append(position)
+                sizes.append(self.capacity - position)
+            self._regions = (starts, sizes)
+        return self._regions
+
+    def get_fragmented_free_size(self):
+        '''Returns the amount of space unused, not including the final
+        free block.
+
+        :rtype: int
+        '''
+        free_size = self.get_free_size()
+        tail = self._free_ends.get(self.capacity)
+        if tail is not None:
+            free_size -= self._free_sizes[tail]
+        return free_size
+
+    def get_free_size(self):
+        '''Return the amount of space unused.
+
+        :rtype: int
+        '''
+        return self._free_total
+
+    def get_usage(self):
+        '''Return fraction of capacity currently allocated.
+
+        :rtype: float
+        '''
+        return 1. - self.get_free_size() / float(self.capacity)
+
+    def get_fragmentation(self):
+        '''Return fraction of free space that is not expandable.
+
+        :rtype: float
+        '''
+        free_size = self.get_free_size()
+        if free_size == 0:
+            return 0.
+        return self.get_fragmented_free_size() / float(free_size)
@@ -54,6 +54,11 @@ to the underlying buffers automatically.
 The entire domain can be efficiently drawn in one step with the
 :py:meth:`VertexDomain.draw` method, assuming all the vertices comprise
 primitives of the same OpenGL primitive mode.
+
+As vertex lists are created and deleted the buffers become fragmented, and
+drawing the domain requires more ranges.  :py:meth:`VertexDomain.compact`
+moves the live vertex lists back together, and shrinks the buffers when they
+are mostly unused.
 """
 from builtins import zip
 from builtins import object
@@ -63,6 +68,7 @@ __version__ = '$Id: $'
 
 import ctypes
 import re
+from operator import attrgetter
 
 from pyglet.gl import *
 from pyglet.graphics import allocation, vertexattribute, vertexbuffer
@@ -127,28 +133,34 @@ def create_attribute_usage(fmt):
     return attribute, usage, vbo
 
 
-def create_domain(*attribute_usage_formats):
+def create_domain(*attribute_usage_formats, **kwargs):
     """Create a vertex domain covering the given attribute usage formats.
     See documentation for :py:func:`create_attribute_usage` and
     :py:func:`pyglet.graphics.vertexattribute.create_attribute` for the grammar
     of these format strings.
 
+    The optional keyword argument ``allocator_class`` selects the
+    :py:mod:`~pyglet.graphics.allocation` implementation used by the domain.
+
     :rtype: :py:class:`VertexDomain`
     """
     attribute_usages = [create_attribute_usage(f) for f in attribute_usage_formats]
-    return VertexDomain(attribute_usages)
+    return VertexDomain(attribute_usages, **kwargs)
 
 
-def create_indexed_domain(*attribute_usage_formats):
+def create_indexed_domain(*attribute_usage_formats, **kwargs):
     """Create an indexed vertex domain covering the given attribute usage
     formats.  See documentation for :py:class:`create_attribute_usage` and
     :py:func:`pyglet.graphics.vertexattribute.create_attribute` for the grammar
     of these format strings.
 
+    The optional keyword argument ``allocator_class`` selects the
+    :py:mod:`~pyglet.graphics.allocation` implementation used by the domain.
+
     :rtype: :py:class:`VertexDomain`
     """
     attribute_usages = [create_attribute_usage(f) for f in attribute_usage_formats]
-    return IndexedVertexDomain(attribute_usages)
+    return IndexedVertexDomain(attribute_usages, **kwargs)
 
 
 class VertexDomain(object):
@@ -156,12 +168,27 @@ class VertexDomain(object):
 
     Construction of a vertex domain is usually done with the
     :py:func:`create_domain` function.
+
+    The allocator used to place vertex lists within the buffers defaults to
+    :py:class:`~pyglet.graphics.allocation.Allocator`; domains holding many
+    short-lived vertex lists can pass ``allocator_class`` as
+    :py:class:`~pyglet.graphics.allocation.FreeListAllocator` instead.
     """
     _version = 0
     _initial_count = 16
+    allocator_class = allocation.Allocator
+
+    # Called with the domain when its last vertex list is deleted or
+    # migrated to another domain; set by the batch owning the domain.
+    _on_empty = None
+
+    def __init__(self, attribute_usages, allocator_class=None):
+        if allocator_class is not None:
+            self.allocator_class = allocator_class
+        self.allocator = self.allocator_class(self._initial_count)
 
-    def __init__(self, attribute_usages):
-        self.allocator = allocation.Allocator(self._initial_count)
+        # Live vertex lists, needed to relocate them when compacting.
+        self._vertex_lists = set()
 
         # If there are any MultiTexCoord attributes, then a TexCoord attribute
         # must be converted.
@@ -274,7 +301,104 @@ class VertexDomain(object):
         :rtype: :py:class:`VertexList`
         """
         start = self._safe_alloc(count)
-        return VertexList(self, start, count)
+        vertex_list = VertexList(self, start, count)
+        self._vertex_lists.add(vertex_list)
+        return vertex_list
+
+    def _move_region(self, start, new_start, count):
+        """Copy `count` vertices from `start` to `new_start` in every buffer.
+        The regions may overlap."""
+        for buffer, _ in self.buffer_attributes:
+            size = count * buffer.element_size
+            ptr_type = ctypes.POINTER(ctypes.c_byte * size)
+            old = buffer.get_region(start * buffer.element_size, size, ptr_type)
+            new = buffer.get_region(new_start * buffer.element_size, size, ptr_type)
+            ctypes.memmove(new.array, old.array, size)
+            new.invalidate()
+
+    def _shrink_capacity(self, used, capacity):
+        # Halve the buffers while less than a quarter of them is in use.
+        new_capacity = capacity
+        while new_capacity > self._initial_count and used <= new_capacity // 4:
+            new_capacity //= 2
+        return new_capacity
+
+    def compact(self, budget=None):
+        """Move vertex lists together to remove free space between them.
+
+        If `budget` is ``None``, all vertex lists are moved down to the start
+        of the buffers, preserving their order, and the buffers are shrunk if
+        less than a quarter of their capacity is in use.
+
+        Otherwise an incremental pass is made: vertex lists at the end of the
+        buffers are relocated into free space nearer the start until `budget`
+        vertices have been moved.  Relocation does not preserve the order of
+        the vertex lists within the domain, and never shrinks the buffers.
+
+        The ``start`` (and index data) of moved vertex lists are updated; the
+        arrays previously returned by their attribute properties become
+        invalid.
+
+        :Parameters:
+            `budget` : int
+                Maximum number of vertices to move, or ``None`` for a full
+                compaction.
+
+        :rtype: int
+        :return: The number of vertices moved.
+        """
+        if budget is None:
+            moved = self._compact_full()
+        else:
+            moved = self._compact_incremental(budget)
+        if budget is None or moved:
+            self._version += 1
+        return moved
+
+    def _compact_full(self):
+        moved = 0
+        position = 0
+        for vertex_list in sorted(self._vertex_lists, key=attrgetter('start')):
+            if not vertex_list.count:
+                continue
+            if vertex_list.start != position:
+                self._move_region(vertex_list.start, position, vertex_list.count)
+                vertex_list._relocate(position)
+                moved += vertex_list.count
+            position += vertex_list.count
+
+        capacity = self._shrink_capacity(position, self.allocator.capacity)
+        if capacity != self.allocator.capacity:
+            for buffer, _ in self.buffer_attributes:
+                buffer.resize(capacity * buffer.element_size)
+        self.allocator = self.allocator_class(capacity)
+        self.allocator.alloc(position)
+        return moved
+
+    def _compact_incremental(self, budget):
+        if not self.allocator.get_fragmented_free_size():
+            return 0
+
+        moved = 0
+        for vertex_list in sorted(self._vertex_lists, key=attrgetter('start'),
+                                  reverse=True):
+            if moved >= budget:
+                break
+            count = vertex_list.count
+            if not count:
+                continue
+            try:
+                new_start = self.allocator.alloc(count)
+            except allocation.AllocatorMemoryException:
+                continue
+            if new_start >= vertex_list.start:
+                self.allocator.dealloc(new_start, count)
+                continue
+            self._move_region(vertex_list.start, new_start, count)
+            self.allocator.dealloc(vertex_list.start, count)
+            vertex_list._relocate(new_start)
+            moved += count
+        return moved
 
     def draw(self, mode, vertex_list=None):
         """Draw vertices in the domain.
@@ -324,7 +448,7 @@ class VertexDomain(object):
         glPopClientAttrib()
 
     def _is_empty(self):
-        return not self.allocator.starts
+        return not self.allocator.get_allocated_regions()[0]
 
     def __repr__(self):
         return '<%s@%x %s>' % (self.__class__.__name__, id(self), self.allocator)
@@ -400,6 +524,22 @@ class VertexList(object):
         self.start = new_start
         self.count = count
 
+        self._invalidate_caches()
+
+    def delete(self):
+        """Delete this group."""
+        domain = self.domain
+        domain.allocator.dealloc(self.start, self.count)
+        domain._vertex_lists.discard(self)
+        if not domain._vertex_lists and domain._on_empty is not None:
+            domain._on_empty(domain)
+
+    def _relocate(self, start):
+        # Called by the domain after it has moved the vertex data.
+        self.start = start
+        self._invalidate_caches()
+
+    def _invalidate_caches(self):
         self._colors_cache_version = None
         self._fog_coords_cache_version = None
         self._edge_flags_cache_version = None
@@ -408,10 +548,6 @@ class VertexList(object):
         self._tex_coords_cache_version = None
         self._vertices_cache_version = None
 
-    def delete(self):
-        """Delete this group."""
-        self.domain.allocator.dealloc(self.start, self.count)
-
     def migrate(self, domain):
         """Move this group from its current domain and add to the specified
         one.  Attributes on domains must match.  (In practice, used to change
@@ -433,17 +569,16 @@ class VertexList(object):
             new.array[:] = old.array[:]
             new.invalidate()
 
-        self.domain.allocator.dealloc(self.start, self.count)
+        old_domain = self.domain
+        old_domain.allocator.dealloc(self.start, self.count)
+        old_domain._vertex_lists.discard(self)
         self.domain = domain
         self.start = new_start
+        domain._vertex_lists.add(self)
+        if not old_domain._vertex_lists and old_domain._on_empty is not None:
+            old_domain._on_empty(old_domain)
 
-        self._colors_cache_version = None
-        self._fog_coords_cache_version = None
-        self._edge_flags_cache_version = None
-        self._normals_cache_version = None
-        self._secondary_colors_cache_version = None
-        self._tex_coords_cache_version = None
-        self._vertices_cache_version = None
+        self._invalidate_caches()
 
     def _set_attribute_data(self, i, data):
         attribute = self.domain.attributes[i]
@@ -621,10 +756,11 @@ class IndexedVertexDomain(VertexDomain):
     """
     _initial_index_count = 16
 
-    def __init__(self, attribute_usages, index_gl_type=GL_UNSIGNED_INT):
-        super(IndexedVertexDomain, self).__init__(attribute_usages)
+    def __init__(self, attribute_usages, index_gl_type=GL_UNSIGNED_INT,
+                 allocator_class=None):
+        super(IndexedVertexDomain, self).__init__(attribute_usages, allocator_class)
 
-        self.index_allocator = allocation.Allocator(self._initial_index_count)
+        self.index_allocator = self.allocator_class(self._initial_index_count)
 
         self.index_gl_type = index_gl_type
         self.index_c_type = vertexattribute._c_types[index_gl_type]
@@ -667,7 +803,40 @@ class IndexedVertexDomain(VertexDomain):
         """
         start = self._safe_alloc(count)
         index_start = self._safe_index_alloc(index_count)
-        return IndexedVertexList(self, start, count, index_start, index_count)
+        vertex_list = IndexedVertexList(self, start, count, index_start, index_count)
+        self._vertex_lists.add(vertex_list)
+        return vertex_list
+
+    def _move_index_region(self, start, new_start, count):
+        """Copy `count` indices from `start` to `new_start`.  The regions may
+        overlap."""
+        size = count * self.index_element_size
+        ptr_type = ctypes.POINTER(ctypes.c_byte * size)
+        old = self.index_buffer.get_region(start * self.index_element_size, size, ptr_type)
+        new = self.index_buffer.get_region(new_start * self.index_element_size, size, ptr_type)
+        ctypes.memmove(new.array, old.array, size)
+        new.invalidate()
+
+    def _compact_full(self):
+        moved = super(IndexedVertexDomain, self)._compact_full()
+
+        position = 0
+        for vertex_list in sorted(self._vertex_lists, key=attrgetter('index_start')):
+            if not vertex_list.index_count:
+                continue
+            if vertex_list.index_start != position:
+                self._move_index_region(vertex_list.index_start, position,
+                                        vertex_list.index_count)
+                vertex_list.index_start = position
+                vertex_list._indices_cache_version = None
+            position += vertex_list.index_count
+
+        capacity = self._shrink_capacity(position, self.index_allocator.capacity)
+        if capacity != self.index_allocator.capacity:
+            self.index_buffer.resize(capacity * self.index_element_size)
+        self.index_allocator = self.allocator_class(capacity)
+        self.index_allocator.alloc(position)
+        return moved
 
     def get_index_region(self, start, count):
         """Get a region of the index buffer.
@@ -793,6 +962,15 @@ class IndexedVertexList(VertexList):
         super(IndexedVertexList, self).delete()
         self.domain.index_allocator.dealloc(self.index_start, self.index_count)
 
+    def _relocate(self, start):
+        # Indices are absolute, so they follow the vertices.
+        diff = start - self.start
+        region = self.domain.get_index_region(self.index_start, self.index_count)
+        region.array[:] = [i + diff for i in region.array]
+        region.invalidate()
+        super(IndexedVertexList, self)._relocate(start)
+        self._indices_cache_version = None
+
     def migrate(self, domain):
         """Move this group from its current indexed domain and add to the 
         specified one.  Attributes on domains must match.  (In practice, used 
@@ -139,6 +139,12 @@ from io import open
 import re
 import weakref
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
 from ctypes import *
 
 from pyglet.gl import *
@@ -149,7 +155,6 @@ from pyglet.compat import asbytes, bytes_type, BytesIO
 from .codecs import ImageEncodeException, ImageDecodeException
 from .codecs import add_default_image_codecs, add_decoders, add_encoders
 from .codecs import get_animation_decoders, get_decoders, get_encoders
-from . import atlas
 
 
 class ImageException(Exception):
@@ -605,6 +610,90 @@ class UniformTextureSequence(TextureSequence):
         return self._get_item_height()
 
 
+def _convert_rows(data, width, height, current_format, current_pitch,
+                  format, pitch):
+    """Convert tightly sized image data between formats and pitches.
+
+    Produces the same bytes as the regular expression conversion in
+    `ImageData._convert`, including its quirks: channels missing from the
+    current format are filled from the first channel, and rows that are
+    lengthened are padded with ``'.'`` bytes.  Uses NumPy if it is available,
+    otherwise slices of the buffer.
+
+    Returns None if `data` is not exactly `height` rows of `current_pitch`
+    bytes, in which case the caller must fall back to the general path.
+    """
+    row_length = abs(current_pitch)
+    packed_pitch = width * len(current_format)
+    if len(data) != row_length * height or row_length < packed_pitch:
+        return None
+
+    sign_pitch = current_pitch // row_length
+    swap = None
+    if format != current_format:
+        swap = [current_format.index(c) if c in current_format else 0
+                for c in format]
+    new_pitch = current_pitch
+    if swap is not None:
+        new_pitch = sign_pitch * (len(format) * width)
+    # Final row length, padding to add and whether rows are reversed; the
+    # pitch is only changed if it differs after the format conversion.
+    if pitch != new_pitch:
+        pad = abs(pitch) - abs(new_pitch)
+        flip = new_pitch * pitch < 0
+    else:
+        pad = 0
+        flip = False
+
+    if _have_numpy:
+        rows = numpy.frombuffer(data, dtype=numpy.uint8)
+        rows = rows.reshape((height, row_length))
+        if swap is not None:
+            pixels = rows[:, :packed_pitch].reshape(
+                (height, width, len(current_format)))
+            rows = pixels[:, :, swap].reshape((height, width * len(format)))
+        if pad < 0:
+            rows = rows[:, :abs(pitch)]
+        elif pad > 0:
+            padded = numpy.empty((height, abs(pitch)), dtype=numpy.uint8)
+            padded[:, :rows.shape[1]] = rows
+            padded[:, rows.shape[1]:] = ord('.')
+            rows = padded
+        if flip:
+            rows = rows[::-1]
+        return rows.tobytes()
+
+    view = memoryview(data)
+    if swap is not None:
+        if row_length == packed_pitch:
+            packed = view
+        else:
+            packed = asbytes('').join(
+                view[i:i + packed_pitch]
+                for i in range(0, len(data), row_length))
+        components = len(current_format)
+        converted = bytearray(width * height * len(format))
+        for i, j in enumerate(swap):
+            converted[i::len(format)] = packed[j::components]
+        view = memoryview(converted)
+        row_length = width * len(format)
+
+    if not pad and not flip:
+        return bytes(view)
+
+    row_range = range(0, len(view), row_length)
+    if flip:
+        row_range = reversed(row_range)
+    if pad < 0:
+        rows = [view[i:i + abs(pitch)] for i in row_range]
+    elif pad > 0:
+        padding = asbytes('.') * pad
+        rows = [view[i:i + row_length].tobytes() + padding for i in row_range]
+    else:
+        rows = [view[i:i + row_length] for i in row_range]
+    return asbytes('').join(rows)
+
+
 class ImageData(AbstractImage):
     """An image represented as a string of unsigned bytes.
 
@@ -985,6 +1074,16 @@ class ImageData(AbstractImage):
         data = self._current_data
         current_pitch = self._current_pitch
         current_format = self._current_format
+        if format != current_format and len(current_format) > 4:
+            raise ImageException(
+                'Current image format is wider than 32 bits.')
+
+        converted = _convert_rows(data, self.width, self.height,
+                                  current_format, current_pitch,
+                                  format, pitch)
+        if converted is not None:
+            return converted
+
         sign_pitch = current_pitch // abs(current_pitch)
         if format != self._current_format:
             # Create replacement string, e.g. r'\4\1\2\3' to convert RGBA to
@@ -2500,5 +2599,8 @@ class AnimationFrame(object):
         return 'AnimationFrame(%r, %r)' % (self.image, self.duration)
 
 
+# atlas subclasses TextureRegion, so is imported once it is defined.
+from . import atlas
+
 # Initialise default codecs
 add_default_image_codecs()
@@ -49,11 +49,22 @@ Example usage::
     car_texture = bin.add(car_image)
     boat_texture = bin.add(boat_image)
 
-The result of :py:meth:`TextureBin.add` is a :py:class:`TextureRegion`
-containing the image. Once added, an image cannot be removed from a bin (or an 
-atlas); nor can a list of images be obtained from a given bin or atlas -- it is 
-the application's responsibility to keep track of the regions returned by the
-``add`` methods.
+The result of :py:meth:`TextureBin.add` is an :py:class:`AtlasRegion`
+containing the image. A list of images cannot be obtained from a given bin or
+atlas -- it is the application's responsibility to keep track of the regions
+returned by the ``add`` methods.  The area of an image no longer needed can be
+given back with :py:meth:`AtlasRegion.release`, or released automatically when
+the region is garbage collected by creating the bin (or atlas) with
+``auto_release=True``; :py:class:`MaxRectsAllocator` reuses released areas
+immediately.
+
+The packing strategy of an atlas is chosen with its allocator class:
+:py:class:`Allocator` (the default) places images in horizontal strips,
+:py:class:`SkylineAllocator` and :py:class:`MaxRectsAllocator` pack images of
+mixed sizes more tightly::
+
+    bin = TextureBin(allocator_class=MaxRectsAllocator)
+    textures = bin.add_images([car_image, boat_image])
 
 .. versionadded:: 1.1
 """
@@ -63,6 +74,9 @@ from builtins import object
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
+import itertools
+import weakref
+
 import pyglet
 
 
@@ -117,6 +131,7 @@ class Allocator(object):
         self.height = height
         self.strips = [_Strip(0, height)]
         self.used_area = 0
+        self.dead_area = 0
 
     def alloc(self, width, height):
         """Get a free area in the allocator of the given size.
@@ -150,6 +165,32 @@ class Allocator(object):
         raise AllocatorException('No more space in %r for box %dx%d' % (
                 self, width, height))
 
+    def free(self, x, y, width, height):
+        """Free an area previously returned by `alloc`.
+
+        Strips cannot reuse freed areas: they are counted in `dead_area`
+        until every area has been freed, at which point the whole region
+        becomes available again.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `x` : int
+                X coordinate of the area, as returned by `alloc`.
+            `y` : int
+                Y coordinate of the area, as returned by `alloc`.
+            `width` : int
+                Width of the area.
+            `height` : int
+                Height of the area.
+
+        """
+        self.used_area -= width * height
+        self.dead_area += width * height
+        if not self.used_area:
+            self.strips = [_Strip(0, self.height)]
+            self.dead_area = 0
+
     def get_usage(self):
         """Get the fraction of area already allocated.
 
@@ -174,9 +215,398 @@ class Allocator(object):
         return 1.0 - self.used_area / float(possible_area)
 
 
+class SkylineAllocator(object):
+    """Rectangular area allocation using the skyline algorithm.
+
+    The allocator tracks the "skyline" formed by the top edges of the
+    allocated rectangles, and places each new rectangle where its top edge
+    will be lowest (bottom-left rule).  Space left under an overhanging
+    rectangle is never reused, but allocation is fast and packs well for
+    mixed sizes, regardless of allocation order.
+
+    .. versionadded:: 1.4
+    """
+    def __init__(self, width, height):
+        """Create a `SkylineAllocator` of the given size.
+
+        :Parameters:
+            `width` : int
+                Width of the allocation region.
+            `height` : int
+                Height of the allocation region.
+
+        """
+        assert width > 0 and height > 0
+        self.width = width
+        self.height = height
+        # List of [x, y, width] segments, ordered by x, covering the width
+        self.skyline = [[0, 0, width]]
+        self.used_area = 0
+        self.dead_area = 0
+
+    def _fit(self, index, width, height):
+        # Return the y at which a rectangle placed at the start of the
+        # segment at `index` would rest, or None if it does not fit.
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            _, segment_y, segment_width = self.skyline[index]
+            y = max(y, segment_y)
+            if y + height > self.height:
+                return None
+            remaining -= segment_width
+            index += 1
+        return y
+
+    def alloc(self, width, height):
+        """Get a free area in the allocator of the given size.
+
+        After calling `alloc`, the requested area will no longer be used.
+        If there is not enough room to fit the given area `AllocatorException`
+        is raised.
+
+        :Parameters:
+            `width` : int
+                Width of the area to allocate.
+            `height` : int
+                Height of the area to allocate.
+
+        :rtype: int, int
+        :return: The X and Y coordinates of the bottom-left corner of the
+            allocated region.
+        """
+        assert width > 0 and height > 0
+        best = None
+        for index, (x, _, segment_width) in enumerate(self.skyline):
+            y = self._fit(index, width, height)
+            if y is not None:
+                score = (y + height, segment_width)
+                if best is None or score < best[0]:
+                    best = score, index, x, y
+
+        if best is None:
+            raise AllocatorException('No more space in %r for box %dx%d' % (
+                    self, width, height))
+
+        _, index, x, y = best
+        skyline = self.skyline
+        skyline.insert(index, [x, y + height, width])
+
+        # Shrink or remove the segments now covered by the new one.
+        right = x + width
+        i = index + 1
+        while i < len(skyline) and skyline[i][0] < right:
+            segment = skyline[i]
+            segment_right = segment[0] + segment[2]
+            if segment_right <= right:
+                del skyline[i]
+            else:
+                segment[2] = segment_right - right
+                segment[0] = right
+                break
+
+        # Merge neighbouring segments of the same height.
+        i = max(index - 1, 0)
+        while i < min(index + 1, len(skyline) - 1):
+            if skyline[i][1] == skyline[i + 1][1]:
+                skyline[i][2] += skyline[i + 1][2]
+                del skyline[i + 1]
+                index -= 1
+            else:
+                i += 1
+
+        self.used_area += width * height
+        return x, y
+
+    def _split_segment(self, x):
+        # Ensure a skyline segment starts at `x`; return its index.
+        for index, segment in enumerate(self.skyline):
+            segment_x, segment_y, segment_width = segment
+            if segment_x == x:
+                return index
+            if segment_x < x < segment_x + segment_width:
+                segment[2] = x - segment_x
+                self.skyline.insert(
+                    index + 1, [x, segment_y, segment_x + segment_width - x])
+                return index + 1
+        return len(self.skyline)
+
+    def free(self, x, y, width, height):
+        """Free an area previously returned by `alloc`.
+
+        If the area lies directly below the skyline, the skyline is lowered
+        and the area can be reused; otherwise it is counted in `dead_area`
+        until every area has been freed.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `x` : int
+                X coordinate of the area, as returned by `alloc`.
+            `y` : int
+                Y coordinate of the area, as returned by `alloc`.
+            `width` : int
+                Width of the area.
+            `height` : int
+                Height of the area.
+
+        """
+        self.used_area -= width * height
+        if not self.used_area:
+            self.skyline = [[0, 0, self.width]]
+            self.dead_area = 0
+            return
+
+        right = x + width
+        top = y + height
+        if all(segment_y == top for segment_x, segment_y, segment_width
+               in self.skyline
+               if segment_x < right and segment_x + segment_width > x):
+            start = self._split_segment(x)
+            end = self._split_segment(right)
+            self.skyline[start:end] = [[x, y, width]]
+        else:
+            self.dead_area += width * height
+
+    def get_usage(self):
+        """Get the fraction of area already allocated.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        return self.used_area / float(self.width * self.height)
+
+    def get_fragmentation(self):
+        """Get the fraction of area that's unlikely to ever be used, based on
+        current allocation behaviour.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        # The unused area beneath the skyline can no longer be allocated.
+        possible_area = sum(y * width for _, y, width in self.skyline)
+        if not possible_area:
+            return 0.
+        return 1.0 - self.used_area / float(possible_area)
+
+
+class MaxRectsAllocator(object):
+    """Rectangular area allocation using the MaxRects algorithm.
+
+    The allocator keeps the list of maximal free rectangles (which may
+    overlap), and places each new rectangle in the free rectangle that leaves
+    the shortest leftover side (best short side fit).  It packs more tightly
+    than `Allocator` and `SkylineAllocator`, at a higher cost per
+    allocation.
+
+    .. versionadded:: 1.4
+    """
+    def __init__(self, width, height):
+        """Create a `MaxRectsAllocator` of the given size.
+
+        :Parameters:
+            `width` : int
+                Width of the allocation region.
+            `height` : int
+                Height of the allocation region.
+
+        """
+        assert width > 0 and height > 0
+        self.width = width
+        self.height = height
+        # List of (x, y, width, height) maximal free rectangles
+        self.free_rects = [(0, 0, width, height)]
+        self.used_area = 0
+        self.used_height = 0
+        self.dead_area = 0
+
+    def alloc(self, width, height):
+        """Get a free area in the allocator of the given size.
+
+        After calling `alloc`, the requested area will no longer be used.
+        If there is not enough room to fit the given area `AllocatorException`
+        is raised.
+
+        :Parameters:
+            `width` : int
+                Width of the area to allocate.
+            `height` : int
+                Height of the area to allocate.
+
+        :rtype: int, int
+        :return: The X and Y coordinates of the bottom-left corner of the
+            allocated region.
+        """
+        assert width > 0 and height > 0
+        best = None
+        for free_x, free_y, free_width, free_height in self.free_rects:
+            if free_width >= width and free_height >= height:
+                leftover_x = free_width - width
+                leftover_y = free_height - height
+                score = (min(leftover_x, leftover_y),
+                         max(leftover_x, leftover_y), free_y, free_x)
+                if best is None or score < best:
+                    best = score
+
+        if best is None:
+            raise AllocatorException('No more space in %r for box %dx%d' % (
+                    self, width, height))
+
+        x, y = best[3], best[2]
+        self._split_free_rects(x, y, x + width, y + height)
+        self.used_area += width * height
+        self.used_height = max(self.used_height, y + height)
+        return x, y
+
+    def _split_free_rects(self, x1, y1, x2, y2):
+        # Replace each free rectangle overlapping the allocated one by the
+        # (up to four) maximal rectangles around it.
+        kept = []
+        split = []
+        for rect in self.free_rects:
+            rx, ry, rw, rh = rect
+            rx2 = rx + rw
+            ry2 = ry + rh
+            if x1 >= rx2 or x2 <= rx or y1 >= ry2 or y2 <= ry:
+                kept.append(rect)
+                continue
+            if x1 > rx:
+                split.append((rx, ry, x1 - rx, rh))
+            if x2 < rx2:
+                split.append((x2, ry, rx2 - x2, rh))
+            if y1 > ry:
+                split.append((rx, ry, rw, y1 - ry))
+            if y2 < ry2:
+                split.append((rx, y2, rw, ry2 - y2))
+
+        # Remove the new rectangles contained in others.  The kept
+        # rectangles were already maximal, and cannot be contained in the
+        # new ones, which are parts of other maximal rectangles.  Larger
+        # rectangles go first, so that of two identical rectangles only the
+        # first is kept.
+        split.sort(key=lambda r: r[2] * r[3], reverse=True)
+        for rect in split:
+            rx, ry, rw, rh = rect
+            rx2 = rx + rw
+            ry2 = ry + rh
+            for ox, oy, ow, oh in itertools.chain(kept, split):
+                if (rx >= ox and ry >= oy and rx2 <= ox + ow and
+                        ry2 <= oy + oh and (ox, oy, ow, oh) != rect):
+                    break
+            else:
+                if rect not in kept:
+                    kept.append(rect)
+        self.free_rects = kept
+
+    def free(self, x, y, width, height):
+        """Free an area previously returned by `alloc`.
+
+        The area is returned to the free rectangles, merged with those it
+        lines up with, and can be reused immediately.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `x` : int
+                X coordinate of the area, as returned by `alloc`.
+            `y` : int
+                Y coordinate of the area, as returned by `alloc`.
+            `width` : int
+                Width of the area.
+            `height` : int
+                Height of the area.
+
+        """
+        self.used_area -= width * height
+        if not self.used_area:
+            self.free_rects = [(0, 0, self.width, self.height)]
+            self.used_height = 0
+            return
+
+        # Grow the freed rectangle by the free rectangles aligned with it.
+        x2 = x + width
+        y2 = y + height
+        merged = True
+        while merged:
+            merged = False
+            for rx, ry, rw, rh in self.free_rects:
+                rx2 = rx + rw
+                ry2 = ry + rh
+                if rx == x and rx2 == x2 and ry <= y2 and ry2 >= y:
+                    if ry < y or ry2 > y2:
+                        y, y2 = min(y, ry), max(y2, ry2)
+                        merged = True
+                elif ry == y and ry2 == y2 and rx <= x2 and rx2 >= x:
+                    if rx < x or rx2 > x2:
+                        x, x2 = min(x, rx), max(x2, rx2)
+                        merged = True
+
+        self.free_rects = [
+            (rx, ry, rw, rh) for rx, ry, rw, rh in self.free_rects
+            if not (rx >= x and ry >= y and rx + rw <= x2 and ry + rh <= y2)]
+        self.free_rects.append((x, y, x2 - x, y2 - y))
+
+    def get_usage(self):
+        """Get the fraction of area already allocated.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        return self.used_area / float(self.width * self.height)
+
+    def get_fragmentation(self):
+        """Get the fraction of area that's unlikely to ever be used, based on
+        current allocation behaviour.
+
+        This method is useful for debugging and profiling only.
+
+        :rtype: float
+        """
+        # The unused area below the highest allocation is counted.
+        if not self.used_height:
+            return 0.
+        possible_area = self.used_height * self.width
+        return 1.0 - self.used_area / float(possible_area)
+
+
+class AtlasRegion(pyglet.image.TextureRegion):
+    """A region of a `TextureAtlas` holding an image added to it.
+
+    Regions and transforms obtained from an `AtlasRegion` keep it alive, so
+    that its area is not released while they are in use.
+
+    .. versionadded:: 1.4
+    """
+    atlas = None
+    _allocation = None
+    _ref = None
+
+    def release(self):
+        """Release the area of the atlas used by this region, so that it can
+        be reused by other images.
+
+        The region must not be drawn after it is released.  Releasing a
+        region more than once has no effect.
+        """
+        if self.atlas is not None:
+            self.atlas.release(self)
+
+    def get_region(self, x, y, width, height):
+        region = super(AtlasRegion, self).get_region(x, y, width, height)
+        region._atlas_region = self
+        return region
+
+
 class TextureAtlas(object):
     """Collection of images within a texture."""
-    def __init__(self, width=2048, height=2048):
+    def __init__(self, width=2048, height=2048, allocator_class=Allocator,
+                 auto_release=False):
         """Create a texture atlas of the given size.
 
         :Parameters:
@@ -184,6 +614,18 @@ class TextureAtlas(object):
                 Width of the underlying texture.
             `height` : int
                 Height of the underlying texture.
+            `allocator_class` : class
+                Packing strategy: `Allocator`, `SkylineAllocator`,
+                `MaxRectsAllocator` or any class with the same interface.
+
+                .. versionadded:: 1.4
+            `auto_release` : bool
+                If True, the area of each region returned by `add` is
+                released when the region (and any region or transform
+                obtained from it) is garbage collected.  Otherwise areas are
+                only released by `AtlasRegion.release`.
+
+                .. versionadded:: 1.4
 
         """
         max_texture_size = pyglet.image.get_max_texture_size()
@@ -192,7 +634,10 @@ class TextureAtlas(object):
 
         self.texture = pyglet.image.Texture.create(
             width, height, pyglet.gl.GL_RGBA, rectangle=True)
-        self.allocator = Allocator(width, height)
+        self.texture.region_class = AtlasRegion
+        self.allocator = allocator_class(width, height)
+        self.auto_release = auto_release
+        self._refs = set()
 
     def add(self, img):
         """Add an image to the atlas.
@@ -208,12 +653,60 @@ class TextureAtlas(object):
             `img` : `~pyglet.image.AbstractImage`
                 The image to add.
 
-        :rtype: :py:class:`~pyglet.image.TextureRegion`
+        :rtype: :py:class:`~pyglet.image.atlas.AtlasRegion`
         :return: The region of the atlas containing the newly added image.
         """
         x, y = self.allocator.alloc(img.width, img.height)
         self.texture.blit_into(img, x, y, 0)
-        return self.texture.get_region(x, y, img.width, img.height)
+        region = self.texture.get_region(x, y, img.width, img.height)
+        region.atlas = self
+        region._allocation = allocation = (x, y, img.width, img.height)
+        if self.auto_release:
+            def on_collect(ref):
+                if ref in self._refs:
+                    self._refs.remove(ref)
+                    self.allocator.free(*allocation)
+            region._ref = weakref.ref(region, on_collect)
+            self._refs.add(region._ref)
+        return region
+
+    def release(self, region):
+        """Release the area of the atlas used by a region returned by `add`.
+
+        See `AtlasRegion.release`.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `region` : `AtlasRegion`
+                The region to release.
+
+        """
+        if region.atlas is not self or region._allocation is None:
+            return
+        self._refs.discard(region._ref)
+        self.allocator.free(*region._allocation)
+        region._allocation = None
+        region.atlas = None
+
+    def get_live_area(self):
+        """Get the area, in pixels, used by regions not yet released.
+
+        .. versionadded:: 1.4
+
+        :rtype: int
+        """
+        return self.allocator.used_area
+
+    def get_dead_area(self):
+        """Get the area, in pixels, of released regions that the allocator
+        cannot reuse yet.
+
+        .. versionadded:: 1.4
+
+        :rtype: int
+        """
+        return self.allocator.dead_area
 
 
 class TextureBin(object):
@@ -222,7 +715,8 @@ class TextureBin(object):
     :py:class:`~pyglet.image.atlas.TextureBin` maintains a collection of texture atlases, and creates new
     ones as necessary to accommodate images added to the bin.
     """
-    def __init__(self, texture_width=2048, texture_height=2048):
+    def __init__(self, texture_width=2048, texture_height=2048,
+                 allocator_class=Allocator, auto_release=False):
         """Create a texture bin for holding atlases of the given size.
 
         :Parameters:
@@ -230,11 +724,23 @@ class TextureBin(object):
                 Width of texture atlases to create.
             `texture_height` : int
                 Height of texture atlases to create.
+            `allocator_class` : class
+                Packing strategy used by the atlases; see `TextureAtlas`.
+
+                .. versionadded:: 1.4
+            `auto_release` : bool
+                If True, regions are released when garbage collected; see
+                `TextureAtlas`.  Full atlases are then kept in the bin, so
+                that released areas can be reused.
+
+                .. versionadded:: 1.4
 
         """
         max_texture_size = pyglet.image.get_max_texture_size()
         self.texture_width = min(texture_width, max_texture_size)
         self.texture_height = min(texture_height, max_texture_size)
+        self.allocator_class = allocator_class
+        self.auto_release = auto_release
         self.atlases = []
 
     def add(self, img):
@@ -250,7 +756,7 @@ class TextureBin(object):
             `img` : `~pyglet.image.AbstractImage`
                 The image to add.
 
-        :rtype: :py:class:`~pyglet.image.TextureRegion`
+        :rtype: :py:class:`~pyglet.image.atlas.AtlasRegion`
         :return: The region of an atlas containing the newly added image.
         """
         for atlas in list(self.atlases):
@@ -260,9 +766,37 @@ class TextureBin(object):
                 # Remove atlases that are no longer useful (this is so their
                 # textures can later be freed if the images inside them get
                 # collected).
-                if img.width < 64 and img.height < 64:
+                if (not self.auto_release and
+                        img.width < 64 and img.height < 64):
                     self.atlases.remove(atlas)
 
-        atlas = TextureAtlas(self.texture_width, self.texture_height)
+        atlas = TextureAtlas(self.texture_width, self.texture_height,
+                             self.allocator_class, self.auto_release)
         self.atlases.append(atlas)
         return atlas.add(img)
+
+    def add_images(self, images):
+        """Add a known set of images into this texture bin.
+
+        The images are added in order of decreasing height, then width, which
+        packs them more tightly than adding them in an arbitrary order.
+
+        `AllocatorException` is raised if an image exceeds the dimensions of
+        ``texture_width`` and ``texture_height``.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `images` : list of `~pyglet.image.AbstractImage`
+                The images to add.
+
+        :rtype: list of :py:class:`~pyglet.image.TextureRegion`
+        :return: The regions containing the images, in the order the images
+            were given.
+        """
+        order = sorted(range(len(images)), reverse=True,
+                       key=lambda i: (images[i].height, images[i].width))
+        regions = [None] * len(images)
+        for i in order:
+            regions[i] = self.add(images[i])
+        return regions
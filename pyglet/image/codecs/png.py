@@ -33,19 +33,362 @@
 # ----------------------------------------------------------------------------
 
 """Encoder and decoder for PNG files, using PyPNG (png.py).
+
+Straightlaced images are decoded a few scanlines at a time straight into the
+final image buffer; filters are undone with NumPy if it is installed, and
+with bulk operations on whole scanlines otherwise.  Interlaced images are
+decoded with PyPNG.
 """
 
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
 import array
+import binascii
 import itertools
+import struct
+import sys
+import zlib
 
 from pyglet.image import *
 from pyglet.image.codecs import *
 
 import pyglet.extlibs.png as pypng
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
+try:
+    import concurrent.futures
+    _have_futures = True
+except ImportError:
+    _have_futures = False
+
+# Thread used by PNGImageEncoder.encode_async, created when first needed.
+_executor = None
+
+
+# Number of decompressed scanlines buffered at a time.
+_SCANLINE_BATCH = 64
+
+
+def _bytes_to_int(data):
+    # Little-endian, so byte i is at bit 8 * i.
+    return int(binascii.hexlify(bytes(bytearray(reversed(data)))) or b'0', 16)
+
+
+def _int_to_bytes(value, length):
+    data = bytearray(binascii.unhexlify('%0*x' % (length * 2, value)))
+    data.reverse()
+    return data
+
+
+class _SWAR(object):
+    """Add the bytes of whole scanlines at once, by treating them as lanes of
+    a single large integer.  Used to undo the filters when NumPy is not
+    available.
+    """
+    def __init__(self, length):
+        self.length = length
+        self.low = _bytes_to_int(b'\x7f' * length)
+        self.high = _bytes_to_int(b'\x80' * length)
+        self.mask = (1 << (8 * length)) - 1
+
+    def add(self, a, b):
+        """Add each byte of `a` and `b` modulo 256."""
+        return ((a & self.low) + (b & self.low)) ^ ((a ^ b) & self.high)
+
+    def subtract(self, a, b):
+        """Subtract each byte of `b` from `a` modulo 256."""
+        return ((a | self.high) - (b & self.low)) ^ ((a ^ b ^ self.high) & self.high)
+
+    def prefix_sum(self, a, stride):
+        """Add to each byte the byte `stride` bytes before it, cumulatively,
+        modulo 256."""
+        shift = 8 * stride
+        while shift < 8 * self.length:
+            a = self.add(a, (a << shift) & self.mask)
+            shift *= 2
+        return a
+
+
+def _undo_filter_average(fu, scanline, previous):
+    result = [(x + (b >> 1)) & 0xff for x, b in zip(scanline[:fu], previous)]
+    append = result.append
+    i = 0
+    for x, b in zip(scanline[fu:], previous[fu:]):
+        append((x + ((result[i] + b) >> 1)) & 0xff)
+        i += 1
+    return bytearray(result)
+
+
+def _paeth_predictor(a, b, c):
+    pa = abs(b - c)
+    pb = abs(a - c)
+    pc = abs(a + b - c - c)
+    if pa <= pb and pa <= pc:
+        return a
+    elif pb <= pc:
+        return b
+    return c
+
+
+def _undo_filter_paeth(fu, scanline, previous):
+    result = [(x + b) & 0xff for x, b in zip(scanline[:fu], previous)]
+    append = result.append
+    i = 0
+    for x, b, c in zip(scanline[fu:], previous[fu:], previous):
+        a = result[i]
+        i += 1
+        pa = abs(b - c)
+        pb = abs(a - c)
+        pc = abs(a + b - c - c)
+        if pa <= pb and pa <= pc:
+            append((x + a) & 0xff)
+        elif pb <= pc:
+            append((x + b) & 0xff)
+        else:
+            append((x + c) & 0xff)
+    return bytearray(result)
+
+
+class _PNGRowDecoder(object):
+    """Decode the scanlines of a straightlaced PNG in batches, producing the
+    same samples as PyPNG's ``Reader.asDirect``.
+    """
+
+    def __init__(self, reader):
+        reader.preamble()
+        self.reader = reader
+        self.width = reader.width
+        self.height = reader.height
+        self.bitdepth = reader.bitdepth
+        self.planes = reader.planes
+        self.row_bytes = reader.row_bytes
+        self.filter_unit = max(1, int(reader.psize))
+
+        # Describe the direct representation, as asDirect does.
+        bitdepth = reader.bitdepth
+        planes = reader.planes
+        self.palette = None
+        self.transparent = None
+        if reader.colormap:
+            self.palette = reader.palette()
+            planes = len(self.palette[0])
+            bitdepth = 8
+        elif reader.trns:
+            self.transparent = reader.transparent
+            planes += 1
+
+        self.shift = 0
+        if reader.sbit:
+            sbit = bytearray(reader.sbit)
+            target_bitdepth = max(sbit)
+            if target_bitdepth > bitdepth:
+                raise pypng.Error('sBIT chunk %r exceeds bitdepth %d' %
+                                  (tuple(sbit), reader.bitdepth))
+            if min(sbit) <= 0:
+                raise pypng.Error('sBIT chunk %r has a 0-entry' % tuple(sbit))
+            self.shift = bitdepth - target_bitdepth
+            bitdepth = target_bitdepth
+
+        alpha = reader.alpha or bool(reader.trns)
+        if reader.greyscale and not reader.colormap:
+            self.format = alpha and 'LA' or 'L'
+        else:
+            self.format = alpha and 'RGBA' or 'RGB'
+        assert len(self.format) == planes
+        self.typecode = 'BH'[bitdepth > 8]
+        self.pitch = len(self.format) * self.width
+        self.row_size = self.pitch * array.array(self.typecode).itemsize
+
+        if not _have_numpy:
+            self._swar = _SWAR(self.row_bytes)
+
+    def _iter_idat(self):
+        while True:
+            try:
+                type, data = self.reader.chunk()
+            except ValueError as e:
+                raise pypng.ChunkError(e.args[0])
+            if type == b'IEND':
+                break
+            if type == b'IDAT':
+                yield data
+
+    def _iter_scanline_batches(self):
+        """Yield buffers of whole filtered scanlines, each prefixed with its
+        filter type byte."""
+        size = self.row_bytes + 1
+        limit = size * _SCANLINE_BATCH
+        decompressor = zlib.decompressobj()
+        buf = bytearray()
+        for data in self._iter_idat():
+            while data:
+                buf += decompressor.decompress(data, limit)
+                data = decompressor.unconsumed_tail
+                if len(buf) >= size:
+                    end = len(buf) - len(buf) % size
+                    yield buf[:end]
+                    del buf[:end]
+        buf += decompressor.flush()
+        if len(buf) % size:
+            raise pypng.FormatError('Wrong size for decompressed IDAT chunk.')
+        if buf:
+            yield buf
+
+    def _undo_filters(self, batch, previous):
+        """Undo the filters of a batch of scanlines; returns the
+        reconstructed rows as one buffer and the last row."""
+        size = self.row_bytes + 1
+        fu = self.filter_unit
+        rows = []
+        for offset in range(0, len(batch), size):
+            filter_type = batch[offset]
+            scanline = batch[offset + 1:offset + size]
+            if filter_type == 0:
+                row = scanline
+            elif filter_type == 1:
+                if _have_numpy:
+                    line = numpy.frombuffer(bytes(scanline), numpy.uint8)
+                    row = line.reshape((-1, fu)).cumsum(
+                        axis=0, dtype=numpy.uint8).tobytes()
+                else:
+                    row = _int_to_bytes(self._swar.prefix_sum(
+                        _bytes_to_int(scanline), fu), self.row_bytes)
+            elif filter_type == 2:
+                if previous is None:
+                    row = scanline
+                elif _have_numpy:
+                    row = numpy.add(
+                        numpy.frombuffer(bytes(scanline), numpy.uint8),
+                        numpy.frombuffer(bytes(previous), numpy.uint8),
+                        dtype=numpy.uint8).tobytes()
+                else:
+                    row = _int_to_bytes(self._swar.add(
+                        _bytes_to_int(scanline), _bytes_to_int(previous)),
+                        self.row_bytes)
+            elif filter_type in (3, 4):
+                if previous is None:
+                    previous = bytearray(self.row_bytes)
+                if filter_type == 3:
+                    row = _undo_filter_average(fu, scanline, previous)
+                else:
+                    row = _undo_filter_paeth(fu, scanline, previous)
+            else:
+                raise pypng.FormatError('Invalid PNG Filter Type.')
+            rows.append(bytes(row))
+            previous = row
+        return b''.join(rows), previous
+
+    def _to_direct(self, data, count):
+        """Convert `count` reconstructed rows to the direct format."""
+        width = self.width
+        if _have_numpy:
+            raw = numpy.frombuffer(data, numpy.uint8).reshape(
+                (count, self.row_bytes))
+            if self.bitdepth == 16:
+                samples = raw.view('>u2')
+            elif self.bitdepth == 8:
+                samples = raw
+            else:
+                bitdepth = self.bitdepth
+                per_byte = 8 // bitdepth
+                samples = numpy.empty((count, self.row_bytes * per_byte),
+                                      numpy.uint8)
+                for i in range(per_byte):
+                    samples[:, i::per_byte] = \
+                        (raw >> (8 - bitdepth * (i + 1))) & ((1 << bitdepth) - 1)
+                samples = samples[:, :width]
+
+            if self.palette is not None:
+                palette = numpy.array(self.palette, numpy.uint8)
+                samples = palette[samples].reshape((count, -1))
+            elif self.transparent is not None:
+                pixels = samples.reshape((count, width, self.planes))
+                opaque = (pixels != numpy.array(self.transparent)).any(axis=2)
+                maxval = (1 << self.bitdepth) - 1
+                alpha = (opaque * maxval).astype(pixels.dtype)
+                samples = numpy.concatenate(
+                    (pixels, alpha[:, :, numpy.newaxis]), axis=2)
+            if self.shift:
+                samples = samples >> self.shift
+            dtype = self.typecode == 'H' and numpy.uint16 or numpy.uint8
+            return samples.astype(dtype).tobytes()
+
+        if (self.bitdepth == 8 and self.palette is None and
+                self.transparent is None and not self.shift):
+            return bytes(data)
+
+        result = array.array(self.typecode)
+        for offset in range(0, len(data), self.row_bytes):
+            row = data[offset:offset + self.row_bytes]
+            if self.bitdepth == 16:
+                samples = array.array('H', row)
+                if sys.byteorder == 'little':
+                    samples.byteswap()
+            elif self.bitdepth == 8:
+                samples = bytearray(row)
+            else:
+                bitdepth = self.bitdepth
+                mask = (1 << bitdepth) - 1
+                samples = [(byte >> shift) & mask
+                           for byte in bytearray(row)
+                           for shift in range(8 - bitdepth, -1, -bitdepth)]
+                samples = samples[:width]
+
+            if self.palette is not None:
+                palette = self.palette
+                samples = [value for index in samples for value in palette[index]]
+            elif self.transparent is not None:
+                planes = self.planes
+                transparent = list(self.transparent)
+                maxval = (1 << self.bitdepth) - 1
+                pixels = [list(samples[i:i + planes])
+                          for i in range(0, len(samples), planes)]
+                samples = [value for pixel in pixels
+                           for value in pixel + [(pixel != transparent) * maxval]]
+            if self.shift:
+                samples = [value >> self.shift for value in samples]
+            result.extend(samples)
+        return result.tostring() if sys.version_info < (3,) else result.tobytes()
+
+    def iter_strips(self, rows):
+        """Yield ``(top, count, data)`` for consecutive strips of at most
+        `rows` scanlines, in the direct format; `top` is the index of the
+        first row of the strip, counting from the top of the image.
+        """
+        top = 0
+        pending = bytearray()
+        previous = None
+        for batch in self._iter_scanline_batches():
+            data, previous = self._undo_filters(batch, previous)
+            pending += data
+            while len(pending) >= rows * self.row_bytes and top < self.height:
+                count = min(rows, self.height - top)
+                size = count * self.row_bytes
+                yield top, count, self._to_direct(bytes(pending[:size]), count)
+                del pending[:size]
+                top += count
+        if top < self.height:
+            count = len(pending) // self.row_bytes
+            if top + count < self.height:
+                raise pypng.FormatError('Image data is missing rows.')
+            count = self.height - top
+            yield top, count, self._to_direct(
+                bytes(pending[:count * self.row_bytes]), count)
+
+    def decode(self):
+        """Decode the whole image into a single buffer of rows from top to
+        bottom."""
+        out = bytearray(self.row_size * self.height)
+        for top, count, data in self.iter_strips(_SCANLINE_BATCH):
+            out[top * self.row_size:(top + count) * self.row_size] = data
+        return bytes(out)
+
 
 class PNGImageDecoder(ImageDecoder):
     def get_file_extensions(self):
@@ -54,11 +397,21 @@ class PNGImageDecoder(ImageDecoder):
     def decode(self, file, filename):
         try:
             reader = pypng.Reader(file=file)
-            width, height, pixels, metadata = reader.asDirect()
+            reader.preamble()
+            if reader.interlace:
+                return self._decode_interlaced(reader)
+
+            decoder = _PNGRowDecoder(reader)
+            data = decoder.decode()
         except Exception as e:
             raise ImageDecodeException(
                 'PyPNG cannot read %r: %s' % (filename or file, e))
 
+        return ImageData(decoder.width, decoder.height, decoder.format, data,
+                         -decoder.pitch)
+
+    def _decode_interlaced(self, reader):
+        width, height, pixels, metadata = reader.asDirect()
         if metadata['greyscale']:
             if metadata['alpha']:
                 fmt = 'LA'
@@ -72,39 +425,338 @@ class PNGImageDecoder(ImageDecoder):
         pitch = len(fmt) * width
 
         pixels = array.array('BH'[metadata['bitdepth']>8], itertools.chain(*pixels))
-        return ImageData(width, height, fmt, pixels.tostring(), -pitch)
+        if sys.version_info < (3,):
+            data = pixels.tostring()
+        else:
+            data = pixels.tobytes()
+        return ImageData(width, height, fmt, data, -pitch)
+
+    def decode_strips(self, file, filename, rows=256):
+        """Decode a PNG image a strip of rows at a time.
+
+        This keeps memory use bounded when decoding very large images, for
+        example to upload them into a texture piece by piece::
+
+            for y, strip in decoder.decode_strips(file, filename):
+                texture.blit_into(strip, 0, y, 0)
+
+        Interlaced images cannot be decoded progressively and are returned
+        as a single strip.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `file` : file-like object
+                The file to read the image from.
+            `filename` : str
+                Name of the file, used in error messages.
+            `rows` : int
+                Maximum number of rows in each strip.
+
+        :rtype: iterator of (int, `ImageData`)
+        :return: Pairs of the y coordinate of the bottom row of each strip
+                 within the full image, and the strip itself.  Strips are
+                 produced from the top of the image down.
+        """
+        try:
+            reader = pypng.Reader(file=file)
+            reader.preamble()
+            if reader.interlace:
+                image = self._decode_interlaced(reader)
+            else:
+                image = None
+                decoder = _PNGRowDecoder(reader)
+                strips = decoder.iter_strips(rows)
+        except Exception as e:
+            raise ImageDecodeException(
+                'PyPNG cannot read %r: %s' % (filename or file, e))
+
+        if image is not None:
+            yield 0, image
+            return
+
+        while True:
+            try:
+                top, count, data = next(strips)
+            except StopIteration:
+                return
+            except Exception as e:
+                raise ImageDecodeException(
+                    'PyPNG cannot read %r: %s' % (filename or file, e))
+            yield (decoder.height - top - count,
+                   ImageData(decoder.width, count, decoder.format, data,
+                             -decoder.pitch))
+
+# PNG filter types, in the order of their type byte.
+_FILTERS = ('none', 'sub', 'up', 'average', 'paeth')
+
+# Colour type of each format written by PNGImageEncoder.
+_COLOR_TYPES = {'L': 0, 'RGB': 2, 'LA': 4, 'RGBA': 6}
+
+# Maximum size of the data of each IDAT chunk written.
+_IDAT_SIZE = 2 ** 20
+
+# Magnitude of each byte taken as a signed value, for the filter heuristic.
+_MAGNITUDE = bytes(bytearray(min(i, 256 - i) for i in range(256)))
+
+
+def _write_chunk(file, chunk_type, data):
+    file.write(struct.pack('!I', len(data)))
+    file.write(chunk_type)
+    file.write(data)
+    checksum = zlib.crc32(data, zlib.crc32(chunk_type)) & 0xffffffff
+    file.write(struct.pack('!I', checksum))
+
+
+def _filter_rows(rows, previous, bpp, filter_type):
+    """Filter a 2D NumPy array of scanlines.  Returns the filtered rows with
+    their filter type bytes."""
+    count, row_bytes = rows.shape
+    up = numpy.empty_like(rows)
+    up[0] = previous
+    up[1:] = rows[:-1]
+    left = numpy.zeros_like(rows)
+    left[:, bpp:] = rows[:, :-bpp]
+
+    candidates = []
+    if filter_type in (None, 0):
+        candidates.append((0, rows))
+    if filter_type in (None, 1):
+        candidates.append((1, rows - left))
+    if filter_type in (None, 2):
+        candidates.append((2, rows - up))
+    if filter_type in (None, 3, 4):
+        left16 = left.astype(numpy.int16)
+        up16 = up.astype(numpy.int16)
+        if filter_type in (None, 3):
+            average = ((left16 + up16) >> 1).astype(numpy.uint8)
+            candidates.append((3, rows - average))
+        if filter_type in (None, 4):
+            upleft16 = numpy.zeros_like(up16)
+            upleft16[:, bpp:] = up16[:, :-bpp]
+            pa = numpy.abs(up16 - upleft16)
+            pb = numpy.abs(left16 - upleft16)
+            pc = numpy.abs(left16 + up16 - upleft16 - upleft16)
+            paeth = numpy.where((pa <= pb) & (pa <= pc), left16,
+                                numpy.where(pb <= pc, up16, upleft16))
+            candidates.append((4, rows - paeth.astype(numpy.uint8)))
+
+    out = numpy.empty((count, row_bytes + 1), numpy.uint8)
+    if len(candidates) == 1:
+        out[:, 0], out[:, 1:] = candidates[0]
+        return out
+
+    # Adaptive filtering: for each row, use the filter giving the smallest
+    # sum of magnitudes when the filtered bytes are taken as signed.
+    costs = numpy.array([numpy.abs(filtered.view(numpy.int8).astype(
+        numpy.int16)).sum(axis=1) for _, filtered in candidates])
+    best = costs.argmin(axis=0)
+    out[:, 0] = best
+    for index, (filter_type, filtered) in enumerate(candidates):
+        chosen = best == index
+        out[chosen, 1:] = filtered[chosen]
+    return out
+
 
 class PNGImageEncoder(ImageEncoder):
+    """Encoder writing 8-bit PNG images.
+
+    The compression level, zlib strategy and scanline filter can be chosen
+    to trade file size for speed; for example, a screenshot can be saved
+    quickly with::
+
+        encoder = PNGImageEncoder(compression_level=1)
+        image.save('screenshot.png', encoder=encoder)
+
+    Encoding can also be done on a background thread with `encode_async`.
+
+    .. versionadded:: 1.4
+        The `compression_level`, `strategy` and `filter` parameters.
+    """
+
+    def __init__(self, compression_level=zlib.Z_DEFAULT_COMPRESSION,
+                 strategy=zlib.Z_DEFAULT_STRATEGY, filter='adaptive'):
+        """Create a PNG encoder.
+
+        :Parameters:
+            `compression_level` : int
+                zlib compression level, from 0 (no compression) to 9
+                (smallest files); the default is the zlib default, 6.
+            `strategy` : int
+                zlib compression strategy, such as ``zlib.Z_RLE`` or
+                ``zlib.Z_FILTERED``.
+            `filter` : str
+                Filter applied to each scanline before compression: one of
+                ``'none'``, ``'sub'``, ``'up'``, ``'average'`` or
+                ``'paeth'``, or ``'adaptive'`` to choose the best filter for
+                each scanline.  Without NumPy, adaptive filtering only
+                considers the none, sub and up filters.
+
+        """
+        if filter != 'adaptive' and filter not in _FILTERS:
+            raise ImageEncodeException('Unknown PNG filter %r' % filter)
+        self.compression_level = compression_level
+        self.strategy = strategy
+        self.filter = filter
+
     def get_file_extensions(self):
         return ['.png']
 
-    def encode(self, image, file, filename):
+    def _get_data(self, image):
         image = image.get_image_data()
 
         has_alpha = 'A' in image.format
         greyscale = len(image.format) < 3
         if has_alpha:
             if greyscale:
-                image.format = 'LA'
+                fmt = 'LA'
             else:
-                image.format = 'RGBA'
+                fmt = 'RGBA'
         else:
             if greyscale:
-                image.format = 'L'
+                fmt = 'L'
             else:
-                image.format = 'RGB'
+                fmt = 'RGB'
+
+        pitch = image.width * len(fmt)
+        return image.width, image.height, fmt, image.get_data(fmt, -pitch)
+
+    def _iter_filtered(self, width, height, fmt, data):
+        """Yield the filtered scanlines, with their filter type bytes, in
+        batches."""
+        bpp = len(fmt)
+        row_bytes = width * bpp
+        if self.filter == 'adaptive':
+            filter_type = None
+        else:
+            filter_type = _FILTERS.index(self.filter)
+
+        if _have_numpy:
+            rows = numpy.frombuffer(data, numpy.uint8).reshape(
+                (height, row_bytes))
+            previous = numpy.zeros(row_bytes, numpy.uint8)
+            for start in range(0, height, _SCANLINE_BATCH):
+                batch = rows[start:start + _SCANLINE_BATCH]
+                yield _filter_rows(batch, previous, bpp, filter_type).tobytes()
+                previous = batch[-1]
+            return
+
+        if filter_type is None:
+            filter_types = (0, 1, 2)
+        else:
+            filter_types = (filter_type,)
+        swar = _SWAR(row_bytes)
+        previous = bytes(bytearray(row_bytes))
+        previous_value = 0
+        for start in range(0, len(data), row_bytes * _SCANLINE_BATCH):
+            out = bytearray()
+            end = min(len(data), start + row_bytes * _SCANLINE_BATCH)
+            for offset in range(start, end, row_bytes):
+                row = data[offset:offset + row_bytes]
+                value = _bytes_to_int(row)
+                best = None
+                for candidate in filter_types:
+                    if candidate == 0:
+                        filtered = row
+                    elif candidate == 1:
+                        filtered = _int_to_bytes(swar.subtract(
+                            value, (value << 8 * bpp) & swar.mask), row_bytes)
+                    elif candidate == 2:
+                        filtered = _int_to_bytes(swar.subtract(
+                            value, previous_value), row_bytes)
+                    elif candidate == 3:
+                        filtered = bytearray(
+                            (x - ((a + b) >> 1)) & 0xff for x, a, b in
+                            zip(row, bytearray(bpp) + row[:-bpp], previous))
+                    else:
+                        filtered = bytearray(
+                            (x - _paeth_predictor(a, b, c)) & 0xff
+                            for x, a, b, c in
+                            zip(row, bytearray(bpp) + row[:-bpp], previous,
+                                bytearray(bpp) + previous[:-bpp]))
+                    if len(filter_types) == 1:
+                        best = candidate, filtered
+                        break
+                    cost = sum(bytearray(bytes(filtered).translate(_MAGNITUDE)))
+                    if best is None or cost < best[0]:
+                        best = cost, candidate, filtered
+                if len(best) == 3:
+                    best = best[1:]
+                out.append(best[0])
+                out += best[1]
+                previous = bytearray(row)
+                previous_value = value
+            yield bytes(out)
+
+    def _write(self, file, width, height, fmt, data):
+        file.write(pypng._signature)
+        _write_chunk(file, b'IHDR', struct.pack(
+            '!2I5B', width, height, 8, _COLOR_TYPES[fmt], 0, 0, 0))
+
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED,
+                                      zlib.MAX_WBITS, 8, self.strategy)
+        pending = []
+        pending_size = 0
+        for filtered in self._iter_filtered(width, height, fmt, data):
+            compressed = compressor.compress(filtered)
+            if compressed:
+                pending.append(compressed)
+                pending_size += len(compressed)
+            if pending_size >= _IDAT_SIZE:
+                _write_chunk(file, b'IDAT', b''.join(pending))
+                pending = []
+                pending_size = 0
+        pending.append(compressor.flush())
+        _write_chunk(file, b'IDAT', b''.join(pending))
+        _write_chunk(file, b'IEND', b'')
+
+    def encode(self, image, file, filename):
+        width, height, fmt, data = self._get_data(image)
+        self._write(file, width, height, fmt, data)
+
+    def encode_async(self, image, file=None, filename=None):
+        """Encode an image on a background thread.
+
+        The image data is retrieved immediately, so the image may be
+        modified or deleted as soon as this method returns; only the
+        filtering, compression and writing happen in the background.  If
+        `file` is not given, `filename` is opened for writing on the
+        background thread and closed when done.
 
-        image.pitch = -(image.width * len(image.format))
+        Requires ``concurrent.futures``.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `image` : `AbstractImage`
+                The image to encode.
+            `file` : file-like object or None
+                File to write the image to.
+            `filename` : str
+                Name of the file to write, if `file` is not given.
+
+        :rtype: ``concurrent.futures.Future``
+        :return: A future whose result is None once the image is written,
+                 or which raises the exception that prevented encoding.
+        """
+        if not _have_futures:
+            raise ImageEncodeException(
+                'Background encoding requires concurrent.futures')
+
+        width, height, fmt, data = self._get_data(image)
+
+        def write():
+            if file is None:
+                with open(filename, 'wb') as f:
+                    self._write(f, width, height, fmt, data)
+            else:
+                self._write(file, width, height, fmt, data)
 
-        writer = pypng.Writer(
-            image.width, image.height,
-            bytes_per_sample=1,
-            greyscale=greyscale,
-            alpha=has_alpha)
+        global _executor
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        return _executor.submit(write)
 
-        data = array.array('B')
-        data.fromstring(image.get_data())
-        writer.write_array(file, data)
 
 def get_decoders():
     return [PNGImageDecoder()]
@@ -47,6 +47,12 @@ from pyglet.gl import *
 from pyglet.gl import gl_info
 from pyglet.image import AbstractImage, Texture
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
 split_8byte = re.compile('.' * 8, flags=re.DOTALL)
 split_16byte = re.compile('.' * 16, flags=re.DOTALL)
 
@@ -60,7 +66,15 @@ class PackedImageData(AbstractImage):
         self.data = data
 
     def unpack(self):
-        if self.packed_format == GL_UNSIGNED_SHORT_5_6_5:
+        if self.packed_format == GL_UNSIGNED_SHORT_5_6_5 and _have_numpy:
+            c = numpy.frombuffer(self.data, numpy.uint16)
+            rgb = numpy.empty((len(c), 3), numpy.uint8)
+            rgb[:, 0] = (c & 0xf800) >> 8
+            rgb[:, 1] = (c & 0x7e0) >> 3
+            rgb[:, 2] = (c & 0x1f) << 3
+            self.data = (ctypes.c_ubyte * rgb.size).from_buffer_copy(rgb)
+            self.packed_format = GL_UNSIGNED_BYTE
+        elif self.packed_format == GL_UNSIGNED_SHORT_5_6_5:
             # Unpack to GL_RGB.  Assume self.data is already 16-bit
             i = 0
             out = (ctypes.c_ubyte * (self.width * self.height * 3))()
@@ -99,8 +113,149 @@ class PackedImageData(AbstractImage):
            a more detailed documentation of the method. '''
         return self._get_texture()
 
+# The decoders below use NumPy, when available, to decode all blocks of an
+# image at once: each block's colour (and alpha) palette is computed from its
+# endpoints, the 2-bit (or 3-bit) codes of all texels are extracted with
+# shifts, and the palettes are indexed by the codes.  The results are the
+# same as the per-texel loops that follow.
+
+def _get_blocks(data, width, height, block_size):
+    """Return the blocks of `data` as an array of shape
+    (rows, columns, block_size)."""
+    columns = (width + 3) // 4
+    rows = (height + 3) // 4
+    blocks = numpy.frombuffer(data, numpy.uint8, count=rows * columns * block_size)
+    return blocks.reshape((rows, columns, block_size))
+
+
+def _get_codes(values, bits):
+    """Split each integer of `values` into its 16 `bits`-bit codes, least
+    significant first."""
+    shifts = numpy.arange(16, dtype=values.dtype) * bits
+    return ((values[..., None] >> shifts) & ((1 << bits) - 1)).astype(numpy.intp)
+
+
+def _lookup(palette, codes):
+    """Index each block's palette, of shape (rows, columns, entries), by the
+    codes of its texels, of shape (rows, columns, 16)."""
+    rows, columns, entries = palette.shape
+    base = numpy.arange(0, rows * columns * entries, entries)
+    return palette.ravel().take(codes + base.reshape((rows, columns, 1)))
+
+
+def _decode_colors(blocks):
+    """Decode the colour part (the last 8 bytes) of each block.
+
+    Returns the palette of each block, as an int32 array of shape (rows,
+    columns, 4, 3) holding the 5-6-5 components in the order (low 5 bits,
+    middle 6 bits, high 5 bits); the codes of each block's texels; and a
+    boolean array of shape (rows, columns, 1) which is false for blocks whose
+    fourth palette entry is transparent black.
+    """
+    color = blocks[..., -8:].astype(numpy.int32)
+    color0 = color[..., 0] | color[..., 1] << 8
+    color1 = color[..., 2] | color[..., 3] << 8
+    bits = (color[..., 4] | color[..., 5] << 8 |
+            color[..., 6] << 16 | color[..., 7] << 24).astype(numpy.uint32)
+
+    def components(c):
+        return numpy.stack((c & 0x1f, (c & 0x7e0) >> 5, (c & 0xf800) >> 11),
+                           axis=-1)
+
+    c0 = components(color0)
+    c1 = components(color1)
+    opaque = (color0 > color1)[..., None]
+    palette = numpy.stack((
+        c0,
+        c1,
+        numpy.where(opaque, (2 * c0 + c1) // 3, (c0 + c1) // 2),
+        numpy.where(opaque, (c0 + 2 * c1) // 3, 0)), axis=-2)
+    return palette, _get_codes(bits, 2), opaque
+
+
+def _pack_rgba(palette):
+    """Pack the 5-6-5 components of a palette into the RGB bytes of
+    little-endian uint32 RGBA values."""
+    return (palette[..., 2] << 3 | palette[..., 1] << 10 |
+            palette[..., 0] << 19).astype('<u4')
+
+
+def _to_image(texels, width, height):
+    """Rearrange per-block texels of shape (rows, columns, 16) into an image
+    of shape (height, width)."""
+    rows, columns, _ = texels.shape
+    image = texels.reshape((rows, columns, 4, 4)).transpose((0, 2, 1, 3))
+    image = image.reshape((rows * 4, columns * 4))[:height, :width]
+    return numpy.ascontiguousarray(image)
+
+
+def _to_rgba(texels, width, height):
+    rgba = _to_image(texels, width, height).view(numpy.uint8)
+    return (ctypes.c_ubyte * rgba.size).from_buffer_copy(rgba)
+
+
+def _decode_dxt1_rgb_numpy(data, width, height):
+    palette, codes, _ = _decode_colors(_get_blocks(data, width, height, 8))
+    palette = (palette[..., 0] | palette[..., 1] << 5 |
+               palette[..., 2] << 11).astype(numpy.uint16)
+    packed = _to_image(_lookup(palette, codes), width, height)
+    out = (ctypes.c_uint16 * packed.size).from_buffer_copy(packed)
+    return PackedImageData(width, height,
+        GL_RGB, GL_UNSIGNED_SHORT_5_6_5, out)
+
+
+def _decode_dxt1_rgba_numpy(data, width, height):
+    palette, codes, opaque = _decode_colors(_get_blocks(data, width, height, 8))
+    palette = _pack_rgba(palette)
+    palette[..., :3] |= 0xf0 << 24
+    palette[..., 3:] |= numpy.where(opaque, 0xf0 << 24, 0).astype('<u4')
+    out = _to_rgba(_lookup(palette, codes), width, height)
+    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+
+
+def _decode_dxt3_numpy(data, width, height):
+    blocks = _get_blocks(data, width, height, 16)
+    palette, codes, _ = _decode_colors(blocks)
+    alpha = blocks[..., :8].copy().view('<u8')[..., 0]
+    alpha = _get_codes(alpha, 4).astype('<u4') << 28
+    texels = _lookup(_pack_rgba(palette), codes) | alpha
+    out = _to_rgba(texels, width, height)
+    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+
+
+def _decode_dxt5_numpy(data, width, height):
+    blocks = _get_blocks(data, width, height, 16)
+    palette, codes, _ = _decode_colors(blocks)
+
+    alpha0 = blocks[..., 0].astype(numpy.int32)[..., None]
+    alpha1 = blocks[..., 1].astype(numpy.int32)[..., None]
+    abits = numpy.zeros(blocks.shape[:-1] + (8,), numpy.uint8)
+    abits[..., :6] = blocks[..., 2:8]
+    abits = abits.view('<u8')[..., 0]
+
+    # Interpolated alphas for codes 2 to 7
+    i = numpy.arange(1, 7)
+    j = numpy.arange(1, 5)
+    palette8 = ((7 - i) * alpha0 + i * alpha1) // 7
+    palette6 = numpy.concatenate((
+        ((5 - j) * alpha0 + j * alpha1) // 5,
+        numpy.zeros_like(alpha0),
+        numpy.full_like(alpha0, 255)), axis=-1)
+    apalette = numpy.concatenate((
+        alpha0, alpha1,
+        numpy.where(alpha0 > alpha1, palette8, palette6)), axis=-1)
+    alpha = _lookup(apalette.astype('<u4') << 24, _get_codes(abits, 3))
+
+    texels = _lookup(_pack_rgba(palette), codes) | alpha
+    out = _to_rgba(texels, width, height)
+    return PackedImageData(width, height, GL_RGBA, GL_UNSIGNED_BYTE, out)
+
+
 def decode_dxt1_rgb(data, width, height):
     # Decode to 16-bit RGB UNSIGNED_SHORT_5_6_5
+    if _have_numpy:
+        return _decode_dxt1_rgb_numpy(data, width, height)
+
     out = (ctypes.c_uint16 * (width * height))()
 
     # Read 8 bytes at a time
@@ -158,6 +313,9 @@ def decode_dxt1_rgb(data, width, height):
 
 def decode_dxt1_rgba(data, width, height):
     # Decode to GL_RGBA
+    if _have_numpy:
+        return _decode_dxt1_rgba_numpy(data, width, height)
+
     out = (ctypes.c_ubyte * (width * height * 4))()
     pitch = width << 2
 
@@ -221,6 +379,9 @@ def decode_dxt1_rgba(data, width, height):
 
 def decode_dxt3(data, width, height):
     # Decode to GL_RGBA
+    if _have_numpy:
+        return _decode_dxt3_numpy(data, width, height)
+
     out = (ctypes.c_ubyte * (width * height * 4))()
     pitch = width << 2
 
@@ -288,6 +449,9 @@ def decode_dxt3(data, width, height):
 
 def decode_dxt5(data, width, height):
     # Decode to GL_RGBA
+    if _have_numpy:
+        return _decode_dxt5_numpy(data, width, height)
+
     out = (ctypes.c_ubyte * (width * height * 4))()
     pitch = width << 2
 
@@ -61,8 +61,8 @@ order given in the path.  If a location is not valid (for example, if the
 directory does not exist), it is skipped.
 
 Locations in the path beginning with an ampersand (''@'' symbol) specify
-Python packages.  Other locations specify a ZIP archive or directory on the
-filesystem.  Locations that are not absolute are assumed to be relative to the
+Python packages.  Other locations specify a ZIP archive, a bundle (see
+:py:mod:`pyglet.bundle`) or directory on the filesystem.  Locations that are not absolute are assumed to be relative to the
 script home.  Some examples::
 
     # Search just the `res` directory, assumed to be located alongside the
@@ -91,12 +91,22 @@ from builtins import object, str
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
+import collections
+import ctypes
+import hashlib
+import io
+import mmap
 import os
+import struct
+import threading
+import time
 import weakref
 import sys
 import zipfile
+import zlib
 
 import pyglet
+import pyglet.bundle
 from pyglet.compat import BytesIO
 
 
@@ -263,6 +273,259 @@ class ZIPLocation(Location):
         return BytesIO(text)
 
 
+class _BufferFile(io.RawIOBase):
+    """Read-only file object over a buffer, such as a ``memoryview``."""
+
+    def __init__(self, buffer):
+        super(_BufferFile, self).__init__()
+        self._buffer = buffer
+        self._position = 0
+
+    def getbuffer(self):
+        """Get the whole contents of the file without copying them.
+
+        :rtype: ``memoryview``
+        """
+        return self._buffer
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        start = self._position
+        if size is None or size < 0:
+            end = len(self._buffer)
+        else:
+            end = min(start + size, len(self._buffer))
+        self._position = max(start, end)
+        return self._buffer[start:end].tobytes()
+
+    readall = read
+
+    def readinto(self, b):
+        data = self._buffer[self._position:self._position + len(b)]
+        b[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+
+class MappedZIPLocation(ZIPLocation):
+    """Location within a memory-mapped ZIP file.
+
+    The archive is mapped into memory once.  Stored (uncompressed) entries
+    are read directly from the mapping; the file objects returned by `open`
+    for them share its memory, and their ``getbuffer`` method (or
+    `get_buffer`) gives the contents as a ``memoryview`` without copying.
+    Compressed entries are decompressed when first opened and kept in a
+    cache of a limited size, least recently used entries being discarded
+    first.
+
+    The location can be read from several threads at once.
+
+    .. versionadded:: 1.4
+    """
+
+    _local_header = struct.Struct('<4s22xHH')
+
+    def __init__(self, zip, dir, cache_size=16 * 1024 * 1024):
+        """Create a location given an open ZIP file and a path within that
+        file.
+
+        :Parameters:
+            `zip` : ``zipfile.ZipFile``
+                An open ZIP file from the ``zipfile`` module.
+            `dir` : str
+                A path within that ZIP file.  Can be empty to specify files at
+                the top level of the ZIP file.
+            `cache_size` : int
+                Maximum total size, in bytes, of the decompressed entries
+                kept in memory.
+
+        """
+        super(MappedZIPLocation, self).__init__(zip, dir)
+        self.cache_size = cache_size
+        with open(zip.filename, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._lock = threading.Lock()
+        self._cache = collections.OrderedDict()
+        self._cached_size = 0
+
+    def _get_path(self, filename):
+        if self.dir:
+            path = self.dir + '/' + filename
+        else:
+            path = filename
+        return path.replace(os.sep, '/')
+
+    def get_buffer(self, filename):
+        """Get the contents of a file without copying them, if possible.
+
+        :Parameters:
+            `filename` : str
+                The filename to read.
+
+        :rtype: ``memoryview``
+        """
+        path = self._get_path(filename)
+        info = self.zip.getinfo(path)
+        if info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1:
+            start = self._get_data_offset(info)
+            return self._view[start:start + info.file_size]
+
+        with self._lock:
+            try:
+                data = self._cache.pop(path)
+            except KeyError:
+                data = None
+            else:
+                self._cache[path] = data
+        if data is None:
+            data = self._decompress(info)
+            self._add_to_cache(path, data)
+        return memoryview(data)
+
+    def _get_data_offset(self, info):
+        signature, name_length, extra_length = \
+            self._local_header.unpack_from(self._map, info.header_offset)
+        if signature != b'PK\x03\x04':
+            raise zipfile.BadZipfile('Bad local header for %s' % info.filename)
+        return (info.header_offset + self._local_header.size +
+                name_length + extra_length)
+
+    def _decompress(self, info):
+        if info.compress_type == zipfile.ZIP_DEFLATED and not info.flag_bits & 0x1:
+            start = self._get_data_offset(info)
+            data = zlib.decompressobj(-zlib.MAX_WBITS).decompress(
+                self._view[start:start + info.compress_size])
+            if zlib.crc32(data) & 0xffffffff != info.CRC:
+                raise zipfile.BadZipfile('Bad CRC-32 for %s' % info.filename)
+            return data
+
+        # Other compression methods and encryption are left to zipfile,
+        # which does not support concurrent reads on all Python versions.
+        with self._lock:
+            return self.zip.read(info.filename)
+
+    def _add_to_cache(self, path, data):
+        if len(data) > self.cache_size:
+            return
+        with self._lock:
+            if path in self._cache:
+                return
+            self._cache[path] = data
+            self._cached_size += len(data)
+            while self._cached_size > self.cache_size:
+                _, discarded = self._cache.popitem(last=False)
+                self._cached_size -= len(discarded)
+
+    def open(self, filename, mode='rb'):
+        return _BufferFile(self.get_buffer(filename))
+
+
+class BundleLocation(Location):
+    """Location within a bundle file built by :py:mod:`pyglet.bundle`.
+
+    The bundle is mapped into memory once; file contents are read from the
+    mapping (stored files without copying; see `get_buffer`), and images
+    stored decoded are used directly by `Loader.image` and `Loader.texture`.
+
+    .. versionadded:: 1.4
+    """
+
+    def __init__(self, filename, dir=''):
+        """Create a location given the filename of a bundle and a path
+        within that bundle.
+
+        :Parameters:
+            `filename` : str
+                Filename of the bundle.
+            `dir` : str
+                A path within the bundle.  Can be empty to specify files at
+                the top level of the bundle.
+
+        """
+        self.filename = filename
+        self.dir = dir
+        with open(filename, 'rb') as f:
+            # A copy-on-write mapping is writable, so that ctypes can wrap
+            # decoded images; the file itself is never modified.
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self._view = memoryview(self._map)
+        self.entries = pyglet.bundle.read_index(self._view)
+
+    def get_names(self):
+        """Get the names of the files in this location.
+
+        :rtype: list of str
+        """
+        if not self.dir:
+            return list(self.entries)
+        prefix = self.dir + '/'
+        return [name[len(prefix):] for name in self.entries
+                if name.startswith(prefix)]
+
+    def _get_entry(self, filename):
+        if self.dir:
+            filename = self.dir + '/' + filename
+        try:
+            return self.entries[filename.replace(os.sep, '/')]
+        except KeyError:
+            raise ResourceNotFoundException(filename)
+
+    def get_buffer(self, filename):
+        """Get the contents of a file, without copying them unless the file
+        is compressed.
+
+        :Parameters:
+            `filename` : str
+                The filename to read.
+
+        :rtype: ``memoryview``
+        """
+        entry = self._get_entry(filename)
+        data = self._view[entry.offset:entry.offset + entry.size]
+        if entry.compression == pyglet.bundle.COMPRESSION_ZLIB:
+            data = memoryview(zlib.decompress(data))
+        return data
+
+    def get_image(self, filename):
+        """Get the image stored decoded for a file.
+
+        :Parameters:
+            `filename` : str
+                The filename of the image.
+
+        :rtype: `~pyglet.image.ImageData`
+        :return: The image, using the bundle's memory, or None if the file
+            was not stored decoded.
+        """
+        entry = self._get_entry(filename)
+        if not entry.image_size:
+            return None
+        width, height, fmt, pitch, offset = \
+            pyglet.bundle.read_image_header(self._view, entry.image_offset)
+        data = (ctypes.c_ubyte * (pitch * height)).from_buffer(self._map, offset)
+        return pyglet.image.ImageData(width, height, fmt, data, pitch)
+
+    def open(self, filename, mode='rb'):
+        return _BufferFile(self.get_buffer(filename))
+
+
 class URLLocation(Location):
     """Location on the network.
 
@@ -286,6 +549,143 @@ class URLLocation(Location):
         return urllib.request.urlopen(url)
 
 
+class ImageCache(object):
+    """Persistent cache of decoded images on disk.
+
+    Each image is stored uncompressed in its own file in the cache
+    directory, named by a hash of the resource name and a signature of the
+    resource file (its path, modification time and size, or a hash of its
+    contents).  Modified resources therefore get new cache entries; stale
+    entries are never used, and can be removed by clearing the directory.
+
+    Cached images are memory-mapped rather than read, so their pixel data is
+    paged in from disk as it is uploaded to textures.
+
+    Use a cache by passing it to `Loader`, or by setting
+    :py:attr:`image_cache` for the default loader::
+
+        pyglet.resource.image_cache = pyglet.resource.ImageCache(
+            os.path.join(pyglet.resource.get_settings_path('MyGame'), 'cache'))
+
+    .. versionadded:: 1.4
+
+    :Ivariables:
+        `directory` : str
+            Directory holding the cached images.
+        `hits` : int
+            Number of images found in the cache.
+        `misses` : int
+            Number of images not found in the cache.
+
+    """
+    _magic = b'PYGC'
+    _version = 1
+    _header = struct.Struct('<4sHHII8sI')
+    _data_offset = 64
+
+    def __init__(self, directory):
+        """Create an image cache storing its files in `directory`, which is
+        created if it does not exist.
+
+        :Parameters:
+            `directory` : str
+                Directory to store cached images in.
+
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _get_path(self, name, signature):
+        key = repr((self._version, name, signature)).encode('utf-8')
+        return os.path.join(self.directory,
+                            hashlib.sha1(key).hexdigest() + '.img')
+
+    def get(self, name, signature):
+        """Get a cached image.
+
+        :Parameters:
+            `name` : str
+                Resource name of the image.
+            `signature` : str
+                Signature of the resource file, as used with `put`.
+
+        :rtype: `~pyglet.image.ImageData`
+        :return: The cached image, or None if it is not in the cache.
+        """
+        try:
+            image = self._read(self._get_path(name, signature))
+        except (EnvironmentError, ValueError, struct.error):
+            image = None
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            magic, version, _, width, height, fmt, pitch = \
+                self._header.unpack(f.read(self._header.size))
+            if magic != self._magic or version != self._version:
+                return None
+            size = pitch * height
+            if os.fstat(f.fileno()).st_size != self._data_offset + size:
+                return None
+            # A copy-on-write mapping is writable, so that ctypes can wrap
+            # it; the file itself is never modified.
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        data = (ctypes.c_ubyte * size).from_buffer(mapping, self._data_offset)
+        fmt = fmt.rstrip(b'\0').decode('ascii')
+        return pyglet.image.ImageData(width, height, fmt, data, pitch)
+
+    def put(self, name, signature, image):
+        """Store an image in the cache.
+
+        Images other than `~pyglet.image.ImageData` (for example, compressed
+        images) are not cached.
+
+        :Parameters:
+            `name` : str
+                Resource name of the image.
+            `signature` : str
+                Signature of the resource file; any value that changes when
+                the file changes.
+            `image` : `~pyglet.image.AbstractImage`
+                The decoded image.
+
+        """
+        if not isinstance(image, pyglet.image.ImageData):
+            return
+        # Rows are stored bottom to top, as OpenGL expects them.
+        fmt = image._current_format
+        pitch = abs(image._current_pitch)
+        data = image.get_data(fmt, pitch)
+        if len(fmt) > 8 or len(data) != pitch * image.height:
+            return
+
+        path = self._get_path(name, signature)
+        temp_path = '%s.%d.tmp' % (path, os.getpid())
+        header = self._header.pack(self._magic, self._version, 0,
+                                   image.width, image.height,
+                                   fmt.encode('ascii'), pitch)
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(header)
+                f.write(b'\0' * (self._data_offset - len(header)))
+                f.write(data)
+            getattr(os, 'replace', os.rename)(temp_path, path)
+        except EnvironmentError:
+            # The cache is only an optimisation; failing to write to it
+            # (for example, if the disk is full) is not an error.
+            try:
+                os.remove(temp_path)
+            except EnvironmentError:
+                pass
+
+
 class Loader(object):
     """Load program resource files from disk.
 
@@ -299,9 +699,17 @@ class Loader(object):
         `script_home` : str
             Base resource location, defaulting to the location of the
             application script.
+        `image_cache` : `ImageCache`
+            Cache of decoded images, or None.
+        `upload_budget` : float
+            Time, in seconds, spent each frame creating textures for images
+            loaded in the background by `image_async`, `texture_async` and
+            `preload`.  At least one texture is created each frame.
 
     """
-    def __init__(self, path=None, script_home=None):
+    upload_budget = 0.004
+
+    def __init__(self, path=None, script_home=None, image_cache=None):
         """Create a loader for the given path.
 
         If no path is specified it defaults to ``['.']``; that is, just the
@@ -315,6 +723,11 @@ class Loader(object):
             `script_home` : str
                 Base location of relative files.  Defaults to the result of
                 `get_script_home`.
+            `image_cache` : `ImageCache`
+                Cache of decoded images used by `image` and `texture`.  By
+                default images are decoded each time they are loaded.
+
+                .. versionadded:: 1.4
 
         """
         if path is None:
@@ -326,6 +739,13 @@ class Loader(object):
             script_home = get_script_home()
         self._script_home = script_home
         self._index = None
+        self.image_cache = image_cache
+
+        # Background loading: images decoded by the loader thread wait in
+        # _uploads to be finished on the main thread.
+        self._executor = None
+        self._uploads = collections.deque()
+        self._pending_uploads = 0
 
         # Map bin size to list of atlases
         self._texture_atlas_bins = {}
@@ -344,8 +764,32 @@ class Loader(object):
 
         You must call this method if `path` is changed or the filesystem
         layout changes.
+
+        Directories are not scanned up front: each directory is listed the
+        first time a resource in it is requested.  Reindexing only discards
+        the listings of directories whose modification time changed, and
+        the contents of ZIP files that changed, so it is cheap to call
+        again after files are added or removed.
         """
+        # Memo of names found so far, mapping normalised name to location
         self._index = {}
+        # List of (root, location, names) in path order; `names` is the set
+        # of indexed names for ZIP files, or None for directories.
+        self._locations = []
+
+        # Listings of directories, mapping path to (mtime, names); mtime is
+        # None for directories that do not exist.
+        listings = getattr(self, '_listings', {})
+        self._listings = {}
+        for path, (mtime, names) in listings.items():
+            if self._get_mtime(path) == mtime:
+                self._listings[path] = mtime, names
+
+        # Indexes of ZIP files and bundles, mapping path to (stat, ZipFile or
+        # None, {dir: (location, names)})
+        zip_indexes = getattr(self, '_zip_indexes', {})
+        self._zip_indexes = {}
+
         for path in self.path:
             if path.startswith('@'):
                 # Module
@@ -370,22 +814,7 @@ class Loader(object):
             if os.path.isdir(path):
                 # Filesystem directory
                 path = path.rstrip(os.path.sep)
-                location = FileLocation(path)
-                for dirpath, dirnames, filenames in os.walk(path):
-                    dirpath = dirpath[len(path) + 1:]
-                    # Force forward slashes for index
-                    if dirpath:
-                        parts = [part
-                                 for part
-                                 in dirpath.split(os.sep)
-                                 if part is not None]
-                        dirpath = '/'.join(parts)
-                    for filename in filenames:
-                        if dirpath:
-                            index_name = dirpath + '/' + filename
-                        else:
-                            index_name = filename
-                        self._index_file(index_name, location)
+                self._locations.append((path, FileLocation(path), None))
             else:
                 # Find path component that is the ZIP file.
                 dir = ''
@@ -400,23 +829,115 @@ class Loader(object):
                     continue
                 dir = dir.rstrip('/')
 
-                # path is a ZIP file, dir resides within ZIP
+                # path is a ZIP file or bundle, dir resides within it
                 if path and zipfile.is_zipfile(path):
-                    zip = zipfile.ZipFile(path, 'r')
-                    location = ZIPLocation(zip, dir)
-                    for zip_name in zip.namelist():
-                        # zip_name_dir, zip_name = os.path.split(zip_name)
-                        # assert '\\' not in name_dir
-                        # assert not name_dir.endswith('/')
-                        if zip_name.startswith(dir):
-                            if dir:
-                                zip_name = zip_name[len(dir) + 1:]
-                            self._index_file(zip_name, location)
-
-    def _index_file(self, name, location):
-        normed_name = os.path.normpath(name)
-        if normed_name not in self._index:
-            self._index[normed_name] = location
+                    self._add_zip_location(path, dir, zip_indexes)
+                elif path and pyglet.bundle.is_bundle(path):
+                    self._add_bundle_location(path, dir, zip_indexes)
+
+    def _add_zip_location(self, path, dir, zip_indexes):
+        stat = os.stat(path)
+        stat = stat.st_mtime, stat.st_size
+        if path in self._zip_indexes:
+            zip_index = self._zip_indexes[path]
+        elif path in zip_indexes and zip_indexes[path][0] == stat:
+            zip_index = self._zip_indexes[path] = zip_indexes[path]
+        else:
+            zip_index = self._zip_indexes[path] = \
+                (stat, zipfile.ZipFile(path, 'r'), {})
+        _, zip, dirs = zip_index
+
+        if dir not in dirs:
+            location = MappedZIPLocation(zip, dir)
+            names = set()
+            for zip_name in zip.namelist():
+                # zip_name_dir, zip_name = os.path.split(zip_name)
+                # assert '\\' not in name_dir
+                # assert not name_dir.endswith('/')
+                if zip_name.startswith(dir):
+                    if dir:
+                        zip_name = zip_name[len(dir) + 1:]
+                    names.add(os.path.normpath(zip_name))
+            dirs[dir] = location, names
+        location, names = dirs[dir]
+        self._locations.append((path, location, names))
+
+    def _add_bundle_location(self, path, dir, zip_indexes):
+        stat = os.stat(path)
+        stat = stat.st_mtime, stat.st_size
+        if path in self._zip_indexes:
+            bundle_index = self._zip_indexes[path]
+        elif path in zip_indexes and zip_indexes[path][0] == stat:
+            bundle_index = self._zip_indexes[path] = zip_indexes[path]
+        else:
+            bundle_index = self._zip_indexes[path] = (stat, None, {})
+        dirs = bundle_index[2]
+
+        if dir not in dirs:
+            location = BundleLocation(path, dir)
+            names = set(os.path.normpath(name) for name in location.get_names())
+            dirs[dir] = location, names
+        location, names = dirs[dir]
+        self._locations.append((path, location, names))
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _list_dir(self, root, dirname):
+        """Get the set of names in a directory relative to `root`, or an
+        empty set if it does not exist.  Listings are kept until `reindex`
+        finds the directory modified.
+        """
+        path = os.path.join(root, dirname)
+        try:
+            return self._listings[path][1]
+        except KeyError:
+            pass
+
+        # Check each directory component against its parent's listing, so
+        # that names are case-sensitive on every filesystem.
+        names = frozenset()
+        mtime = None
+        parent, base = os.path.split(dirname)
+        if not dirname or base in self._list_dir(root, parent):
+            mtime = self._get_mtime(path)
+            try:
+                names = frozenset(os.listdir(path))
+            except OSError:
+                mtime = None
+        self._listings[path] = mtime, names
+        return names
+
+    def _find(self, normed_name):
+        """Get the location of a resource given its normalised name, or
+        None if it is not on the path.
+        """
+        try:
+            return self._index[normed_name]
+        except KeyError:
+            pass
+
+        if (os.path.isabs(normed_name) or normed_name == os.pardir or
+                normed_name.startswith(os.pardir + os.sep)):
+            return None
+
+        dirname, filename = os.path.split(normed_name)
+        for root, location, names in self._locations:
+            if names is None:
+                if (filename in self._list_dir(root, dirname) and
+                        os.path.isfile(os.path.join(root, normed_name))):
+                    break
+            elif normed_name in names:
+                break
+        else:
+            return None
+
+        self._index[normed_name] = location
+        return location
 
     def file(self, name, mode='rb'):
         """Load a resource.
@@ -432,11 +953,10 @@ class Loader(object):
         """
         normed_name = os.path.normpath(name)
         self._require_index()
-        try:
-            location = self._index[normed_name]
-            return location.open(normed_name, mode)
-        except KeyError:
+        location = self._find(normed_name)
+        if location is None:
             raise ResourceNotFoundException(normed_name)
+        return location.open(normed_name, mode)
 
     def location(self, name):
         """Get the location of a resource.
@@ -453,10 +973,10 @@ class Loader(object):
         :rtype: `Location`
         """
         self._require_index()
-        try:
-            return self._index[name]
-        except KeyError:
+        location = self._find(name)
+        if location is None:
             raise ResourceNotFoundException(name)
+        return location
 
     def add_font(self, name):
         """Add a font resource to the application.
@@ -479,13 +999,65 @@ class Loader(object):
         file = self.file(name)
         font.add_file(file)
 
-    def _alloc_image(self, name, atlas=True):
+    def _get_signature(self, name):
+        """Get a value that changes when the named file changes, without
+        reading it if possible.
+        """
+        normed_name = os.path.normpath(name)
+        location = self._find(normed_name)
+        if isinstance(location, FileLocation):
+            path = os.path.abspath(os.path.join(location.path, normed_name))
+            stat = os.stat(path)
+            return repr((path, stat.st_mtime, stat.st_size))
+        elif isinstance(location, ZIPLocation):
+            if location.dir:
+                path = location.dir + '/' + normed_name
+            else:
+                path = normed_name
+            info = location.zip.getinfo(path.replace(os.sep, '/'))
+            return repr((os.path.abspath(location.zip.filename), path,
+                         info.CRC, info.file_size))
+
+        elif isinstance(location, BundleLocation):
+            stat = os.stat(location.filename)
+            return repr((os.path.abspath(location.filename), location.dir,
+                         stat.st_mtime, stat.st_size))
+
+        file = self.file(name)
+        try:
+            return hashlib.sha1(file.read()).hexdigest()
+        finally:
+            file.close()
+
+    def _load_image(self, name):
+        normed_name = os.path.normpath(name)
+        self._require_index()
+        location = self._find(normed_name)
+        if isinstance(location, BundleLocation):
+            img = location.get_image(normed_name)
+            if img is not None:
+                return img
+
+        if self.image_cache is not None:
+            signature = self._get_signature(name)
+            img = self.image_cache.get(name, signature)
+            if img is not None:
+                return img
+
         file = self.file(name)
         try:
             img = pyglet.image.load(name, file=file)
         finally:
             file.close()
 
+        if self.image_cache is not None:
+            self.image_cache.put(name, signature, img)
+        return img
+
+    def _alloc_image(self, name, atlas=True):
+        return self._upload_image(self._load_image(name), atlas)
+
+    def _upload_image(self, img, atlas):
         if not atlas:
             return img.get_texture(True)
 
@@ -594,6 +1166,169 @@ class Loader(object):
 
         return identity.get_transform(flip_x, flip_y, rotate)
 
+    def _load_async(self, name, finish):
+        """Decode the named image on the loader thread, then call
+        ``finish(img)`` on the main thread.  Returns a future for the result
+        of `finish`.
+        """
+        import concurrent.futures
+        if self._executor is None:
+            # A single thread: decoding is mostly bound by the interpreter,
+            # and the image cache and ZIP files are not shared between
+            # threads.
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+        future = concurrent.futures.Future()
+        decoding = self._executor.submit(self._load_image, name)
+        if not self._pending_uploads:
+            pyglet.clock.schedule(self._process_uploads)
+        self._pending_uploads += 1
+        decoding.add_done_callback(
+            lambda decoding: self._uploads.append((decoding, finish, future)))
+        return future
+
+    def _process_uploads(self, dt):
+        deadline = time.time() + self.upload_budget
+        while self._uploads:
+            decoding, finish, future = self._uploads.popleft()
+            self._pending_uploads -= 1
+            try:
+                result = finish(decoding.result())
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            if time.time() >= deadline:
+                break
+
+        if not self._pending_uploads:
+            pyglet.clock.unschedule(self._process_uploads)
+
+    def image_async(self, name, flip_x=False, flip_y=False, rotate=0,
+                    atlas=True):
+        """Load an image in the background.
+
+        The image file is read and decoded on a background thread.  The
+        texture is then created on the main thread by a function scheduled
+        on :py:mod:`pyglet.clock`, which spends at most `upload_budget`
+        seconds per frame on it; the event loop must therefore be running
+        for the image to load, and the main thread must not block waiting
+        for the result.
+
+        Requires ``concurrent.futures``.  The parameters are the same as for
+        `image`.
+
+        .. versionadded:: 1.4
+
+        :rtype: ``concurrent.futures.Future``
+        :return: A future whose result is the image returned by `image`.
+            Its callbacks are called on the main thread.
+        """
+        self._require_index()
+
+        def transform(identity):
+            if not rotate and not flip_x and not flip_y:
+                return identity
+            return identity.get_transform(flip_x, flip_y, rotate)
+
+        if name in self._cached_images:
+            import concurrent.futures
+            future = concurrent.futures.Future()
+            future.set_result(transform(self._cached_images[name]))
+            return future
+
+        def finish(img):
+            if name in self._cached_images:
+                identity = self._cached_images[name]
+            else:
+                identity = self._cached_images[name] = \
+                    self._upload_image(img, atlas)
+            return transform(identity)
+
+        return self._load_async(name, finish)
+
+    def texture_async(self, name):
+        """Load a texture in the background.
+
+        The image is decoded and uploaded as for `image_async`.
+
+        Requires ``concurrent.futures``.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `name` : str
+                Filename of the image resource to load.
+
+        :rtype: ``concurrent.futures.Future``
+        :return: A future whose result is the texture returned by `texture`.
+        """
+        self._require_index()
+
+        def finish(img):
+            if name in self._cached_textures:
+                return self._cached_textures[name]
+            texture = self._cached_textures[name] = img.get_texture()
+            return texture
+
+        if name in self._cached_textures:
+            import concurrent.futures
+            future = concurrent.futures.Future()
+            future.set_result(self._cached_textures[name])
+            return future
+
+        return self._load_async(name, finish)
+
+    def preload(self, names, callback=None):
+        """Load several images in the background.
+
+        Each image is loaded as with `image_async`; keep references to the
+        loaded images (or to the returned list) to keep them in the loader's
+        cache, so that later calls to `image` return them immediately.
+
+        Requires ``concurrent.futures``.
+
+        .. versionadded:: 1.4
+
+        :Parameters:
+            `names` : list of str
+                Filenames of the image resources to load.
+            `callback` : function(name, loaded, total)
+                Called on the main thread each time an image is loaded, with
+                its name, the number of images loaded so far and the total
+                number of images.
+
+        :rtype: ``concurrent.futures.Future``
+        :return: A future whose result is the list of loaded images, in the
+            order of `names`.  If an image fails to load, the future's
+            exception is that of the first failure, once all images are done.
+        """
+        import concurrent.futures
+        names = list(names)
+        result = concurrent.futures.Future()
+        futures = [self.image_async(name) for name in names]
+        state = {'loaded': 0}
+
+        def on_done(name):
+            def done(future):
+                state['loaded'] += 1
+                if callback is not None:
+                    callback(name, state['loaded'], len(names))
+                if state['loaded'] == len(names):
+                    for f in futures:
+                        if f.exception() is not None:
+                            result.set_exception(f.exception())
+                            break
+                    else:
+                        result.set_result([f.result() for f in futures])
+            return done
+
+        if not names:
+            result.set_result([])
+        for name, future in zip(names, futures):
+            future.add_done_callback(on_done(name))
+        return result
+
     def get_cached_image_names(self):
         """Get a list of image filenames that have been cached.
 
@@ -645,17 +1380,16 @@ class Loader(object):
         """
         self._require_index()
         from pyglet import media
-        try:
-            location = self._index[name]
-            if isinstance(location, FileLocation):
-                # Don't open the file if it's streamed from disk
-                path = os.path.join(location.path, name)
-                return media.load(path, streaming=streaming)
-            else:
-                file = location.open(name)
-                return media.load(name, file=file, streaming=streaming)
-        except KeyError:
+        location = self._find(name)
+        if location is None:
             raise ResourceNotFoundException(name)
+        if isinstance(location, FileLocation):
+            # Don't open the file if it's streamed from disk
+            path = os.path.join(location.path, name)
+            return media.load(path, streaming=streaming)
+        else:
+            file = location.open(name)
+            return media.load(name, file=file, streaming=streaming)
 
     def texture(self, name):
         """Load a texture.
@@ -674,8 +1408,7 @@ class Loader(object):
         if name in self._cached_textures:
             return self._cached_textures[name]
 
-        file = self.file(name)
-        texture = pyglet.image.load(name, file=file).get_texture()
+        texture = self._load_image(name).get_texture()
         self._cached_textures[name] = texture
         return texture
 
@@ -754,6 +1487,13 @@ class Loader(object):
 #: :type: list of str
 path = []
 
+#: Cache of decoded images used by the default loader, or None.
+#:
+#: :type: `ImageCache`
+#:
+#: .. versionadded:: 1.4
+image_cache = None
+
 
 class _DefaultLoader(Loader):
 
@@ -766,6 +1506,15 @@ class _DefaultLoader(Loader):
         global path
         path = value
 
+    @property
+    def image_cache(self):
+        return image_cache
+
+    @image_cache.setter
+    def image_cache(self, value):
+        global image_cache
+        image_cache = value
+
 
 _default_loader = _DefaultLoader()
 reindex = _default_loader.reindex
@@ -784,3 +1533,6 @@ get_cached_texture_names = _default_loader.get_cached_texture_names
 get_cached_image_names = _default_loader.get_cached_image_names
 get_cached_animation_names = _default_loader.get_cached_animation_names
 get_texture_bins = _default_loader.get_texture_bins
+image_async = _default_loader.image_async
+texture_async = _default_loader.texture_async
+preload = _default_loader.preload
@@ -96,12 +96,26 @@ however a sprite can belong to at most one batch.  See the documentation for
 :py:mod:`pyglet.graphics` for more details on batched rendering, and grouping of
 sprites within batches.
 
+Very large numbers of sprites sharing one image, such as particles, can be
+stored in a :py:class:`~pyglet.sprite.SpriteArray` instead.  Its attributes
+are kept in contiguous columns (NumPy arrays, if NumPy is installed) and all
+vertices are recomputed in one pass::
+
+    particles = pyglet.sprite.SpriteArray(spark_image, batch=batch)
+    for i in range(10000):
+        particles.add(x=random.random() * 640, y=random.random() * 480)
+
+    def update(dt):
+        particles.y[:len(particles)] -= 100 * dt
+        particles.update_vertices()
+
 .. versionadded:: 1.1
 """
 
 __docformat__ = 'restructuredtext'
 __version__ = '$Id$'
 
+import array
 import math
 import sys
 
@@ -113,6 +127,12 @@ from pyglet import image
 
 _is_epydoc = hasattr(sys, 'is_epydoc') and sys.is_epydoc
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
 
 class SpriteGroup(graphics.Group):
     """Shared sprite rendering group.
@@ -156,6 +176,30 @@ class SpriteGroup(graphics.Group):
         glPopAttrib()
         glDisable(self.texture.target)
 
+    def switch_state(self, previous):
+        # The color buffer attributes pushed by `previous` are kept, and
+        # popped when this group is unset.
+        if previous.texture.target != self.texture.target:
+            glDisable(previous.texture.target)
+            glEnable(self.texture.target)
+        glBindTexture(self.texture.target, self.texture.id)
+        if (previous.blend_src != self.blend_src or
+                previous.blend_dest != self.blend_dest):
+            glBlendFunc(self.blend_src, self.blend_dest)
+
+    @property
+    def state_key(self):
+        return (self.texture.target, self.texture.id,
+                self.blend_src, self.blend_dest)
+
+    def __lt__(self, other):
+        # Keep sprite groups with the same blend mode and texture target
+        # together, to make state changes between them cheaper.
+        if isinstance(other, SpriteGroup):
+            return (self.blend_src, self.blend_dest, self.texture.target, self.texture.id) < \
+                   (other.blend_src, other.blend_dest, other.texture.target, other.texture.id)
+        return super(SpriteGroup, self).__lt__(other)
+
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self.texture)
 
@@ -373,9 +417,11 @@ class Sprite(event.EventDispatcher):
             if self._batch is None:
                 self._vertex_list.tex_coords[:] = texture.tex_coords
             else:
-                self._vertex_list.delete()
+                self._batch.migrate(self._vertex_list, GL_QUADS, self._group,
+                                    self._batch)
                 self._texture = texture
-                self._create_vertex_list()
+                self._vertex_list.tex_coords[:] = texture.tex_coords
+                self._update_position()
         else:
             self._vertex_list.tex_coords[:] = texture.tex_coords
         self._texture = texture
@@ -688,3 +734,408 @@ class Sprite(event.EventDispatcher):
 
 
 Sprite.register_event_type('on_animation_end')
+
+
+def pack_sprite_textures(sprites, texture_bin=None):
+    """Re-pack the images of sprites into shared texture atlases.
+
+    Each distinct texture gives a sprite its own :py:class:`SpriteGroup`, and
+    therefore its own draw call when drawn in a batch.  This function copies
+    the images of the given sprites into the atlases of `texture_bin` and
+    migrates the sprites' vertex lists to the groups of those atlases, so
+    that sprites sharing an atlas (and parent group and blend mode) are drawn
+    together.
+
+    Sprites showing animations, and images that are transformed, too large
+    for the bin or already in one of its atlases are left unchanged.  The
+    image data is read back from the original textures, so this is best done
+    once, after loading.
+
+    :Parameters:
+        `sprites` : sequence of :py:class:`Sprite`
+            Sprites whose images should be packed.
+        `texture_bin` : `~pyglet.image.atlas.TextureBin`
+            Bin to pack the images into.  If omitted a new bin is used.
+
+    :rtype: (int, int)
+    :return: The number of distinct sprite groups (and so of draw calls)
+        used by the sprites before and after packing.
+
+    .. versionadded:: 1.4
+    """
+    if texture_bin is None:
+        texture_bin = image.atlas.TextureBin()
+    sprites = [sprite for sprite in sprites if sprite._vertex_list is not None]
+    groups_before = len(set(sprite._group for sprite in sprites))
+
+    atlas_ids = set(atlas.texture.id for atlas in texture_bin.atlases)
+    regions = {}
+    for sprite in sprites:
+        texture = sprite._texture
+        if (sprite._animation is not None or
+                texture.id in atlas_ids or
+                texture.images > 1 or
+                texture.tex_coords_order != (0, 1, 2, 3)):
+            continue
+
+        key = texture.id, texture.tex_coords
+        try:
+            region = regions[key]
+        except KeyError:
+            try:
+                region = texture_bin.add(texture.get_image_data())
+            except image.atlas.AllocatorException:
+                region = None
+            else:
+                region.anchor_x = texture.anchor_x
+                region.anchor_y = texture.anchor_y
+                atlas_ids.add(region.id)
+            regions[key] = region
+
+        if region is not None:
+            sprite._set_texture(region)
+
+    groups_after = len(set(sprite._group for sprite in sprites))
+    return groups_before, groups_after
+
+
+class SpriteArray(object):
+    """Many instances of one image, stored and updated in bulk.
+
+    Where :py:class:`Sprite` keeps its attributes on a Python object and
+    recomputes its vertices on every property change, a sprite array keeps
+    the attributes of all of its sprites in contiguous columns and
+    recomputes every quad in a single pass when :py:meth:`update` is called.
+    This is suited to particles, bullets and similar large populations that
+    move every frame.
+
+    The columns are the attributes ``x``, ``y``, ``rotation``, ``scale``,
+    ``scale_x``, ``scale_y``, ``opacity``, ``visible`` and ``colors`` (three
+    components per sprite).  They are NumPy arrays if NumPy is installed,
+    otherwise :py:class:`array.array` objects, and have room for
+    :py:attr:`capacity` sprites; only the first ``len(sprite_array)`` entries
+    are meaningful.  The columns may be modified in place, after which
+    :py:meth:`update` (or :py:meth:`update_colors` for ``opacity`` and
+    ``colors``) must be called.  Growing the array replaces the column
+    objects, so references to them should not be kept across :py:meth:`add`.
+
+    All sprites in the array share a single :py:class:`SpriteGroup` and a
+    single vertex list in the batch, and so are drawn with one draw call.
+    Animations are not supported.
+
+    .. versionadded:: 1.4
+    """
+
+    _columns = ('x', 'y', 'rotation', 'scale', 'scale_x', 'scale_y', 'opacity')
+
+    def __init__(self,
+                 img,
+                 blend_src=GL_SRC_ALPHA,
+                 blend_dest=GL_ONE_MINUS_SRC_ALPHA,
+                 batch=None,
+                 group=None,
+                 usage='stream',
+                 subpixel=False,
+                 capacity=16):
+        """Create an empty sprite array.
+
+        :Parameters:
+            `img` : `~pyglet.image.AbstractImage`
+                Image to display for every sprite.
+            `blend_src` : int
+                OpenGL blend source mode.
+            `blend_dest` : int
+                OpenGL blend destination mode.
+            `batch` : `~pyglet.graphics.Batch`
+                Optional batch to add the sprites to.
+            `group` : `~pyglet.graphics.Group`
+                Optional parent group of the sprites.
+            `usage` : str
+                Vertex buffer object usage hint, one of ``"none"``,
+                ``"stream"`` (default), ``"dynamic"`` or ``"static"``.
+                Applies only to vertex data.
+            `subpixel` : bool
+                Allow floating-point coordinates for the sprites. By default,
+                coordinates are restricted to integer values.
+            `capacity` : int
+                Number of sprites to reserve space for initially.
+        """
+        self._texture = img.get_texture()
+        self._batch = batch
+        self._group = SpriteGroup(self._texture, blend_src, blend_dest, group)
+        self._usage = usage
+        self._subpixel = subpixel
+        self._count = 0
+        self._capacity = 0
+        self._vertex_list = None
+        for name in self._columns:
+            setattr(self, name, self._new_column('d', 0))
+        self.visible = self._new_column('B', 0)
+        self.colors = self._new_column('B', 0)
+        self._grow(max(1, capacity))
+
+    @staticmethod
+    def _new_column(typecode, length, old=None):
+        if _have_numpy:
+            column = numpy.zeros(length, dtype=typecode)
+            if old is not None:
+                column[:len(old)] = old
+        else:
+            column = array.array(typecode, [0]) * length
+            if old is not None:
+                column[:len(old)] = old
+        return column
+
+    def _grow(self, capacity):
+        for name in self._columns:
+            setattr(self, name, self._new_column('d', capacity, getattr(self, name)))
+        self.visible = self._new_column('B', capacity, self.visible)
+        self.colors = self._new_column('B', capacity * 3, self.colors)
+
+        if self._subpixel:
+            vertex_format = 'v2f/%s' % self._usage
+        else:
+            vertex_format = 'v2i/%s' % self._usage
+        count = capacity * 4
+        tex_coords = ('t3f', tuple(self._texture.tex_coords) * capacity)
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+        if self._batch is None:
+            self._vertex_list = graphics.vertex_list(count, vertex_format, 'c4B', tex_coords)
+        else:
+            self._vertex_list = self._batch.add(count, GL_QUADS, self._group,
+                                                vertex_format, 'c4B', tex_coords)
+        self._capacity = capacity
+        self.update()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        """Number of sprites the columns currently have room for.
+
+        Read-only.
+
+        :type: int
+        """
+        return self._capacity
+
+    @property
+    def batch(self):
+        """Graphics batch the sprites are drawn in.
+
+        Read-only.
+
+        :type: :py:class:`pyglet.graphics.Batch`
+        """
+        return self._batch
+
+    @property
+    def image(self):
+        """Texture displayed by every sprite.
+
+        Read-only.
+
+        :type: :py:class:`~pyglet.image.Texture`
+        """
+        return self._texture
+
+    def add(self, x=0, y=0, rotation=0, scale=1.0, scale_x=1.0, scale_y=1.0,
+            opacity=255, color=(255, 255, 255), visible=True):
+        """Append a sprite to the array.
+
+        The new sprite's vertices are not computed until the next call to
+        :py:meth:`update`.
+
+        :Parameters:
+            `x` : float
+                X coordinate of the sprite.
+            `y` : float
+                Y coordinate of the sprite.
+            `rotation` : float
+                Clockwise rotation of the sprite, in degrees.
+            `scale` : float
+                Base scaling factor.
+            `scale_x` : float
+                Horizontal scaling factor.
+            `scale_y` : float
+                Vertical scaling factor.
+            `opacity` : int
+                Blend opacity, from 0 to 255.
+            `color` : (int, int, int)
+                Blend color.
+            `visible` : bool
+                True if the sprite should be drawn.
+
+        :rtype: int
+        :return: Index of the new sprite within the columns.
+        """
+        if self._count == self._capacity:
+            self._grow(self._capacity * 2)
+        i = self._count
+        self._count += 1
+        self.x[i] = x
+        self.y[i] = y
+        self.rotation[i] = rotation
+        self.scale[i] = scale
+        self.scale_x[i] = scale_x
+        self.scale_y[i] = scale_y
+        self.opacity[i] = opacity
+        self.visible[i] = bool(visible)
+        self.colors[i * 3:i * 3 + 3] = array.array('B', [int(c) for c in color])
+        return i
+
+    def remove(self, index):
+        """Remove a sprite from the array.
+
+        The last sprite in the array is moved into the removed sprite's
+        index, so indices of other sprites are not stable across removal.
+        The vertices are not updated until the next call to :py:meth:`update`.
+
+        :Parameters:
+            `index` : int
+                Index of the sprite to remove.
+        """
+        last = self._count - 1
+        if not 0 <= index <= last:
+            raise IndexError('sprite index out of range')
+        if index != last:
+            for name in self._columns:
+                column = getattr(self, name)
+                column[index] = column[last]
+            self.visible[index] = self.visible[last]
+            self.colors[index * 3:index * 3 + 3] = self.colors[last * 3:last * 3 + 3]
+        self.visible[last] = 0
+        self._count = last
+
+    def clear(self):
+        """Remove all sprites from the array, keeping its capacity."""
+        for i in range(self._count):
+            self.visible[i] = 0
+        self._count = 0
+        self.update()
+
+    def update(self):
+        """Recompute the vertices and colors of every sprite."""
+        self.update_vertices()
+        self.update_colors()
+
+    def update_vertices(self):
+        """Recompute the vertices of every sprite from the position,
+        rotation, scale and visibility columns.
+        """
+        img = self._texture
+        if _have_numpy:
+            self._update_vertices_numpy(img)
+        else:
+            self._update_vertices_python(img)
+
+    def _update_vertices_numpy(self, img):
+        n = self._count
+        out = numpy.ctypeslib.as_array(self._vertex_list.vertices).reshape(-1, 8)
+        scale_x = self.scale[:n] * self.scale_x[:n]
+        scale_y = self.scale[:n] * self.scale_y[:n]
+        x1 = -img.anchor_x * scale_x
+        y1 = -img.anchor_y * scale_y
+        x2 = x1 + img.width * scale_x
+        y2 = y1 + img.height * scale_y
+        r = numpy.radians(self.rotation[:n])
+        cr = numpy.cos(r)
+        sr = -numpy.sin(r)
+        x = self.x[:n]
+        y = self.y[:n]
+
+        vertices = numpy.empty((n, 8))
+        vertices[:, 0] = x1 * cr - y1 * sr + x
+        vertices[:, 1] = x1 * sr + y1 * cr + y
+        vertices[:, 2] = x2 * cr - y1 * sr + x
+        vertices[:, 3] = x2 * sr + y1 * cr + y
+        vertices[:, 4] = x2 * cr - y2 * sr + x
+        vertices[:, 5] = x2 * sr + y2 * cr + y
+        vertices[:, 6] = x1 * cr - y2 * sr + x
+        vertices[:, 7] = x1 * sr + y2 * cr + y
+        vertices[self.visible[:n] == 0] = 0
+        if not self._subpixel:
+            vertices = numpy.trunc(vertices)
+        out[:n] = vertices
+        out[n:] = 0
+
+    def _update_vertices_python(self, img):
+        n = self._count
+        anchor_x = img.anchor_x
+        anchor_y = img.anchor_y
+        width = img.width
+        height = img.height
+        cos = math.cos
+        sin = math.sin
+        radians = math.radians
+        hidden = (0, 0, 0, 0, 0, 0, 0, 0)
+
+        vertices = []
+        extend = vertices.extend
+        for x, y, rotation, scale, scale_x, scale_y, visible in zip(
+                self.x[:n], self.y[:n], self.rotation[:n], self.scale[:n],
+                self.scale_x[:n], self.scale_y[:n], self.visible[:n]):
+            if not visible:
+                extend(hidden)
+                continue
+            scale_x *= scale
+            scale_y *= scale
+            x1 = -anchor_x * scale_x
+            y1 = -anchor_y * scale_y
+            x2 = x1 + width * scale_x
+            y2 = y1 + height * scale_y
+            if rotation:
+                r = -radians(rotation)
+                cr = cos(r)
+                sr = sin(r)
+                extend((x1 * cr - y1 * sr + x, x1 * sr + y1 * cr + y,
+                        x2 * cr - y1 * sr + x, x2 * sr + y1 * cr + y,
+                        x2 * cr - y2 * sr + x, x2 * sr + y2 * cr + y,
+                        x1 * cr - y2 * sr + x, x1 * sr + y2 * cr + y))
+            else:
+                x1 += x
+                y1 += y
+                x2 += x
+                y2 += y
+                extend((x1, y1, x2, y1, x2, y2, x1, y2))
+        if not self._subpixel:
+            vertices = list(map(int, vertices))
+        vertices.extend(hidden * (self._capacity - n))
+        self._vertex_list.vertices[:] = vertices
+
+    def update_colors(self):
+        """Recompute the vertex colors of every sprite from the ``colors`` and
+        ``opacity`` columns.
+        """
+        n = self._count
+        if _have_numpy:
+            out = numpy.ctypeslib.as_array(self._vertex_list.colors).reshape(-1, 4, 4)
+            out[:n, :, :3] = self.colors[:n * 3].reshape(n, 1, 3)
+            out[:n, :, 3] = self.opacity[:n].astype(numpy.uint8).reshape(n, 1)
+        else:
+            colors = []
+            extend = colors.extend
+            rgb = self.colors
+            for i, opacity in enumerate(self.opacity[:n]):
+                extend((rgb[i * 3], rgb[i * 3 + 1], rgb[i * 3 + 2], int(opacity)) * 4)
+            self._vertex_list.colors[:len(colors)] = colors
+
+    def delete(self):
+        """Force immediate removal of the sprites from video memory."""
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
+        self._texture = None
+        self._group = None
+
+    def draw(self):
+        """Draw all sprites in the array.
+
+        See the module documentation for hints on drawing multiple sprites
+        efficiently.
+        """
+        self._group.set_state_recursive()
+        self._vertex_list.draw(GL_QUADS)
+        self._group.unset_state_recursive()
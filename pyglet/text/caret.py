@@ -365,7 +365,7 @@ class Caret(object):
 
         m2 = self._next_word_re.search(self._layout.document.text, p)
         if not m2:
-            m2 = len(self._layout.document.text)
+            m2 = self._layout.document.length
         else:
             m2 = m2.start()
         self._position = m2
@@ -412,8 +412,8 @@ class Caret(object):
         self._layout.ensure_x_visible(x)
 
     def on_layout_update(self):
-        if self.position > len(self._layout.document.text):
-            self.position = len(self._layout.document.text)
+        if self.position > self._layout.document.length:
+            self.position = self._layout.document.length
         self._update()
 
     def on_text(self, text):
@@ -450,7 +450,7 @@ class Caret(object):
         elif motion == key.MOTION_DELETE:
             if self.mark is not None:
                 self._delete_selection()
-            elif self._position < len(self._layout.document.text):
+            elif self._position < self._layout.document.length:
                 self._layout.document.delete_text(
                     self._position, self._position + 1)
         elif self._mark is not None and not select:
@@ -460,7 +460,7 @@ class Caret(object):
         if motion == key.MOTION_LEFT:
             self.position = max(0, self.position - 1)
         elif motion == key.MOTION_RIGHT:
-            self.position = min(len(self._layout.document.text), 
+            self.position = min(self._layout.document.length, 
                                 self.position + 1) 
         elif motion == key.MOTION_UP:
             self.line = max(0, self.line - 1)
@@ -477,16 +477,16 @@ class Caret(object):
                     self._layout.get_position_from_line(line + 1) - 1
                 self._update(line)
             else:
-                self.position = len(self._layout.document.text)
+                self.position = self._layout.document.length
         elif motion == key.MOTION_BEGINNING_OF_FILE:
             self.position = 0
         elif motion == key.MOTION_END_OF_FILE:
-            self.position = len(self._layout.document.text)
+            self.position = self._layout.document.length
         elif motion == key.MOTION_NEXT_WORD:
             pos = self._position + 1
             m = self._next_word_re.search(self._layout.document.text, pos)
             if not m:
-                self.position = len(self._layout.document.text)
+                self.position = self._layout.document.length
             else:
                 self.position = m.start()
         elif motion == key.MOTION_PREVIOUS_WORD:
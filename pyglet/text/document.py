@@ -169,10 +169,10 @@ from builtins import object
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
-import re
 import sys
 
 from pyglet import event
+from pyglet.text import rope
 from pyglet.text import runlist
 
 _is_epydoc = hasattr(sys, 'is_epydoc') and sys.is_epydoc
@@ -269,13 +269,14 @@ class AbstractDocument(event.EventDispatcher):
     document format.  It may be easier to implement the document format in
     terms of one of the supplied concrete classes :py:class:`~pyglet.text.document.FormattedDocument` or
     :py:class:`~pyglet.text.document.UnformattedDocument`. 
+
+    The text is stored in a :py:class:`~pyglet.text.rope.Rope`, so inserting
+    and deleting text does not copy the whole document.
     """
-    _previous_paragraph_re = re.compile(u'\n[^\n\u2029]*$')
-    _next_paragraph_re = re.compile(u'[\n\u2029]')
 
     def __init__(self, text=''):
         super(AbstractDocument, self).__init__()
-        self._text = u''
+        self._rope = rope.Rope()
         self._elements = []
         if text:
             self.insert_text(0, text)
@@ -287,17 +288,48 @@ class AbstractDocument(event.EventDispatcher):
         For efficient incremental updates, use the :py:func:`~pyglet.text.document.AbstractDocument.insert_text` and
         :py:func:`~pyglet.text.document.AbstractDocument.delete_text` methods instead of replacing this property.
 
+        The string is cached until the document is next modified; use
+        :py:attr:`~pyglet.text.document.AbstractDocument.length` and
+        :py:meth:`~pyglet.text.document.AbstractDocument.get_text` to avoid
+        building it after every edit.
+
         :type: str
         """
-        return self._text
+        return self._rope.text
 
     @text.setter
     def text(self, text):
-        if text == self._text:
+        if text == self._rope.text:
             return
-        self.delete_text(0, len(self._text))
+        self.delete_text(0, len(self._rope))
         self.insert_text(0, text)
 
+    @property
+    def length(self):
+        """Number of characters in the document.
+
+        :type: int
+
+        .. versionadded:: 1.4
+        """
+        return len(self._rope)
+
+    def get_text(self, start=0, end=None):
+        """Get a range of the document text.
+
+        :Parameters:
+            `start` : int
+                Starting character position.
+            `end` : int
+                Ending character position (exclusive), or None for the end
+                of the document.
+
+        :rtype: str
+
+        .. versionadded:: 1.4
+        """
+        return self._rope.get_text(start, end)
+
     def get_paragraph_start(self, pos):
         """Get the starting position of a paragraph.
 
@@ -307,16 +339,17 @@ class AbstractDocument(event.EventDispatcher):
 
         :rtype: int
         """
-        # Tricky special case where the $ in pattern matches before the \n at
-        # the end of the string instead of the end of the string.
-        if (self._text[:pos + 1].endswith('\n') or
-                self._text[:pos + 1].endswith(u'\u2029')):
+        text = self._rope
+        last = min(pos, len(text) - 1)
+        if last >= 0 and text[last] in u'\n\u2029':
             return pos
 
-        m = self._previous_paragraph_re.search(self._text, 0, pos + 1)
-        if not m:
+        # Only a newline begins a paragraph here; a preceding paragraph
+        # separator gives the start of the document.
+        separator = text.rfind_any(u'\n\u2029', pos + 1)
+        if separator == -1 or text[separator] != u'\n':
             return 0
-        return m.start() + 1
+        return separator + 1
 
     def get_paragraph_end(self, pos):
         """Get the end position of a paragraph.
@@ -327,10 +360,10 @@ class AbstractDocument(event.EventDispatcher):
 
         :rtype: int
         """
-        m = self._next_paragraph_re.search(self._text, pos)
-        if not m:
-            return len(self._text)
-        return m.start() + 1
+        separator = self._rope.find_any(u'\n\u2029', pos)
+        if separator == -1:
+            return len(self._rope)
+        return separator + 1
 
     def get_style_runs(self, attribute):
         """Get a style iterator over the given style attribute.
@@ -430,11 +463,10 @@ class AbstractDocument(event.EventDispatcher):
         self.dispatch_event('on_insert_text', start, text)
 
     def _insert_text(self, start, text, attributes):
-        self._text = u''.join((self._text[:start], text, self._text[start:]))
+        self._rope.insert(start, text)
         len_text = len(text)
-        for element in self._elements:
-            if element._position >= start:
-                element._position += len_text
+        for element in self._elements[self._bisect_elements(start):]:
+            element._position += len_text
 
     def delete_text(self, start, end):
         """Delete text from the document.
@@ -450,13 +482,25 @@ class AbstractDocument(event.EventDispatcher):
         self.dispatch_event('on_delete_text', start, end)
 
     def _delete_text(self, start, end):
-        for element in list(self._elements):
-            if start <= element._position < end:
-                self._elements.remove(element)
-            elif element._position >= end:  # fix bug 538
-                element._position -= (end - start)
-
-        self._text = self._text[:start] + self._text[end:]
+        first = self._bisect_elements(start)
+        last = self._bisect_elements(end)
+        del self._elements[first:last]
+        for element in self._elements[first:]:  # fix bug 538
+            element._position -= (end - start)
+
+        self._rope.delete(start, end)
+
+    def _bisect_elements(self, position):
+        # Index of the first element at or after position.
+        elements = self._elements
+        low, high = 0, len(elements)
+        while low < high:
+            middle = (low + high) // 2
+            if elements[middle]._position < position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
 
     def insert_element(self, position, element, attributes=None):
         """Insert a element into the document.
@@ -478,8 +522,7 @@ class AbstractDocument(event.EventDispatcher):
             'Element is already in a document.'
         self.insert_text(position, '\0', attributes)
         element._position = position
-        self._elements.append(element)
-        self._elements.sort(key=lambda d: d.position)
+        self._elements.insert(self._bisect_elements(position), element)
 
     def get_element(self, position):
         """Get the element at a specified position.
@@ -490,9 +533,10 @@ class AbstractDocument(event.EventDispatcher):
 
         :rtype: :py:class:`~pyglet.text.document.InlineElement`
         """
-        for element in self._elements:
-            if element._position == position:
-                return element
+        index = self._bisect_elements(position)
+        if (index < len(self._elements) and
+                self._elements[index]._position == position):
+            return self._elements[index]
         raise RuntimeError('No element at position %d' % position)
 
     def set_style(self, start, end, attributes):
@@ -593,25 +637,25 @@ class UnformattedDocument(AbstractDocument):
 
     def get_style_runs(self, attribute):
         value = self.styles.get(attribute)
-        return runlist.ConstRunIterator(len(self.text), value)
+        return runlist.ConstRunIterator(self.length, value)
 
     def get_style(self, attribute, position=None):
         return self.styles.get(attribute)
 
     def set_style(self, start, end, attributes):
         return super(UnformattedDocument, self).set_style(
-            0, len(self.text), attributes)
+            0, self.length, attributes)
 
     def _set_style(self, start, end, attributes):
         self.styles.update(attributes)
 
     def set_paragraph_style(self, start, end, attributes):
         return super(UnformattedDocument, self).set_paragraph_style(
-            0, len(self.text), attributes)
+            0, self.length, attributes)
 
     def get_font_runs(self, dpi=None):
         ft = self.get_font(dpi=dpi)
-        return runlist.ConstRunIterator(len(self.text), ft)
+        return runlist.ConstRunIterator(self.length, ft)
 
     def get_font(self, position=None, dpi=None):
         from pyglet import font
@@ -623,7 +667,7 @@ class UnformattedDocument(AbstractDocument):
                          bold=bool(bold), italic=bool(italic), dpi=dpi)
 
     def get_element_runs(self):
-        return runlist.ConstRunIterator(len(self._text), None)
+        return runlist.ConstRunIterator(self.length, None)
 
 
 class FormattedDocument(AbstractDocument):
@@ -654,8 +698,9 @@ class FormattedDocument(AbstractDocument):
             try:
                 runs = self._style_runs[attribute]
             except KeyError:
-                runs = self._style_runs[attribute] = runlist.RunList(0, None)
-                runs.insert(0, len(self._text))
+                runs = self._style_runs[attribute] = \
+                    runlist.IndexedRunList(0, None)
+                runs.insert(0, self.length)
             runs.set_run(start, end, value)
 
     def get_font_runs(self, dpi=None):
@@ -671,7 +716,7 @@ class FormattedDocument(AbstractDocument):
         return iter[position]
 
     def get_element_runs(self):
-        return _ElementIterator(self._elements, len(self._text))
+        return _ElementIterator(self._elements, self.length)
 
     def _insert_text(self, start, text, attributes):
         super(FormattedDocument, self)._insert_text(start, text, attributes)
@@ -686,8 +731,8 @@ class FormattedDocument(AbstractDocument):
                     runs = self._style_runs[attribute]
                 except KeyError:
                     runs = self._style_runs[attribute] = \
-                        runlist.RunList(0, None)
-                    runs.insert(0, len(self.text))
+                        runlist.IndexedRunList(0, None)
+                    runs.insert(0, self.length)
                 runs.set_run(start, start + len_text, value)
 
     def _delete_text(self, start, end):
@@ -161,6 +161,8 @@ from builtins import object
 __docformat__ = 'restructuredtext'
 __version__ = '$Id: $'
 
+import itertools
+import math
 import re
 import sys
 
@@ -171,6 +173,12 @@ from pyglet.text import runlist
 
 from pyglet.font.base import _grapheme_break
 
+try:
+    import numpy
+    _have_numpy = True
+except ImportError:
+    _have_numpy = False
+
 _is_epydoc = hasattr(sys, 'is_epydoc') and sys.is_epydoc
 
 _distance_re = re.compile(r'([-0-9.]+)([a-zA-Z]+)')
@@ -208,6 +216,20 @@ def _parse_distance(distance, dpi):
         assert False, 'Unknown distance unit %s' % unit
 
 
+def _bisect(sequence, predicate):
+    # Return the index of the first item for which `predicate` is true,
+    # assuming it is false for all items before it and true for all items
+    # after it, or the length of the sequence if it is true for none.
+    low, high = 0, len(sequence)
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(sequence[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
 class _Line(object):
     align = 'left'
 
@@ -223,16 +245,44 @@ class _Line(object):
     paragraph_end = False
 
     x = None
-    y = None
+
+    # Lines of an IncrementalTextLayout after the gap of its `_LineIndex`
+    # store `start` and `y` relative to the index's offsets.
+    _offsets = None
+    _y = None
 
     def __init__(self, start):
         self.vertex_lists = []
-        self.start = start
+        self._start = start
         self.boxes = []
 
     def __repr__(self):
         return '_Line(%r)' % self.boxes
 
+    @property
+    def start(self):
+        if self._offsets is None:
+            return self._start
+        return self._start + self._offsets.start
+
+    @start.setter
+    def start(self, start):
+        if self._offsets is not None:
+            start -= self._offsets.start
+        self._start = start
+
+    @property
+    def y(self):
+        if self._offsets is None or self._y is None:
+            return self._y
+        return self._y + self._offsets.y
+
+    @y.setter
+    def y(self, y):
+        if self._offsets is not None and y is not None:
+            y -= self._offsets.y
+        self._y = y
+
     def add_box(self, box):
         self.boxes.append(box)
         self.length += box.length
@@ -249,6 +299,326 @@ class _Line(object):
             box.delete(layout)
 
 
+class _LineIndex(object):
+    """Index over the lines of an `IncrementalTextLayout`.
+
+    Lines are ordered by increasing `start` and decreasing `y`, so a line can
+    be found by position or coordinate with a binary search (`bisect`).
+
+    Inserting text changes the start of every line after it, and a line
+    changing height moves every line after it.  Rather than updating each of
+    these lines, the lines from a movable gap to the end of the list store
+    their `start` and `y` relative to the offsets of this index, so that they
+    can all be moved at once with `shift`.  Moving the gap to the position of
+    an edit only touches the lines in between, which for typical editing is
+    only a few lines.
+
+    The layout must add and remove lines with `replace`, `insert` and
+    `delete` rather than modifying `lines` directly.
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.gap = len(lines)
+        self.start = 0
+        self.y = 0
+
+    def bisect(self, predicate):
+        """Return the index of the first line for which `predicate` is true,
+        assuming it is false for all lines before it and true for all lines
+        after it, or the number of lines if it is true for none.
+        """
+        return _bisect(self.lines, predicate)
+
+    def shift(self, index, start, y):
+        """Move the lines from `index` to the end by `start` characters and
+        `y` pixels.
+        """
+        self._move_gap(index)
+        self.start += start
+        self.y += y
+
+    def replace(self, index, line):
+        old_line = self.lines[index]
+        if old_line._offsets is not None:
+            self._attach(line)
+        self.lines[index] = line
+
+    def insert(self, index, line):
+        if index < self.gap:
+            self.gap += 1
+        else:
+            self._attach(line)
+        self.lines.insert(index, line)
+
+    def delete(self, start, end):
+        del self.lines[start:end]
+        if self.gap >= end:
+            self.gap -= end - start
+        elif self.gap > start:
+            self.gap = start
+
+    def clear(self):
+        del self.lines[:]
+        self.gap = 0
+        self.start = 0
+        self.y = 0
+
+    def _attach(self, line):
+        start, y = line.start, line.y
+        line._offsets = self
+        line.start = start
+        line.y = y
+
+    def _move_gap(self, index):
+        lines = self.lines
+        if index < self.gap:
+            for line in lines[index:self.gap]:
+                self._attach(line)
+        else:
+            for line in lines[self.gap:index]:
+                start, y = line.start, line.y
+                line._offsets = None
+                line.start = start
+                line.y = y
+        self.gap = index
+
+
+class _EstimatedLine(_Line):
+    """Paragraphs of a virtual `IncrementalTextLayout` that have not been laid
+    out yet.
+
+    The line covers `length` characters, starting and ending on a paragraph
+    boundary, and takes up an estimated height (given as its `ascent`) so that
+    the layout has about the right content height without measuring the text.
+    It has no boxes and is never drawn.
+    """
+    paragraph_begin = True
+    paragraph_end = True
+
+    def __init__(self, start, length, height):
+        super(_EstimatedLine, self).__init__(start)
+        self.length = length
+        self.ascent = height
+
+    def __repr__(self):
+        return '_EstimatedLine(%d, %d)' % (self.start, self.length)
+
+
+_glyph_chunk_size = 2048
+_max_glyph_chunk_size = 2 * _glyph_chunk_size
+
+
+class _GlyphList(object):
+    """Glyphs of the characters of an `IncrementalTextLayout`'s document.
+
+    Indexing and slicing give the glyph (or inline element box) of each
+    character, or None for characters that have not been given one yet.  As
+    in `pyglet.text.rope.Rope`, the glyphs are kept in chunks with their
+    lengths in a binary indexed tree, so that editing a large document only
+    copies one chunk.  A run of characters without glyphs, such as the text of
+    an estimated line, is kept as a count rather than a list.
+    """
+
+    def __init__(self):
+        self._build([])
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, end, step = index.indices(self._length)
+            assert step == 1, 'Extended slices are not supported'
+            return self._get(start, end)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Glyph index out of range')
+        chunk_index, offset = self._find(index)
+        chunk = self._chunks[chunk_index]
+        if isinstance(chunk, list):
+            return chunk[offset]
+        return None
+
+    def __setitem__(self, index, glyphs):
+        if isinstance(index, slice):
+            start, end, step = index.indices(self._length)
+            assert step == 1, 'Extended slices are not supported'
+            glyphs = list(glyphs)
+        else:
+            start, end = index, index + 1
+            glyphs = [glyphs]
+        self._replace(start, max(start, end), glyphs)
+
+    def insert(self, start, length):
+        """Insert characters without glyphs.
+
+        :Parameters:
+            `start` : int
+                Character insertion point.
+            `length` : int
+                Number of characters to insert.
+
+        """
+        if length <= 0:
+            return
+        if self._chunks:
+            index, offset = self._find(start, insert=True)
+            chunk = self._chunks[index]
+            if not isinstance(chunk, list):
+                self._chunks[index] = chunk + length
+                self._length += length
+                self._add(index, length)
+                return
+            elif len(chunk) + length <= _max_glyph_chunk_size:
+                chunk[offset:offset] = [None] * length
+                self._length += length
+                self._add(index, length)
+                return
+        self._replace(start, start, length)
+
+    def delete(self, start, end):
+        """Delete the glyphs of a range of characters.
+
+        :Parameters:
+            `start` : int
+                Starting character position to delete from.
+            `end` : int
+                Ending character position to delete to (exclusive).
+
+        """
+        self._replace(start, end, [])
+
+    def _get(self, start, end):
+        if start >= end:
+            return []
+        index, offset = self._find(start)
+        chunk = self._chunks[index]
+        if isinstance(chunk, list) and offset + end - start <= len(chunk):
+            return chunk[offset:offset + end - start]
+
+        glyphs = []
+        remaining = end - start
+        while remaining > 0:
+            chunk = self._chunks[index]
+            if isinstance(chunk, list):
+                part = chunk[offset:offset + remaining]
+                glyphs.extend(part)
+                remaining -= len(part)
+            else:
+                count = min(chunk - offset, remaining)
+                glyphs.extend([None] * count)
+                remaining -= count
+            index += 1
+            offset = 0
+        return glyphs
+
+    def _replace(self, start, end, glyphs):
+        # Replace the glyphs from `start` to `end` with a list of glyphs, or
+        # with a number of characters without glyphs.
+        start = max(0, min(start, self._length))
+        end = max(start, min(end, self._length))
+        chunks = self._chunks
+
+        if chunks and isinstance(glyphs, list):
+            # Modify a single chunk in place if possible.
+            index, offset = self._find(start, insert=start == end)
+            chunk = chunks[index] if index < len(chunks) else None
+            if (isinstance(chunk, list) and offset + end - start <= len(chunk)
+                    and 0 < len(chunk) + len(glyphs) - (end - start)
+                    <= _max_glyph_chunk_size):
+                chunk[offset:offset + end - start] = glyphs
+                delta = len(glyphs) - (end - start)
+                if delta:
+                    self._length += delta
+                    self._add(index, delta)
+                return
+
+        first, first_offset = self._find(start)
+        last, last_offset = self._find(end)
+        pieces = []
+        if first < len(chunks):
+            pieces.append(chunks[first][:first_offset]
+                          if isinstance(chunks[first], list) else first_offset)
+        if isinstance(glyphs, list):
+            pieces.extend(glyphs[i:i + _glyph_chunk_size]
+                          for i in range(0, len(glyphs), _glyph_chunk_size))
+        else:
+            pieces.append(glyphs)
+        if last < len(chunks):
+            pieces.append(chunks[last][last_offset:]
+                          if isinstance(chunks[last], list)
+                          else chunks[last] - last_offset)
+
+        # Coalesce with the neighbouring chunks.
+        low = max(0, first - 1)
+        high = min(len(chunks), last + 2)
+        pieces = chunks[low:first] + pieces + chunks[last + 1:high]
+        new_chunks = []
+        for piece in pieces:
+            if not piece:
+                continue
+            if new_chunks:
+                previous = new_chunks[-1]
+                if not isinstance(piece, list):
+                    if not isinstance(previous, list):
+                        new_chunks[-1] = previous + piece
+                        continue
+                elif (isinstance(previous, list) and
+                      len(previous) + len(piece) <= _max_glyph_chunk_size):
+                    new_chunks[-1] = previous + piece
+                    continue
+            new_chunks.append(piece)
+        chunks[low:high] = new_chunks
+        self._build(chunks)
+
+    def _find(self, position, insert=False):
+        # Return the index of the chunk containing position and the offset
+        # within it.  With `insert`, a position at the end of a chunk is
+        # given in that chunk rather than at the start of the next one.
+        if insert:
+            position -= 1
+        tree = self._tree
+        index = 0
+        step = self._step
+        while step:
+            next_index = index + step
+            if next_index <= len(self._chunks) and tree[next_index] <= position:
+                index = next_index
+                position -= tree[next_index]
+            step >>= 1
+        if insert:
+            position += 1
+        return index, position
+
+    def _add(self, index, delta):
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _build(self, chunks):
+        self._chunks = chunks
+        self._length = 0
+        tree = [0] * (len(chunks) + 1)
+        for i, chunk in enumerate(chunks):
+            length = len(chunk) if isinstance(chunk, list) else chunk
+            self._length += length
+            index = i + 1
+            tree[index] += length
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+        step = 1
+        while step * 2 <= len(chunks):
+            step *= 2
+        self._step = step if chunks else 0
+
+
 class _LayoutContext(object):
     def __init__(self, layout, document, colors_iter, background_iter):
         self.colors_iter = colors_iter
@@ -307,6 +677,11 @@ class _AbstractBox(object):
         raise NotImplementedError('abstract')
 
 
+# Glyph runs shorter than this are placed one glyph at a time; below it the
+# fixed cost of the array operations outweighs the per-glyph loop.
+_min_batched_glyphs = 16
+
+
 class _GlyphBox(_AbstractBox):
     def __init__(self, owner, font, glyphs, advance):
         """Create a run of glyphs sharing the same texture.
@@ -340,37 +715,12 @@ class _GlyphBox(_AbstractBox):
             group = layout.groups[self.owner] = \
                 TextLayoutTextureGroup(self.owner, layout.foreground_group)
 
-        n_glyphs = self.length
-        vertices = []
-        tex_coords = []
-        x1 = x
-        for start, end, baseline in context.baseline_iter.ranges(i, i + n_glyphs):
-            baseline = layout._parse_distance(baseline)
-            assert len(self.glyphs[start - i:end - i]) == end - start
-            for kern, glyph in self.glyphs[start - i:end - i]:
-                x1 += kern
-                v0, v1, v2, v3 = glyph.vertices
-                v0 += x1
-                v2 += x1
-                v1 += y + baseline
-                v3 += y + baseline
-                vertices.extend(map(int, [v0, v1, v2, v1, v2, v3, v0, v3]))
-                t = glyph.tex_coords
-                tex_coords.extend(t)
-                x1 += glyph.advance
-
-        # Text color
-        colors = []
-        for start, end, color in context.colors_iter.ranges(i, i + n_glyphs):
-            if color is None:
-                color = (0, 0, 0, 255)
-            colors.extend(color * ((end - start) * 4))
-
-        vertex_list = layout.batch.add(n_glyphs * 4, GL_QUADS, group,
-                                       ('v2f/dynamic', vertices),
-                                       ('t3f/dynamic', tex_coords),
-                                       ('c4B/dynamic', colors))
-        context.add_list(vertex_list)
+        if _have_numpy and self.length >= _min_batched_glyphs:
+            baseline, edges = self._place_glyphs_numpy(
+                layout, group, i, x, y, context)
+        else:
+            baseline = self._place_glyphs(layout, group, i, x, y, context)
+            edges = None
 
         # Decoration (background color and underline)
         #
@@ -385,11 +735,14 @@ class _GlyphBox(_AbstractBox):
         y1 = y + self.descent + baseline
         y2 = y + self.ascent + baseline
         x1 = x
-        for start, end, decoration in context.decoration_iter.ranges(i, i + n_glyphs):
+        for start, end, decoration in context.decoration_iter.ranges(i, i + self.length):
             bg, underline = decoration
-            x2 = x1
-            for kern, glyph in self.glyphs[start - i:end - i]:
-                x2 += glyph.advance + kern
+            if edges is not None:
+                x2 = edges[end - i]
+            else:
+                x2 = x1
+                for kern, glyph in self.glyphs[start - i:end - i]:
+                    x2 += glyph.advance + kern
 
             if bg is not None:
                 background_vertices.extend(
@@ -419,6 +772,76 @@ class _GlyphBox(_AbstractBox):
                 ('c4B/dynamic', underline_colors))
             context.add_list(underline_list)
 
+    def _place_glyphs(self, layout, group, i, x, y, context):
+        n_glyphs = self.length
+        vertices = []
+        tex_coords = []
+        x1 = x
+        for start, end, baseline in context.baseline_iter.ranges(i, i + n_glyphs):
+            baseline = layout._parse_distance(baseline)
+            assert len(self.glyphs[start - i:end - i]) == end - start
+            for kern, glyph in self.glyphs[start - i:end - i]:
+                x1 += kern
+                v0, v1, v2, v3 = glyph.vertices
+                v0 += x1
+                v2 += x1
+                v1 += y + baseline
+                v3 += y + baseline
+                vertices.extend(map(int, [v0, v1, v2, v1, v2, v3, v0, v3]))
+                t = glyph.tex_coords
+                tex_coords.extend(t)
+                x1 += glyph.advance
+
+        # Text color
+        colors = []
+        for start, end, color in context.colors_iter.ranges(i, i + n_glyphs):
+            if color is None:
+                color = (0, 0, 0, 255)
+            colors.extend(color * ((end - start) * 4))
+
+        vertex_list = layout.batch.add(n_glyphs * 4, GL_QUADS, group,
+                                       ('v2f/dynamic', vertices),
+                                       ('t3f/dynamic', tex_coords),
+                                       ('c4B/dynamic', colors))
+        context.add_list(vertex_list)
+        return baseline
+
+    def _place_glyphs_numpy(self, layout, group, i, x, y, context):
+        n_glyphs = self.length
+        kerns, glyphs = zip(*self.glyphs)
+        quads = self.font.get_glyph_quads(glyphs)
+
+        # Pen position before and after each kern, as a running sum of
+        # interleaved kerns and advances.
+        pen = numpy.empty(n_glyphs * 2 + 1)
+        pen[0] = x
+        pen[1::2] = kerns
+        pen[2::2] = quads[:, 8]
+        pen.cumsum(out=pen)
+
+        origins = numpy.empty((n_glyphs, 1, 2))
+        origins[:, 0, 0] = pen[1::2]
+        for start, end, baseline in context.baseline_iter.ranges(i, i + n_glyphs):
+            baseline = layout._parse_distance(baseline)
+            origins[start - i:end - i, 0, 1] = y + baseline
+
+        vertex_list = layout.batch.add(n_glyphs * 4, GL_QUADS, group,
+                                       'v2f/dynamic', 't3f/dynamic', 'c4B/dynamic')
+        vertices = numpy.frombuffer(vertex_list.vertices, numpy.float32)
+        numpy.trunc(quads[:, :8].reshape(n_glyphs, 4, 2) + origins,
+                    out=vertices.reshape(n_glyphs, 4, 2), casting='unsafe')
+        tex_coords = numpy.frombuffer(vertex_list.tex_coords, numpy.float32)
+        tex_coords.reshape(n_glyphs, 12)[:] = quads[:, 9:]
+
+        # Text color
+        colors = numpy.frombuffer(vertex_list.colors, numpy.uint8).reshape(n_glyphs, 16)
+        for start, end, color in context.colors_iter.ranges(i, i + n_glyphs):
+            if color is None:
+                color = (0, 0, 0, 255)
+            colors[start - i:end - i] = tuple(color) * 4
+        context.add_list(vertex_list)
+        return baseline, pen[0::2]
+
     def delete(self, layout):
         pass
 
@@ -754,6 +1177,7 @@ class TextLayout(object):
     _update_enabled = True
     _own_batch = False
     _origin_layout = False  # Lay out relative to origin?  Otherwise to box.
+    _line_index = None
 
     def __init__(self, document, width=None, height=None,
                  multiline=False, dpi=None, batch=None, group=None,
@@ -928,9 +1352,9 @@ class TextLayout(object):
      """)
 
     def _get_lines(self):
-        len_text = len(self._document.text)
+        len_text = self._document.length
         glyphs = self._get_glyphs()
-        owner_runs = runlist.RunList(len_text, None)
+        owner_runs = runlist.IndexedRunList(len_text, None)
         self._get_owner_runs(owner_runs, glyphs, 0, len_text)
         lines = [line for line in self._flow_glyphs(glyphs, owner_runs,
                                                     0, len_text)]
@@ -950,7 +1374,7 @@ class TextLayout(object):
         self._boxes = []
         self.groups.clear()
 
-        if not self._document or not self._document.text:
+        if not self._document or not self._document.length:
             return
 
         lines = self._get_lines()
@@ -1096,7 +1520,7 @@ class TextLayout(object):
             'left')
         if self._width is None:
             wrap_iterator = runlist.ConstRunIterator(
-                len(self.document.text), False)
+                self.document.length, False)
         else:
             wrap_iterator = runlist.FilteredRunIterator(
                 self._document.get_style_runs('wrap'),
@@ -1122,7 +1546,7 @@ class TextLayout(object):
         line.align = align_iterator[start]
         line.margin_left = self._parse_distance(margin_left_iterator[start])
         line.margin_right = self._parse_distance(margin_right_iterator[start])
-        if start == 0 or self.document.text[start - 1] in u'\n\u2029':
+        if start == 0 or self.document.get_text(start - 1, start) in u'\n\u2029':
             line.paragraph_begin = True
             line.margin_left += self._parse_distance(indent_iterator[start])
         wrap = wrap_iterator[start]
@@ -1165,8 +1589,7 @@ class TextLayout(object):
             # Iterate over glyphs in this owner run.  `text` is the
             # corresponding character data for the glyph, and is used to find
             # whitespace and newlines.
-            for (text, glyph) in zip(self.document.text[start:end],
-                                     glyphs[start:end]):
+            for (text, glyph) in self._iter_glyphs(glyphs, start, end):
                 if nokern:
                     kern = 0
                     nokern = False
@@ -1341,6 +1764,17 @@ class TextLayout(object):
 
         yield line
 
+    def _iter_glyphs(self, glyphs, start, end):
+        # Iterate over (text, glyph) pairs, copying the text and glyphs a
+        # chunk at a time: flowing usually stops long before `end`.
+        document = self._document
+        while start < end:
+            chunk_end = min(start + 256, end)
+            for pair in zip(document.get_text(start, chunk_end),
+                            glyphs[start:chunk_end]):
+                yield pair
+            start = chunk_end
+
     def _flow_glyphs_single_line(self, glyphs, owner_runs, start, end):
         owner_iterator = owner_runs.get_run_iterator().ranges(start, end)
         font_iterator = self.document.get_font_runs(dpi=self._dpi)
@@ -1412,7 +1846,7 @@ class TextLayout(object):
             else:
                 y -= leading
 
-            if line_spacing is None:
+            if line_spacing is None or isinstance(line, _EstimatedLine):
                 y -= line.ascent
             else:
                 y -= line_spacing
@@ -1432,6 +1866,14 @@ class TextLayout(object):
                 # next line has no change (therefore subsequent lines do not
                 # need to be changed).
                 break
+            if (line_index >= end and line.y is not None and
+                    self._line_index is not None):
+                # The remaining lines are unchanged but have moved; move them
+                # all at once, and have the visible ones redrawn.
+                dy = y - line.y
+                self._line_index.shift(line_index, 0, dy)
+                self.content_height -= dy
+                return len(lines)
             line.y = y
 
             if line_spacing is None:
@@ -1795,6 +2237,18 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     background color).  The :py:class:`~pyglet.text.caret.Caret` class implements a visible text cursor and
     provides event handlers for scrolling, selecting and editing text in an
     incremental text layout.
+
+    If the layout is created with ``virtual=True`` and is `multiline`, only the
+    paragraphs within about a page of the viewport are laid out.  The rest of
+    the document is covered by lines of estimated height, which are laid out
+    as they are scrolled into view (or as `get_line_from_position` is called
+    for a position within them), so that the time taken to open a document
+    does not depend on its length.  The estimates are based on the text laid
+    out so far, so `content_height` and the line count are only approximate
+    until the whole document has been viewed.
+
+    .. versionadded:: 1.4
+        The `virtual` parameter.
     """
     _selection_start = 0
     _selection_end = 0
@@ -1802,10 +2256,16 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     _selection_background_color = [46, 106, 197, 255]
 
     def __init__(self, document, width, height, multiline=False, dpi=None,
-                 batch=None, group=None, wrap_lines=True):
+                 batch=None, group=None, wrap_lines=True, virtual=False):
         event.EventDispatcher.__init__(self)
-        self.glyphs = []
+        self.glyphs = _GlyphList()
         self.lines = []
+        self._line_index = _LineIndex(self.lines)
+
+        self._virtual = virtual
+        self._estimates = []
+        self._measured_length = 0
+        self._measured_height = 0
 
         self.invalid_glyphs = _InvalidRange()
         self.invalid_flow = _InvalidRange()
@@ -1814,7 +2274,7 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         self.invalid_vertex_lines = _InvalidRange()
         self.visible_lines = _InvalidRange()
 
-        self.owner_runs = runlist.RunList(0, None)
+        self.owner_runs = runlist.IndexedRunList(0, None)
 
         ScrollableTextLayout.__init__(self,
                                       document, width, height, multiline, dpi, batch, group,
@@ -1828,10 +2288,14 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     def _init_document(self):
         assert self._document, \
             'Cannot remove document from IncrementalTextLayout'
-        self.on_insert_text(0, self._document.text)
+        if self._virtual:
+            self._estimate_document()
+            self._update()
+        else:
+            self.on_insert_text(0, self._document.text)
 
     def _uninit_document(self):
-        self.on_delete_text(0, len(self._document.text))
+        self.on_delete_text(0, self._document.length)
 
     def _get_lines(self):
         return self.lines
@@ -1846,7 +2310,15 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
 
     def on_insert_text(self, start, text):
         len_text = len(text)
-        self.glyphs[start:start] = [None] * len_text
+        if self._virtual and not self.glyphs:
+            # Text inserted into an empty document is not laid out until it
+            # is scrolled into view.
+            self._estimate_document()
+            self._update()
+            return
+
+        estimate = self._get_estimate(start)
+        self.glyphs.insert(start, len_text)
 
         self.invalid_glyphs.insert(start, len_text)
         self.invalid_flow.insert(start, len_text)
@@ -1854,14 +2326,20 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
 
         self.owner_runs.insert(start, len_text)
 
-        for line in self.lines:
-            if line.start >= start:
-                line.start += len_text
+        if estimate is not None:
+            # Text inserted into an estimated line is not laid out; it only
+            # makes the estimate longer.
+            index = self._get_line_index(estimate)
+            self._resize_estimate(index, estimate.length + len_text)
+            self._line_index.shift(index + 1, len_text, 0)
+        else:
+            index = self._line_index.bisect(lambda line: line.start >= start)
+            self._line_index.shift(index, len_text, 0)
 
         self._update()
 
     def on_delete_text(self, start, end):
-        self.glyphs[start:end] = []
+        self.glyphs.delete(start, end)
 
         self.invalid_glyphs.delete(start, end)
         self.invalid_flow.delete(start, end)
@@ -1869,10 +2347,35 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
 
         self.owner_runs.delete(start, end)
 
-        size = end - start
-        for line in self.lines:
-            if line.start > start:
-                line.start = max(line.start - size, start)
+        index = self._line_index.bisect(lambda line: line.start > start)
+        end_index = self._line_index.bisect(lambda line: line.start > end)
+
+        if self._estimates:
+            # Estimated lines lose the deleted characters.
+            for i in range(end_index - 1, max(0, index - 1) - 1, -1):
+                line = self.lines[i]
+                if isinstance(line, _EstimatedLine):
+                    deleted = (min(end, line.start + line.length) -
+                               max(start, line.start))
+                    if deleted > 0:
+                        self._resize_estimate(i, line.length - deleted)
+
+        # Lines starting within the deleted text now start at `start`, and
+        # lines after it move back.
+        for line in self.lines[index:end_index]:
+            line.start = start
+        self._line_index.shift(end_index, start - end, 0)
+
+        if self._estimates:
+            for i in range(end_index - 1, max(0, index - 1) - 1, -1):
+                line = self.lines[i]
+                if isinstance(line, _EstimatedLine) and not line.length:
+                    self._delete_lines(i, i + 1)
+                    self._estimates.remove(line)
+
+            # The text around the deletion may now be a single paragraph;
+            # lay it out so that it can be reflowed.
+            self._split_estimates(max(0, start - 1), start + 1)
 
         if start == 0:
             self.invalid_flow.invalidate(0, 1)
@@ -1907,8 +2410,8 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         if not self.glyphs:
             for line in self.lines:
                 line.delete(self)
-            del self.lines[:]
-            self.lines.append(_Line(0))
+            self._line_index.clear()
+            self._line_index.insert(0, _Line(0))
             font = self.document.get_font(0, dpi=self._dpi)
             self.lines[0].ascent = font.ascent
             self.lines[0].descent = font.descent
@@ -1918,6 +2421,8 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         self._update_glyphs()
         self._update_flow_glyphs()
         self._update_flow_lines()
+        if self._realize_visible_lines():
+            trigger_update_event = True
         self._update_visible_lines()
         self._update_vertex_lists()
         self.top_group.top = self._get_top(self.lines)
@@ -1937,33 +2442,36 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
             return
 
         # Find grapheme breaks and extend glyph range to encompass.
-        text = self.document.text
+        document = self.document
         while invalid_start > 0:
-            if _grapheme_break(text[invalid_start - 1], text[invalid_start]):
+            left, right = document.get_text(invalid_start - 1, invalid_start + 1)
+            if _grapheme_break(left, right):
                 break
             invalid_start -= 1
 
-        len_text = len(text)
+        len_text = document.length
         while invalid_end < len_text:
-            if _grapheme_break(text[invalid_end - 1], text[invalid_end]):
+            left, right = document.get_text(invalid_end - 1, invalid_end + 1)
+            if _grapheme_break(left, right):
                 break
             invalid_end += 1
 
-        # Update glyphs
+        # Update glyphs and owner runs, except for estimated lines.
         runs = runlist.ZipRunIterator((
             self._document.get_font_runs(dpi=self._dpi),
             self._document.get_element_runs()))
-        for start, end, (font, element) in \
-                runs.ranges(invalid_start, invalid_end):
-            if element:
-                self.glyphs[start] = _InlineElementBox(element)
-            else:
-                text = self.document.text[start:end]
-                self.glyphs[start:end] = font.get_glyphs(text)
+        for start, end, _ in self._get_layout_ranges(invalid_start,
+                                                     invalid_end):
+            glyphs = []
+            for run_start, run_end, (font, element) in runs.ranges(start, end):
+                if element:
+                    glyphs.append(_InlineElementBox(element))
+                else:
+                    text = self.document.get_text(run_start, run_end)
+                    glyphs.extend(font.get_glyphs(text))
+            self.glyphs[start:end] = glyphs
 
-        # Update owner runs
-        self._get_owner_runs(
-            self.owner_runs, self.glyphs, invalid_start, invalid_end)
+            self._get_owner_runs(self.owner_runs, self.glyphs, start, end)
 
         # Updated glyphs need flowing
         self.invalid_flow.invalidate(invalid_start, invalid_end)
@@ -1974,59 +2482,101 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         if invalid_end - invalid_start <= 0:
             return
 
-        # Find first invalid line
-        line_index = 0
-        for i, line in enumerate(self.lines):
-            if line.start >= invalid_start:
-                break
-            line_index = i
+        # Estimated lines are not laid out; the text between them is flowed
+        # separately.
+        content_width_invalid = False
+        for start, end, flow_end in list(
+                self._get_layout_ranges(invalid_start, invalid_end)):
+            if self._flow_range(start, end, flow_end):
+                content_width_invalid = True
+
+        if content_width_invalid:
+            # Rescan all lines to look for the new maximum content width
+            content_width = 0
+            for line in self.lines:
+                content_width = max(line.width + line.margin_left,
+                                    content_width)
+            self.content_width = content_width
+
+    def _flow_range(self, invalid_start, invalid_end, flow_end):
+        # Reflow the lines from `invalid_start` to `invalid_end`, and any
+        # following lines that change as a result, up to `flow_end`.  Returns
+        # True if the content width needs to be recalculated.
+        lines = self.lines
+        line_index = self._line_index.bisect(
+            lambda line: line.start >= invalid_start)
 
         # Flow from previous line; fixes issue with adding a space into
         # overlong line (glyphs before space would then flow back onto
         # previous line).  TODO Could optimise this by keeping track of where
         # the overlong lines are.
-        line_index = max(0, line_index - 1)
+        for i in range(2):
+            if (line_index == 0 or
+                    isinstance(lines[line_index - 1], _EstimatedLine)):
+                break
+            line_index -= 1
 
         # (No need to find last invalid line; the update loop below stops
         # calling the flow generator when no more changes are necessary.)
 
         try:
-            line = self.lines[line_index]
+            line = lines[line_index]
             invalid_start = min(invalid_start, line.start)
             line.delete(self)
-            line = self.lines[line_index] = _Line(invalid_start)
+            self._line_index.replace(line_index, _Line(invalid_start))
             self.invalid_lines.invalidate(line_index, line_index + 1)
         except IndexError:
             line_index = 0
             invalid_start = 0
-            line = _Line(0)
-            self.lines.append(line)
-            self.invalid_lines.insert(0, 1)
+            self._insert_line(0, _Line(0))
 
         content_width_invalid = False
         next_start = invalid_start
 
-        for line in self._flow_glyphs(self.glyphs, self.owner_runs,
-                                      invalid_start, len(self._document.text)):
+        flowed_lines = self._flow_glyphs(self.glyphs, self.owner_runs,
+                                         invalid_start, flow_end)
+        if flow_end < self._document.length:
+            # The text ends with a paragraph followed by an estimated line,
+            # which takes the place of the empty line after it.
+            flowed_lines = itertools.takewhile(
+                lambda line: line.start < flow_end, flowed_lines)
+
+        for line in flowed_lines:
+            line_end = line.start + line.length
+            self._measured_length += line.length
+            self._measured_height += line.ascent - line.descent
             try:
-                old_line = self.lines[line_index]
+                old_line = lines[line_index]
+                if old_line.start >= line_end and old_line.start > line.start:
+                    # The new line comes before the old one, e.g. a newline
+                    # was inserted.
+                    raise IndexError
                 old_line.delete(self)
                 old_line_width = old_line.width + old_line.margin_left
                 new_line_width = line.width + line.margin_left
                 if (old_line_width == self.content_width and
                             new_line_width < old_line_width):
                     content_width_invalid = True
-                self.lines[line_index] = line
+                self._line_index.replace(line_index, line)
                 self.invalid_lines.invalidate(line_index, line_index + 1)
             except IndexError:
-                self.lines.append(line)
-                self.invalid_lines.insert(line_index, 1)
+                self._insert_line(line_index, line)
 
-            next_start = line.start + line.length
+            next_start = line_end
             line_index += 1
 
+            # Old lines starting within the new line are stale, e.g. a newline
+            # was deleted.
+            stale_end = line_index
+            while (stale_end < len(lines) and
+                   lines[stale_end].start < next_start):
+                stale_end += 1
+            if stale_end > line_index:
+                if self._delete_lines(line_index, stale_end):
+                    content_width_invalid = True
+
             try:
-                next_line = self.lines[line_index]
+                next_line = lines[line_index]
                 if next_start == next_line.start and next_start > invalid_end:
                     # No more lines need to be modified, early exit.
                     break
@@ -2034,22 +2584,243 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
                 pass
         else:
             # The last line is at line_index - 1, if there are any more lines
-            # after that they are stale and need to be deleted.
-            if next_start == len(self._document.text) and line_index > 0:
-                for line in self.lines[line_index:]:
-                    old_line_width = old_line.width + old_line.margin_left
-                    if old_line_width == self.content_width:
-                        content_width_invalid = True
-                    line.delete(self)
-                del self.lines[line_index:]
+            # before the next estimated line they are stale and need to be
+            # deleted.
+            if next_start == flow_end and line_index > 0:
+                end_index = line_index
+                while (end_index < len(lines) and
+                       not isinstance(lines[end_index], _EstimatedLine)):
+                    end_index += 1
+                if self._delete_lines(line_index, end_index):
+                    content_width_invalid = True
 
-        if content_width_invalid:
-            # Rescan all lines to look for the new maximum content width
-            content_width = 0
-            for line in self.lines:
-                content_width = max(line.width + line.margin_left,
-                                    content_width)
-            self.content_width = content_width
+        return content_width_invalid
+
+    def _insert_line(self, index, line):
+        self._line_index.insert(index, line)
+        self.invalid_lines.insert(index, 1)
+
+        # Keep the range of visible lines on the same lines.
+        visible_lines = self.visible_lines
+        if visible_lines.is_invalid():
+            if visible_lines.start >= index:
+                visible_lines.start += 1
+            if visible_lines.end > index:
+                visible_lines.end += 1
+
+    def _delete_lines(self, start, end):
+        # Delete lines, returning True if one of them was the widest line.
+        widest = False
+        for line in self.lines[start:end]:
+            if line.width + line.margin_left == self.content_width:
+                widest = True
+            line.delete(self)
+        self._line_index.delete(start, end)
+        self.invalid_lines.delete(start, end)
+        if self.visible_lines.is_invalid():
+            self.visible_lines.delete(start, end)
+        return widest
+
+    # Virtual layout: paragraphs away from the viewport are covered by
+    # estimated lines, which are replaced by laid out lines as they are
+    # scrolled into view.
+
+    def _get_layout_ranges(self, start, end):
+        # Yield (start, end, flow_end) for each part of the given range that
+        # is not covered by an estimated line, where `flow_end` is the start of
+        # the estimated line following it or the end of the document.
+        estimates = self._estimates
+        i = _bisect(estimates, lambda line: line.start + line.length > start)
+        while start < end:
+            if i == len(estimates):
+                yield start, end, self._document.length
+                return
+            estimate = estimates[i]
+            if start < estimate.start:
+                yield start, min(end, estimate.start), estimate.start
+            start = max(start, estimate.start + estimate.length)
+            i += 1
+
+    def _get_estimate(self, position):
+        # Return the estimated line containing a position, or None.  The last
+        # line also contains the end of the document.
+        estimates = self._estimates
+        i = _bisect(estimates, lambda line: line.start + line.length > position)
+        if i < len(estimates) and estimates[i].start <= position:
+            return estimates[i]
+        elif (i == len(estimates) and estimates and
+              estimates[-1] is self.lines[-1] and
+              estimates[-1].start + estimates[-1].length == position):
+            return estimates[-1]
+        return None
+
+    def _get_line_index(self, line):
+        index = self._line_index.bisect(lambda other: other.start >= line.start)
+        while self.lines[index] is not line:
+            index += 1
+        return index
+
+    def _estimate_height(self, length):
+        # Estimate the height of text that has not been laid out from the
+        # lines laid out so far, or from the default font if there are none.
+        if self._measured_length:
+            return int(length * self._measured_height / self._measured_length)
+
+        font = self._document.get_font(0, dpi=self._dpi)
+        if self._wrap_lines:
+            advance = font.get_glyphs(u'x')[0].advance
+            line_length = max(1, self._width // max(1, advance))
+        else:
+            line_length = 80
+        return int(length * (font.ascent - font.descent) / line_length)
+
+    def _resize_estimate(self, index, length):
+        # Change the length of an estimated line, keeping its height in
+        # proportion.  An estimated line resized to 0 must be deleted.
+        estimate = self.lines[index]
+        if length:
+            estimate.ascent = max(1, estimate.ascent * length // estimate.length)
+        estimate.length = length
+        self.invalid_lines.invalidate(index, index + 1)
+
+    def _estimate_document(self):
+        # Discard the layout and cover the whole document with an estimated
+        # line; `_update` then lays out the paragraphs around the viewport.
+        for line in self.lines:
+            line.delete(self)
+        self._line_index.clear()
+        del self._estimates[:]
+        for invalid_range in (self.invalid_glyphs, self.invalid_flow,
+                              self.invalid_lines, self.invalid_style,
+                              self.invalid_vertex_lines):
+            invalid_range.validate()
+        self.visible_lines = _InvalidRange()
+        self.content_width = 0
+        self._measured_length = 0
+        self._measured_height = 0
+
+        length = self._document.length
+        self.glyphs = _GlyphList()
+        self.glyphs.insert(0, length)
+        self.owner_runs = runlist.IndexedRunList(length, None)
+
+        if not length:
+            return
+        elif self._multiline:
+            estimate = _EstimatedLine(0, length,
+                                      max(1, self._estimate_height(length)))
+            self._line_index.insert(0, estimate)
+            self._estimates.append(estimate)
+            self.invalid_lines.invalidate(0, 1)
+        else:
+            # A single line cannot be laid out in part.
+            self.invalid_glyphs.invalidate(0, length)
+            self.invalid_flow.invalidate(0, length)
+            self.invalid_style.invalidate(0, length)
+
+    def _get_paragraph_start(self, position):
+        # Return the last paragraph boundary at or before a position.
+        document = self._document
+        while position > 0:
+            start = max(0, position - 1024)
+            text = document.get_text(start, position)
+            separator = max(text.rfind(u'\n'), text.rfind(u'\u2029'))
+            if separator != -1:
+                return start + separator + 1
+            position = start
+        return 0
+
+    def _split_estimates(self, start, end):
+        # Replace the paragraphs of estimated lines overlapping `start` to
+        # `end` with a line to be laid out, and return the estimated lines
+        # that now follow such a line.
+        estimates = self._estimates
+        following = []
+        i = _bisect(estimates, lambda line: line.start + line.length > start)
+        while i < len(estimates) and estimates[i].start < end:
+            estimate = estimates[i]
+            estimate_start = estimate.start
+            estimate_end = estimate_start + estimate.length
+            layout_start = max(estimate_start,
+                               self._get_paragraph_start(max(start,
+                                                             estimate_start)))
+            layout_end = min(estimate_end, self._document.get_paragraph_end(
+                max(layout_start + 1, min(end, estimate_end)) - 1))
+
+            # Keep the estimated height of the text before the laid out
+            # paragraphs, so that the lines below it do not move.
+            new_lines = []
+            new_estimates = []
+            if layout_start > estimate_start:
+                length = layout_start - estimate_start
+                new_estimates.append(_EstimatedLine(
+                    estimate_start, length,
+                    max(1, estimate.ascent * length // estimate.length)))
+                new_lines.append(new_estimates[-1])
+            new_lines.append(_Line(layout_start))
+            if layout_end < estimate_end:
+                length = estimate_end - layout_end
+                new_estimates.append(_EstimatedLine(
+                    layout_end, length,
+                    max(1, self._estimate_height(length))))
+                new_lines.append(new_estimates[-1])
+                following.append(new_estimates[-1])
+
+            index = self._get_line_index(estimate)
+            self._line_index.replace(index, new_lines[0])
+            self.invalid_lines.invalidate(index, index + 1)
+            for j, line in enumerate(new_lines[1:]):
+                self._insert_line(index + j + 1, line)
+            estimates[i:i + 1] = new_estimates
+            i += len(new_estimates)
+
+            self.invalid_glyphs.invalidate(layout_start, layout_end)
+            self.invalid_flow.invalidate(layout_start, layout_end)
+        return following
+
+    def _get_visible_estimate(self):
+        # Return the first estimated line within a page of the viewport, or
+        # None.
+        top = self.view_y + self.height
+        bottom = self.view_y - 2 * self.height
+        i = _bisect(self._estimates, lambda line: line.y < top)
+        if i < len(self._estimates):
+            estimate = self._estimates[i]
+            if estimate.y + estimate.ascent > bottom:
+                return estimate
+        return None
+
+    def _realize_visible_lines(self):
+        # Lay out the paragraphs of estimated lines within a page of the
+        # viewport.  Returns True if there were any.
+        realized = False
+        estimate = self._get_visible_estimate()
+        while estimate is not None:
+            # Lay out the characters that would be in view if the text was
+            # spread evenly over the estimated height.
+            top = self.view_y + self.height
+            bottom = self.view_y - 2 * self.height
+            estimate_top = estimate.y + estimate.ascent
+            height = float(estimate.ascent)
+            start = estimate.start + int(
+                estimate.length * max(0, estimate_top - top) / height)
+            end = estimate.start + int(math.ceil(
+                estimate.length * min(height, estimate_top - bottom) / height))
+
+            following = self._split_estimates(start, max(start + 1, end))
+            self._update_glyphs()
+            self._update_flow_glyphs()
+
+            # Refine the estimate of the text after the new lines with them.
+            for line in following:
+                line.ascent = max(1, self._estimate_height(line.length))
+                index = self._get_line_index(line)
+                self.invalid_lines.invalidate(index, index + 1)
+            self._update_flow_lines()
+
+            realized = True
+            estimate = self._get_visible_estimate()
+        return realized
 
     def _update_flow_lines(self):
         invalid_start, invalid_end = self.invalid_lines.validate()
@@ -2062,18 +2833,21 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         self.invalid_vertex_lines.invalidate(invalid_start, invalid_end)
 
     def _update_visible_lines(self):
-        start = sys.maxsize
-        end = 0
-        for i, line in enumerate(self.lines):
-            if line.y + line.descent < self.view_y:
-                start = min(start, i)
-            if line.y + line.ascent > self.view_y - self.height:
-                end = max(end, i) + 1
+        view_top = self.view_y
+        view_bottom = view_top - self.height
+        start = self._line_index.bisect(
+            lambda line: line.y + line.descent < view_top)
+        if start == len(self.lines):
+            start = sys.maxsize
+        end = self._line_index.bisect(
+            lambda line: line.y + line.ascent <= view_bottom)
 
         # Delete newly invisible lines
-        for i in range(self.visible_lines.start, min(start, len(self.lines))):
+        old_start = self.visible_lines.start
+        old_end = min(self.visible_lines.end, len(self.lines))
+        for i in range(old_start, min(start, old_end)):
             self.lines[i].delete(self)
-        for i in range(end, min(self.visible_lines.end, len(self.lines))):
+        for i in range(max(end, old_start), old_end):
             self.lines[i].delete(self)
 
         # Invalidate newly visible lines
@@ -2087,10 +2861,14 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         # Find lines that have been affected by style changes
         style_invalid_start, style_invalid_end = self.invalid_style.validate()
         self.invalid_vertex_lines.invalidate(
-            self.get_line_from_position(style_invalid_start),
-            self.get_line_from_position(style_invalid_end) + 1)
+            self._get_line_from_position(style_invalid_start),
+            self._get_line_from_position(style_invalid_end) + 1)
 
         invalid_start, invalid_end = self.invalid_vertex_lines.validate()
+
+        # Only visible lines have vertex lists.
+        invalid_start = max(invalid_start, self.visible_lines.start)
+        invalid_end = min(invalid_end, self.visible_lines.end)
         if invalid_end - invalid_start <= 0:
             return
 
@@ -2131,7 +2909,11 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         if width == self._width:
             return
 
-        self.invalid_flow.invalidate(0, len(self.document.text))
+        if self._virtual:
+            self._width = width
+            self._estimate_document()
+        else:
+            self.invalid_flow.invalidate(0, self.document.length)
         super(IncrementalTextLayout, self)._set_width(width)
 
     def _get_width(self):
@@ -2155,7 +2937,12 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     height = property(_get_height, _set_height)
 
     def _set_multiline(self, multiline):
-        self.invalid_flow.invalidate(0, len(self.document.text))
+        if self._virtual:
+            self._multiline = multiline
+            self._wrap_lines_invariant()
+            self._estimate_document()
+        else:
+            self.invalid_flow.invalidate(0, self.document.length)
         super(IncrementalTextLayout, self)._set_multiline(multiline)
 
     def _get_multiline(self):
@@ -2168,8 +2955,13 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     def _set_view_y(self, view_y):
         # view_y must be negative.
         super(IncrementalTextLayout, self)._set_view_y(view_y)
-        self._update_visible_lines()
-        self._update_vertex_lists()
+        if (self._estimates and self._update_enabled and
+                self._get_visible_estimate() is not None):
+            # Lay out the paragraphs scrolled into view.
+            self._update()
+        else:
+            self._update_visible_lines()
+            self._update_vertex_lists()
 
     def _get_view_y(self):
         return self.top_group.view_y
@@ -2191,7 +2983,7 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
 
         """
         start = max(0, start)
-        end = min(end, len(self.document.text))
+        end = min(end, self.document.length)
         if start == self._selection_start and end == self._selection_end:
             return
 
@@ -2300,13 +3092,8 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         :return: (x, y)
         """
         if line is None:
-            line = self.lines[0]
-            for next_line in self.lines:
-                if next_line.start > position:
-                    break
-                line = next_line
-        else:
-            line = self.lines[line]
+            line = max(0, self.get_line_from_position(position))
+        line = self.lines[line]
 
         x = line.x
 
@@ -2341,11 +3128,8 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
         x -= self.top_group.translate_x
         y -= self.top_group.translate_y
 
-        line_index = 0
-        for line in self.lines:
-            if y > line.y + line.descent:
-                break
-            line_index += 1
+        line_index = self._line_index.bisect(
+            lambda line: y > line.y + line.descent)
         if line_index >= len(self.lines):
             line_index = len(self.lines) - 1
         return line_index
@@ -2367,19 +3151,29 @@ class IncrementalTextLayout(ScrollableTextLayout, event.EventDispatcher):
     def get_line_from_position(self, position):
         """Get the line index of a character position in the document.
 
+        In a virtual layout, the paragraph containing the position is laid out
+        first if it has not been already.
+
         :Parameters:
             `position` : int
                 Document position.
 
         :rtype: int
         """
-        line = -1
-        for next_line in self.lines:
-            if next_line.start > position:
-                break
-            line += 1
+        line = self._get_line_from_position(position)
+        if line >= 0 and isinstance(self.lines[line], _EstimatedLine):
+            # The end of the document is in the paragraph of the last
+            # character.
+            start = min(position, self._document.length - 1)
+            self._split_estimates(start, start + 1)
+            self._update()
+            line = self._get_line_from_position(position)
         return line
 
+    def _get_line_from_position(self, position):
+        return self._line_index.bisect(
+            lambda line: line.start > position) - 1
+
     def get_position_from_line(self, line):
         """Get the first document character position of a given line index.
 
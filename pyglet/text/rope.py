@@ -0,0 +1,310 @@
+# ----------------------------------------------------------------------------
+# pyglet
+# Copyright (c) 2006-2018 Alex Holkner
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+#
+#  * Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+#  * Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in
+#    the documentation and/or other materials provided with the
+#    distribution.
+#  * Neither the name of pyglet nor the names of its
+#    contributors may be used to endorse or promote products
+#    derived from this software without specific prior written
+#    permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS
+# FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE
+# COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING,
+# BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN
+# ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+# ----------------------------------------------------------------------------
+'''Rope of text, used to store the text of a document.
+
+Inserting or deleting text in a Python string copies the whole string, so
+editing a large document costs time proportional to its length on every
+keystroke.  A `Rope` keeps the text in chunks of a few thousand characters,
+with the chunk lengths in a binary indexed (Fenwick) tree, so that the chunk
+containing a position is found in logarithmic time and only that chunk is
+copied when it is modified.
+
+.. versionadded:: 1.4
+'''
+from builtins import range
+from builtins import object
+
+__docformat__ = 'restructuredtext'
+__version__ = '$Id: $'
+
+_chunk_size = 2048
+_max_chunk_size = 2 * _chunk_size
+
+
+class Rope(object):
+    '''Sequence of characters supporting efficient insertion and deletion.
+
+    The text can be retrieved in whole with `text` (the joined string is
+    cached until the next modification) or in part with `get_text`, which
+    only joins the chunks spanned by the range.
+    '''
+
+    def __init__(self, text=u''):
+        '''Create a rope.
+
+        :Parameters:
+            `text` : str
+                Initial text.
+
+        '''
+        self._chunks = []
+        self._length = 0
+        self._text = u''
+        self._build(self._split(text))
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def text(self):
+        '''Text of the rope.
+
+        :type: str
+        '''
+        if self._text is None:
+            self._text = u''.join(self._chunks)
+        return self._text
+
+    def get_text(self, start=0, end=None):
+        '''Get a range of the text.
+
+        :Parameters:
+            `start` : int
+                Starting character position.
+            `end` : int
+                Ending character position (exclusive), or None for the end
+                of the text.
+
+        :rtype: str
+        '''
+        if end is None or end > self._length:
+            end = self._length
+        start = max(start, 0)
+        if start >= end:
+            return u''
+        if self._text is not None:
+            return self._text[start:end]
+
+        index, offset = self._find(start)
+        chunk = self._chunks[index]
+        if offset + end - start <= len(chunk):
+            return chunk[offset:offset + end - start]
+
+        parts = [chunk[offset:]]
+        remaining = end - start - len(parts[0])
+        while remaining > 0:
+            index += 1
+            chunk = self._chunks[index]
+            parts.append(chunk[:remaining])
+            remaining -= len(chunk)
+        return u''.join(parts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step == 1:
+                return self.get_text(start, stop)
+            return self.text[index]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Rope index out of range')
+        chunk_index, offset = self._find(index)
+        return self._chunks[chunk_index][offset]
+
+    def insert(self, position, text):
+        '''Insert text.
+
+        :Parameters:
+            `position` : int
+                Character insertion point.
+            `text` : str
+                Text to insert.
+
+        '''
+        if not text:
+            return
+        if not self._chunks:
+            self._build(self._split(text))
+            return
+
+        index, offset = self._find(position, insert=True)
+        chunk = self._chunks[index]
+        chunk = u''.join((chunk[:offset], text, chunk[offset:]))
+        self._text = None
+        if len(chunk) <= _max_chunk_size:
+            self._chunks[index] = chunk
+            self._length += len(text)
+            self._add(index, len(text))
+        else:
+            self._chunks[index:index + 1] = self._split(chunk)
+            self._build(self._chunks)
+
+    def delete(self, start, end):
+        '''Delete text.
+
+        :Parameters:
+            `start` : int
+                Starting character position to delete from.
+            `end` : int
+                Ending character position to delete to (exclusive).
+
+        '''
+        start = max(start, 0)
+        end = min(end, self._length)
+        if start >= end:
+            return
+
+        self._text = None
+        start_index, start_offset = self._find(start)
+        end_index, end_offset = self._find(end, insert=True)
+        if start_index == end_index:
+            chunk = self._chunks[start_index]
+            chunk = chunk[:start_offset] + chunk[end_offset:]
+            if chunk:
+                self._chunks[start_index] = chunk
+                self._length -= end - start
+                self._add(start_index, start - end)
+                return
+            new_chunks = []
+        else:
+            head = self._chunks[start_index][:start_offset]
+            tail = self._chunks[end_index][end_offset:]
+            if len(head) + len(tail) <= _max_chunk_size:
+                new_chunks = [head + tail]
+            else:
+                new_chunks = [head, tail]
+        self._chunks[start_index:end_index + 1] = \
+            [chunk for chunk in new_chunks if chunk]
+        self._build(self._chunks)
+
+    def find_any(self, chars, start=0):
+        '''Find the first occurrence of any of the given characters.
+
+        :Parameters:
+            `chars` : str
+                Characters to search for.
+            `start` : int
+                Character position to start searching at.
+
+        :rtype: int
+        :return: The position of the first occurrence at or after `start`,
+            or -1 if there is none.
+        '''
+        start = max(start, 0)
+        if start >= self._length:
+            return -1
+        index, offset = self._find(start)
+        position = start - offset
+        while index < len(self._chunks):
+            chunk = self._chunks[index]
+            found = [i for i in (chunk.find(c, offset) for c in chars)
+                     if i != -1]
+            if found:
+                return position + min(found)
+            position += len(chunk)
+            offset = 0
+            index += 1
+        return -1
+
+    def rfind_any(self, chars, end=None):
+        '''Find the last occurrence of any of the given characters.
+
+        :Parameters:
+            `chars` : str
+                Characters to search for.
+            `end` : int
+                Character position to stop searching at (exclusive), or None
+                for the end of the text.
+
+        :rtype: int
+        :return: The position of the last occurrence before `end`, or -1 if
+            there is none.
+        '''
+        if end is None or end > self._length:
+            end = self._length
+        if end <= 0:
+            return -1
+        index, offset = self._find(end, insert=True)
+        position = end - offset
+        while index >= 0:
+            chunk = self._chunks[index]
+            found = max(chunk.rfind(c, 0, offset) for c in chars)
+            if found != -1:
+                return position + found
+            index -= 1
+            if index >= 0:
+                offset = len(self._chunks[index])
+                position -= offset
+        return -1
+
+    def _find(self, position, insert=False):
+        # Return the index of the chunk containing position and the offset
+        # within it.  With `insert`, a position at the end of a chunk is
+        # given in that chunk rather than at the start of the next one.
+        if insert:
+            position -= 1
+        tree = self._tree
+        index = 0
+        step = self._step
+        while step:
+            next_index = index + step
+            if next_index <= len(self._chunks) and tree[next_index] <= position:
+                index = next_index
+                position -= tree[next_index]
+            step >>= 1
+        if insert:
+            position += 1
+        return index, position
+
+    def _add(self, index, delta):
+        tree = self._tree
+        index += 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def _build(self, chunks):
+        self._chunks = chunks
+        self._length = 0
+        tree = [0] * (len(chunks) + 1)
+        for i, chunk in enumerate(chunks):
+            self._length += len(chunk)
+            index = i + 1
+            tree[index] += len(chunk)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self._tree = tree
+        step = 1
+        while step * 2 <= len(chunks):
+            step *= 2
+        self._step = step if chunks else 0
+        self._text = None if chunks else u''
+
+    @staticmethod
+    def _split(text):
+        return [text[i:i + _chunk_size]
+                for i in range(0, len(text), _chunk_size)]
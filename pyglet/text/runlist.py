@@ -228,6 +228,323 @@ class RunList(object):
     def __repr__(self):
         return str(list(self))
 
+class IndexedRunList(object):
+    '''List of contiguous runs of values, indexed for large run lists.
+
+    Behaves as `RunList`, but `RunList` walks every run for each lookup or
+    modification.  `IndexedRunList` keeps the runs in blocks of at most
+    twice `_block_size` (128) runs, split into blocks of 64 runs when they
+    grow larger, and the length of each block in a binary indexed (Fenwick)
+    tree, so finding the run at a position, `insert`, `delete` and
+    `set_run` take logarithmic time in the number of runs (plus the size of
+    a block).  Adjacent runs with equal values are always merged.
+
+    Its run iterator, and `ranges`, start from the run containing the
+    requested position instead of iterating from the start of the list.
+
+    .. versionadded:: 1.4
+    '''
+    _block_size = 64
+
+    def __init__(self, size, initial):
+        '''Create a run list of the given size and a default value.
+
+        :Parameters:
+            `size` : int
+                Number of characters to represent initially.
+            `initial` : object
+                The value of all characters in the run list.
+
+        '''
+        self._counts = [[size]]
+        self._values = [[initial]]
+        self._lengths = [size]
+        self._rebuild()
+
+    def __len__(self):
+        return self._length
+
+    def insert(self, pos, length):
+        '''Insert characters into the run list.
+
+        The inserted characters will take on the value immediately preceding
+        the insertion point (or the value of the first character, if `pos` is
+        0).
+
+        :Parameters:
+            `pos` : int
+                Insertion index
+            `length` : int
+                Number of characters to insert.
+
+        '''
+        if not 0 <= pos <= self._length:
+            return
+        if pos == 0:
+            block, run = 0, 0
+        else:
+            block, run, _ = self._find(pos - 1)
+        self._counts[block][run] += length
+        self._add(block, length)
+
+    def delete(self, start, end):
+        '''Remove characters from the run list.
+
+        :Parameters:
+            `start` : int
+                Starting index to remove from.
+            `end` : int
+                End index, exclusive.
+
+        '''
+        start = max(start, 0)
+        end = min(end, self._length)
+        if end - start <= 0:
+            return
+        if start == 0 and end == self._length:
+            # Don't leave an empty list
+            self._counts = [[0]]
+            self._values = [[self._values[-1][-1]]]
+            self._lengths = [0]
+            self._rebuild()
+            return
+
+        block, _ = self._remove(start, end)
+        self._update(block)
+        self._merge(start)
+
+    def set_run(self, start, end, value):
+        '''Set the value of a range of characters.
+
+        :Parameters:
+            `start` : int
+                Start index of range.
+            `end` : int
+                End of range, exclusive.
+            `value` : object
+                Value to set over the range.
+
+        '''
+        start = max(start, 0)
+        end = min(end, self._length)
+        if end - start <= 0:
+            return
+
+        block, run = self._remove(start, end)
+        self._counts[block].insert(run, end - start)
+        self._values[block].insert(run, value)
+        self._add(block, end - start)
+        self._update(block)
+        self._merge(end)
+        self._merge(start)
+
+    def __iter__(self):
+        return self._iter_from(0)
+
+    def ranges(self, start, end):
+        '''Iterate over a subrange of the run list.
+
+        :Parameters:
+            `start` : int
+                Start index to iterate from.
+            `end` : int
+                End index, exclusive.
+
+        :rtype: iterator
+        :return: Iterator over (start, end, value) tuples.
+        '''
+        for run_start, run_end, value in self._iter_from(start):
+            if run_start >= end:
+                break
+            yield max(run_start, start), min(run_end, end), value
+
+    def get_run_iterator(self):
+        '''Get an extended iterator over the run list.
+
+        :rtype: `RunIterator`
+        '''
+        return _IndexedRunIterator(self)
+
+    def __getitem__(self, index):
+        '''Get the value at a character position.
+
+        :Parameters:
+            `index` : int
+                Index of character.  Must be within range and non-negative.
+
+        :rtype: object
+        '''
+        if 0 <= index < self._length:
+            block, run, _ = self._find(index)
+            return self._values[block][run]
+
+        # Append insertion point
+        if index == self._length:
+            return self._values[-1][-1]
+
+        raise IndexError
+
+    def __repr__(self):
+        return str(list(self))
+
+    def _iter_from(self, index):
+        # Iterate over (start, end, value) of the runs from the one
+        # containing index.  An empty list has a single empty run.
+        if self._length == 0:
+            if index == 0:
+                yield 0, 0, self._values[0][0]
+            return
+        if not 0 <= index < self._length:
+            return
+        block, run, offset = self._find(index)
+        i = index - offset
+        for counts, values in zip(self._counts[block:], self._values[block:]):
+            for count, value in zip(counts[run:], values[run:]):
+                yield i, i + count, value
+                i += count
+            run = 0
+
+    def _find(self, pos):
+        # Return (block, run, offset) of the run containing pos, which must
+        # be within the list.
+        tree = self._tree
+        size = len(tree)
+        block = 0
+        step = self._step
+        while step:
+            next_block = block + step
+            if next_block < size and tree[next_block] <= pos:
+                block = next_block
+                pos -= tree[next_block]
+            step >>= 1
+        run = 0
+        for count in self._counts[block]:
+            if pos < count:
+                return block, run, pos
+            pos -= count
+            run += 1
+        raise IndexError
+
+    def _split(self, pos):
+        # Make a run start at pos, and return (block, run) of that run.  At
+        # the end of the list, run is one past the last run.
+        if pos >= self._length:
+            return len(self._counts) - 1, len(self._counts[-1])
+        block, run, offset = self._find(pos)
+        if offset:
+            counts = self._counts[block]
+            values = self._values[block]
+            counts.insert(run, offset)
+            values.insert(run, values[run])
+            counts[run + 1] -= offset
+            run += 1
+        return block, run
+
+    def _remove(self, start, end):
+        # Remove the characters in [start, end), which must be within the
+        # list, and return (block, run) where they were.  The blocks are
+        # reindexed, but the returned block is left in place even if it is
+        # now empty.
+        start_block, start_run = self._split(start)
+        end_block, end_run = self._split(end)
+        counts = self._counts
+        values = self._values
+        if start_block == end_block:
+            del counts[start_block][start_run:end_run]
+            del values[start_block][start_run:end_run]
+            self._add(start_block, start - end)
+        else:
+            del counts[start_block][start_run:]
+            del values[start_block][start_run:]
+            del counts[end_block][:end_run]
+            del values[end_block][:end_run]
+            del counts[start_block + 1:end_block]
+            del values[start_block + 1:end_block]
+            lengths = [sum(counts[start_block]), sum(counts[start_block + 1])]
+            if not counts[start_block + 1]:
+                del counts[start_block + 1]
+                del values[start_block + 1]
+                del lengths[1]
+            self._lengths[start_block:end_block + 1] = lengths
+            self._rebuild()
+        return start_block, start_run
+
+    def _merge(self, pos):
+        # Merge the run starting at pos with the preceding run if they have
+        # the same value.
+        if not 0 < pos < self._length:
+            return
+        block, run, offset = self._find(pos)
+        if offset:
+            return
+        if run:
+            previous_block, previous_run = block, run - 1
+        else:
+            previous_block = block - 1
+            previous_run = len(self._counts[previous_block]) - 1
+        if (self._values[block][run] !=
+                self._values[previous_block][previous_run]):
+            return
+
+        count = self._counts[block].pop(run)
+        del self._values[block][run]
+        self._counts[previous_block][previous_run] += count
+        if previous_block != block:
+            self._add(previous_block, count)
+            self._add(block, -count)
+        if not self._counts[block]:
+            del self._counts[block]
+            del self._values[block]
+            del self._lengths[block]
+            self._rebuild()
+
+    def _update(self, block):
+        # Split a block that has grown too large or drop an empty one.
+        counts = self._counts
+        if len(counts[block]) > 2 * self._block_size:
+            size = self._block_size
+            block_counts = counts[block]
+            block_values = self._values[block]
+            counts[block:block + 1] = \
+                [block_counts[i:i + size]
+                 for i in range(0, len(block_counts), size)]
+            self._values[block:block + 1] = \
+                [block_values[i:i + size]
+                 for i in range(0, len(block_values), size)]
+            self._lengths[block:block + 1] = \
+                [sum(block_counts[i:i + size])
+                 for i in range(0, len(block_counts), size)]
+            self._rebuild()
+        elif not counts[block] and len(counts) > 1:
+            del counts[block]
+            del self._values[block]
+            del self._lengths[block]
+            self._rebuild()
+
+    def _add(self, block, delta):
+        self._lengths[block] += delta
+        self._length += delta
+        tree = self._tree
+        block += 1
+        while block < len(tree):
+            tree[block] += delta
+            block += block & -block
+
+    def _rebuild(self):
+        # Rebuild the tree from the block lengths after blocks were added or
+        # removed.
+        self._length = sum(self._lengths)
+        tree = [0] + self._lengths
+        for block in range(1, len(tree)):
+            parent = block + (block & -block)
+            if parent < len(tree):
+                tree[parent] += tree[block]
+        self._tree = tree
+        step = 1
+        while step * 2 < len(tree):
+            step *= 2
+        self._step = step
+
 class AbstractRunIterator(object):
     '''Range iteration over `RunList`.
 
@@ -315,6 +632,38 @@ class RunIterator(AbstractRunIterator):
         except StopIteration:
             return
 
+class _IndexedRunIterator(RunIterator):
+    # Iterator over an IndexedRunList, which seeks to a position through the
+    # list's index rather than iterating over the runs before it.
+    def __init__(self, run_list):
+        self._run_list = run_list
+        super(_IndexedRunIterator, self).__init__(run_list)
+
+    def _seek(self, index):
+        self._run_list_iter = self._run_list._iter_from(index)
+        self.start, self.end, self.value = next(self)
+
+    def __getitem__(self, index):
+        try:
+            if index >= self.end and index > self.start:
+                self.start, self.end, self.value = next(self)
+                if index >= self.end and index > self.start:
+                    self._seek(index)
+        except StopIteration:
+            raise IndexError
+        return super(_IndexedRunIterator, self).__getitem__(index)
+
+    def ranges(self, start, end):
+        try:
+            if start >= self.end:
+                self.start, self.end, self.value = next(self)
+                if start >= self.end:
+                    self._seek(start)
+        except StopIteration:
+            return
+        for r in super(_IndexedRunIterator, self).ranges(start, end):
+            yield r
+
 class OverriddenRunIterator(AbstractRunIterator):
     '''Iterator over a `RunIterator`, with a value temporarily replacing
     a given range.